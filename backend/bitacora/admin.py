@@ -1,5 +1,25 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from .models import Bitacora
+from .particiones import estimar_total
+
+
+class BitacoraPaginator(Paginator):
+    """
+    Paginador que usa la estimación de PostgreSQL cuando el listado no tiene
+    filtros, evitando un COUNT(*) sobre millones de filas.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimado = estimar_total()
+            if estimado:
+                return estimado
+        return super().count
+
 
 @admin.register(Bitacora)
 class BitacoraAdmin(admin.ModelAdmin):
@@ -12,9 +32,13 @@ class BitacoraAdmin(admin.ModelAdmin):
         'user_agent_display',
         'modulo_display',
     )
-    list_filter = ('accion', 'modulo')
+    # Filtros que no consultan valores distintos sobre toda la tabla
+    list_filter = (('fecha_hora', admin.DateFieldListFilter), 'modulo')
     search_fields = ('accion', 'descripcion', 'usuario__username', 'modulo')
     ordering = ('-fecha_hora',)
+    list_select_related = ('usuario',)
+    paginator = BitacoraPaginator
+    show_full_result_count = False
 
     @admin.display(description="Usuario")
     def nombre_usuario(self, obj):
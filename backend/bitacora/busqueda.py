@@ -0,0 +1,68 @@
+"""
+Búsqueda sobre la bitácora usando el índice de texto completo.
+
+El término se compara contra ``busqueda`` (tsvector de accion, descripcion y
+modulo) y, por separado, contra los usuarios cuyo username, nombre, apellido
+o rol coincidan. Ambas condiciones se resuelven con índices: GIN sobre el
+tsvector y (usuario_id, fecha_hora) sobre la subconsulta de usuarios.
+"""
+
+import re
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+from rest_framework import filters
+
+CONFIGURACION = "spanish"
+PATRON_TERMINO = re.compile(r"\w+", re.UNICODE)
+
+
+def construir_consulta(texto):
+    """
+    Convierte el texto libre en una consulta por prefijos (``term:*``) para
+    conservar el comportamiento de coincidencia parcial del buscador anterior.
+    Retorna None si el texto no contiene términos.
+    """
+    terminos = PATRON_TERMINO.findall(texto)
+    if not terminos:
+        return None
+    return SearchQuery(
+        " & ".join(f"{termino}:*" for termino in terminos),
+        config=CONFIGURACION,
+        search_type="raw",
+    )
+
+
+def usuarios_coincidentes(texto):
+    """Subconsulta con los ids de usuarios que coinciden con el texto"""
+    return get_user_model().objects.filter(
+        Q(username__icontains=texto) |
+        Q(first_name__icontains=texto) |
+        Q(last_name__icontains=texto) |
+        Q(rol__nombre__icontains=texto)
+    ).values('pk')
+
+
+def buscar(queryset, texto):
+    """Filtra y ordena por relevancia los registros que coinciden con el texto"""
+    consulta = construir_consulta(texto)
+    condicion = Q(usuario__in=usuarios_coincidentes(texto))
+    if consulta is None:
+        return queryset.filter(condicion)
+    return queryset.filter(Q(busqueda=consulta) | condicion).annotate(
+        relevancia=SearchRank(F('busqueda'), consulta)
+    ).order_by(F('relevancia').desc(nulls_last=True), '-fecha_hora')
+
+
+class BitacoraSearchFilter(filters.BaseFilterBackend):
+    """Aplica los parámetros ``search`` y ``rol`` del listado de bitácora"""
+
+    def filter_queryset(self, request, queryset, view):
+        search = request.query_params.get('search', '').strip()
+        if search:
+            queryset = buscar(queryset, search)
+        rol = request.query_params.get('rol', '').strip()
+        if rol:
+            queryset = queryset.filter(usuario__rol__nombre__iexact=rol)
+        return queryset
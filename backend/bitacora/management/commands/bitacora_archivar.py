@@ -0,0 +1,59 @@
+"""
+Comando de retención de la bitácora.
+
+Exporta a archivos CSV comprimidos (gzip) las particiones mensuales que
+quedan fuera de la ventana de retención y luego las elimina de la base de datos.
+
+Uso:
+    python manage.py bitacora_archivar [--meses-retencion 12] [--destino RUTA] [--dry-run]
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from bitacora.particiones import archivar_particion, es_particionada, particiones_vencidas
+
+
+class Command(BaseCommand):
+    help = 'Archiva en archivos comprimidos y elimina las particiones antiguas de la bitácora'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--meses-retencion',
+            type=int,
+            default=settings.BITACORA_MESES_RETENCION,
+            help='Meses (incluido el actual) que se conservan en la base de datos'
+        )
+        parser.add_argument(
+            '--destino',
+            default=str(settings.BITACORA_ARCHIVO_DIR),
+            help='Directorio donde se guardan los archivos .csv.gz'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo muestra las particiones que se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        if not es_particionada():
+            self.stdout.write(self.style.WARNING(
+                'La tabla de bitácora no está particionada (se requiere PostgreSQL y la migración 0002)'
+            ))
+            return
+
+        meses_retencion = options['meses_retencion']
+        if meses_retencion < 1:
+            self.stdout.write(self.style.ERROR('--meses-retencion debe ser al menos 1'))
+            return
+
+        vencidas = particiones_vencidas(meses_retencion)
+        if not vencidas:
+            self.stdout.write('No hay particiones para archivar')
+            return
+
+        for nombre, _, _ in vencidas:
+            if options['dry_run']:
+                self.stdout.write(f'➡️ Se archivaría {nombre}')
+                continue
+            ruta = archivar_particion(nombre, options['destino'])
+            self.stdout.write(self.style.SUCCESS(f'✅ {nombre} archivada en {ruta}'))
@@ -0,0 +1,40 @@
+"""
+Comando para crear por adelantado las particiones mensuales de la bitácora.
+
+Uso:
+    python manage.py bitacora_particiones [--meses-adelante 3]
+
+Se recomienda ejecutarlo periódicamente (por ejemplo, una vez al día con cron)
+para que las inserciones nunca caigan en la partición por defecto.
+"""
+from django.core.management.base import BaseCommand
+
+from bitacora.particiones import asegurar_particiones, es_particionada, listar_particiones
+
+
+class Command(BaseCommand):
+    help = 'Crea las particiones mensuales de la bitácora para los próximos meses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--meses-adelante',
+            type=int,
+            default=3,
+            help='Cantidad de meses futuros para los que se crean particiones (por defecto 3)'
+        )
+
+    def handle(self, *args, **options):
+        if not es_particionada():
+            self.stdout.write(self.style.WARNING(
+                'La tabla de bitácora no está particionada (se requiere PostgreSQL y la migración 0002)'
+            ))
+            return
+
+        creadas = asegurar_particiones(meses_adelante=options['meses_adelante'])
+        for nombre in creadas:
+            self.stdout.write(self.style.SUCCESS(f'✅ Partición creada: {nombre}'))
+        if not creadas:
+            self.stdout.write('Las particiones ya estaban creadas')
+
+        total = len(listar_particiones())
+        self.stdout.write(self.style.HTTP_INFO(f'Particiones mensuales existentes: {total}'))
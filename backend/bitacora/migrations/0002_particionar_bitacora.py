@@ -0,0 +1,134 @@
+"""
+Convierte bitacora_bitacora en una tabla particionada por mes (PostgreSQL).
+
+La clave primaria pasa a ser (id, fecha_hora), requisito de PostgreSQL para
+tablas particionadas; ``id`` sigue siendo único porque proviene de una
+secuencia. Se crean particiones para los meses con datos existentes y para
+los próximos meses, además de una partición por defecto.
+"""
+
+from django.db import migrations, models
+from django.utils import timezone
+
+from bitacora.particiones import (
+    PARTICION_DEFECTO,
+    TABLA,
+    crear_particion,
+    siguiente_mes,
+    sumar_meses,
+)
+
+LEGADO = f"{TABLA}_legado"
+SECUENCIA = f"{TABLA}_id_seq"
+MESES_ADELANTE = 3
+
+
+def particionar(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLA} RENAME TO {LEGADO}")
+        cursor.execute(
+            f"ALTER TABLE {LEGADO} RENAME CONSTRAINT {TABLA}_pkey TO {LEGADO}_pkey"
+        )
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [LEGADO])
+        secuencia_legado = cursor.fetchone()[0]
+        if secuencia_legado:
+            cursor.execute(
+                f"ALTER SEQUENCE {secuencia_legado} RENAME TO {LEGADO}_id_seq"
+            )
+
+        cursor.execute(f"CREATE SEQUENCE {SECUENCIA}")
+        cursor.execute(
+            f"CREATE TABLE {TABLA} (LIKE {LEGADO} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (fecha_hora)"
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLA} ALTER COLUMN id SET DEFAULT nextval('{SECUENCIA}')"
+        )
+        cursor.execute(f"ALTER SEQUENCE {SECUENCIA} OWNED BY {TABLA}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLA} ADD CONSTRAINT {TABLA}_pkey "
+            f"PRIMARY KEY (id, fecha_hora)"
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLA} ADD CONSTRAINT {TABLA}_usuario_id_fk "
+            f"FOREIGN KEY (usuario_id) REFERENCES users_customuser(id) "
+            f"DEFERRABLE INITIALLY DEFERRED"
+        )
+        cursor.execute(f"CREATE TABLE {PARTICION_DEFECTO} PARTITION OF {TABLA} DEFAULT")
+
+        # Particiones para el rango de datos existente y los próximos meses
+        hoy = timezone.now().date()
+        cursor.execute(f"SELECT MIN(fecha_hora) FROM {LEGADO}")
+        minimo = cursor.fetchone()[0]
+        anio, mes = (minimo.year, minimo.month) if minimo else (hoy.year, hoy.month)
+        fin = sumar_meses(hoy.year, hoy.month, MESES_ADELANTE)
+        while (anio, mes) <= fin:
+            crear_particion(cursor, anio, mes)
+            anio, mes = siguiente_mes(anio, mes)
+
+        cursor.execute(f"INSERT INTO {TABLA} SELECT * FROM {LEGADO}")
+        # Validar las FK ahora: los índices siguientes no admiten triggers pendientes
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            f"SELECT setval('{SECUENCIA}', COALESCE((SELECT MAX(id) FROM {TABLA}), 0) + 1, false)"
+        )
+        cursor.execute(f"DROP TABLE {LEGADO}")
+
+
+def desparticionar(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLA} RENAME TO {LEGADO}")
+        cursor.execute(
+            f"ALTER TABLE {LEGADO} RENAME CONSTRAINT {TABLA}_pkey TO {LEGADO}_pkey"
+        )
+        cursor.execute(f"ALTER SEQUENCE {SECUENCIA} RENAME TO {LEGADO}_id_seq")
+        cursor.execute(
+            f"CREATE TABLE {TABLA} ("
+            f"  id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,"
+            f"  accion varchar(100) NOT NULL,"
+            f"  descripcion text NOT NULL,"
+            f"  fecha_hora timestamp with time zone NOT NULL,"
+            f"  ip inet NULL,"
+            f"  user_agent text NOT NULL,"
+            f"  modulo varchar(50) NOT NULL,"
+            f"  usuario_id bigint NULL REFERENCES users_customuser(id) "
+            f"    DEFERRABLE INITIALLY DEFERRED"
+            f")"
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLA} (id, accion, descripcion, fecha_hora, ip, user_agent, modulo, usuario_id) "
+            f"SELECT id, accion, descripcion, fecha_hora, ip, user_agent, modulo, usuario_id FROM {LEGADO}"
+        )
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLA}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {TABLA}), 0) + 1, false)"
+        )
+        cursor.execute(f"DROP TABLE {LEGADO} CASCADE")
+        cursor.execute(f"CREATE INDEX {TABLA}_usuario_id_idx ON {TABLA} (usuario_id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bitacora', '0001_initial'),
+        ('users', '0002_auto_20250925_1635'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar, desparticionar),
+        migrations.AddIndex(
+            model_name='bitacora',
+            index=models.Index(fields=['fecha_hora', 'modulo'], name='bitacora_fecha_modulo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bitacora',
+            index=models.Index(fields=['usuario', 'fecha_hora'], name='bitacora_usuario_fecha_idx'),
+        ),
+    ]
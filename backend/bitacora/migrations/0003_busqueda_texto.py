@@ -0,0 +1,93 @@
+"""
+Búsqueda de texto completo sobre la bitácora.
+
+- ``busqueda``: tsvector (configuración ``spanish``) mantenido por un trigger
+  a partir de accion, descripcion y modulo, con índice GIN.
+- Índices trigram sobre usuario (username, nombres) para búsquedas parciales
+  con ``icontains``. Requieren la extensión pg_trgm; si el servidor no la
+  ofrece se omiten y la búsqueda sigue funcionando sin ellos.
+"""
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+FUNCION_TRIGGER = """
+CREATE OR REPLACE FUNCTION bitacora_busqueda_actualizar() RETURNS trigger AS $$
+BEGIN
+    NEW.busqueda :=
+        setweight(to_tsvector('spanish', coalesce(NEW.accion, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(NEW.descripcion, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.modulo, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER = """
+CREATE TRIGGER bitacora_busqueda_trigger
+BEFORE INSERT OR UPDATE OF accion, descripcion, modulo ON bitacora_bitacora
+FOR EACH ROW EXECUTE FUNCTION bitacora_busqueda_actualizar();
+"""
+
+# Índices sobre UPPER(...) porque ``icontains`` en PostgreSQL genera UPPER(col) LIKE UPPER(%s)
+INDICES_TRIGRAM = {
+    "users_customuser_username_trgm": "username",
+    "users_customuser_first_name_trgm": "first_name",
+    "users_customuser_last_name_trgm": "last_name",
+}
+
+
+def crear_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(FUNCION_TRIGGER)
+        cursor.execute(TRIGGER)
+        # Poblar los registros existentes
+        cursor.execute("UPDATE bitacora_bitacora SET accion = accion")
+
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for nombre, columna in INDICES_TRIGRAM.items():
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {nombre} ON users_customuser "
+                f"USING gin (UPPER({columna}) gin_trgm_ops)"
+            )
+
+
+def eliminar_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for nombre in INDICES_TRIGRAM:
+            cursor.execute(f"DROP INDEX IF EXISTS {nombre}")
+        cursor.execute("DROP TRIGGER IF EXISTS bitacora_busqueda_trigger ON bitacora_bitacora")
+        cursor.execute("DROP FUNCTION IF EXISTS bitacora_busqueda_actualizar()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bitacora', '0002_particionar_bitacora'),
+        ('users', '0002_auto_20250925_1635'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bitacora',
+            name='busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bitacora',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['busqueda'], name='bitacora_busqueda_idx'),
+        ),
+        migrations.RunPython(crear_busqueda, eliminar_busqueda),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bitacora', '0003_busqueda_texto'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bitacora',
+            index=models.Index(fields=['fecha_hora', 'id'], name='bitacora_fecha_id_idx'),
+        ),
+    ]
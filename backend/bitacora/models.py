@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.timezone import now
 
 class Bitacora(models.Model):
@@ -24,6 +26,17 @@ class Bitacora(models.Model):
     ip = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     modulo = models.CharField(max_length=50, choices=MODULOS, default='GENERAL')
+    # Mantenido por un trigger de PostgreSQL (ver migración 0003_busqueda_texto)
+    busqueda = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        # La tabla está particionada por mes sobre fecha_hora (ver bitacora.particiones)
+        indexes = [
+            models.Index(fields=['fecha_hora', 'modulo'], name='bitacora_fecha_modulo_idx'),
+            models.Index(fields=['fecha_hora', 'id'], name='bitacora_fecha_id_idx'),
+            models.Index(fields=['usuario', 'fecha_hora'], name='bitacora_usuario_fecha_idx'),
+            GinIndex(fields=['busqueda'], name='bitacora_busqueda_idx'),
+        ]
 
 def __str__(self):
     usuario = getattr(self.usuario, "username", "Sistema")
@@ -0,0 +1,210 @@
+"""
+Gestión del particionado mensual de la bitácora (PostgreSQL).
+
+La tabla ``bitacora_bitacora`` se particiona por rango sobre ``fecha_hora``
+con una partición por mes (``bitacora_bitacora_pAAAA_MM``) más una partición
+por defecto que recoge cualquier fila fuera de los rangos creados.
+
+Este módulo concentra la lógica usada por la migración de conversión y por
+los comandos ``bitacora_particiones`` y ``bitacora_archivar``.
+"""
+
+import gzip
+import os
+import re
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+TABLA = "bitacora_bitacora"
+PARTICION_DEFECTO = f"{TABLA}_default"
+PATRON_PARTICION = re.compile(rf"^{TABLA}_p(\d{{4}})_(\d{{2}})$")
+
+
+def nombre_particion(anio, mes):
+    """Retorna el nombre de la partición mensual"""
+    return f"{TABLA}_p{anio:04d}_{mes:02d}"
+
+
+def siguiente_mes(anio, mes):
+    """Retorna (anio, mes) del mes siguiente"""
+    return (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+
+
+def sumar_meses(anio, mes, cantidad):
+    """Desplaza (anio, mes) una cantidad de meses (positiva o negativa)"""
+    total = anio * 12 + (mes - 1) + cantidad
+    return total // 12, total % 12 + 1
+
+
+def es_particionada(cursor=None):
+    """Verifica si la tabla de bitácora ya está particionada"""
+    if connection.vendor != "postgresql":
+        return False
+
+    def _consultar(cur):
+        cur.execute(
+            "SELECT c.relkind FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relname = %s AND n.nspname = current_schema()",
+            [TABLA],
+        )
+        fila = cur.fetchone()
+        return bool(fila and fila[0] == "p")
+
+    if cursor is not None:
+        return _consultar(cursor)
+    with connection.cursor() as cur:
+        return _consultar(cur)
+
+
+def listar_particiones(cursor=None):
+    """
+    Lista las particiones mensuales existentes, ordenadas por fecha.
+    Retorna una lista de tuplas (nombre, anio, mes).
+    """
+
+    def _consultar(cur):
+        cur.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [TABLA],
+        )
+        particiones = []
+        for (nombre,) in cur.fetchall():
+            coincidencia = PATRON_PARTICION.match(nombre)
+            if coincidencia:
+                particiones.append(
+                    (nombre, int(coincidencia.group(1)), int(coincidencia.group(2)))
+                )
+        return sorted(particiones, key=lambda p: (p[1], p[2]))
+
+    if cursor is not None:
+        return _consultar(cursor)
+    with connection.cursor() as cur:
+        return _consultar(cur)
+
+
+def crear_particion(cursor, anio, mes):
+    """
+    Crea la partición mensual si no existe.
+
+    Si la partición por defecto contiene filas de ese mes, se trasladan a la
+    nueva partición (PostgreSQL no permite crearla mientras existan).
+    Retorna True si la partición fue creada.
+    """
+    nombre = nombre_particion(anio, mes)
+    cursor.execute("SELECT to_regclass(%s)", [nombre])
+    if cursor.fetchone()[0] is not None:
+        return False
+
+    desde = date(anio, mes, 1)
+    hasta = date(*siguiente_mes(anio, mes), 1)
+
+    cursor.execute("SELECT to_regclass(%s)", [PARTICION_DEFECTO])
+    hay_defecto = cursor.fetchone()[0] is not None
+    movidas = False
+    if hay_defecto:
+        cursor.execute(
+            f"CREATE TEMP TABLE _bitacora_traslado "
+            f"(LIKE {PARTICION_DEFECTO}) ON COMMIT DROP"
+        )
+        cursor.execute(
+            f"WITH movidas AS ("
+            f"  DELETE FROM {PARTICION_DEFECTO} "
+            f"  WHERE fecha_hora >= %s AND fecha_hora < %s RETURNING *"
+            f") INSERT INTO _bitacora_traslado SELECT * FROM movidas",
+            [desde, hasta],
+        )
+        movidas = cursor.rowcount > 0
+
+    cursor.execute(
+        f"CREATE TABLE {nombre} PARTITION OF {TABLA} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [desde, hasta],
+    )
+
+    if hay_defecto:
+        if movidas:
+            cursor.execute(f"INSERT INTO {TABLA} SELECT * FROM _bitacora_traslado")
+        cursor.execute("DROP TABLE _bitacora_traslado")
+    return True
+
+
+def asegurar_particiones(meses_adelante=3, desde=None):
+    """
+    Garantiza que existan las particiones desde ``desde`` (anio, mes) hasta
+    ``meses_adelante`` meses después del mes actual.
+    Retorna la lista de particiones creadas.
+    """
+    hoy = timezone.now().date()
+    inicio = desde or (hoy.year, hoy.month)
+    fin = sumar_meses(hoy.year, hoy.month, meses_adelante)
+
+    creadas = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not es_particionada(cursor):
+            return creadas
+        anio, mes = inicio
+        while (anio, mes) <= fin:
+            if crear_particion(cursor, anio, mes):
+                creadas.append(nombre_particion(anio, mes))
+            anio, mes = siguiente_mes(anio, mes)
+    return creadas
+
+
+def particiones_vencidas(meses_retencion, cursor=None):
+    """
+    Retorna las particiones cuyo mes completo es anterior a la ventana de
+    retención (los ``meses_retencion`` meses más recientes, incluido el actual).
+    """
+    hoy = timezone.now().date()
+    limite = sumar_meses(hoy.year, hoy.month, -(meses_retencion - 1))
+    return [p for p in listar_particiones(cursor) if (p[1], p[2]) < limite]
+
+
+def archivar_particion(nombre, destino):
+    """
+    Exporta una partición a ``destino/<nombre>.csv.gz`` usando COPY y luego la
+    separa y elimina de la tabla principal.
+    Retorna la ruta del archivo generado.
+    """
+    os.makedirs(destino, exist_ok=True)
+    ruta = os.path.join(destino, f"{nombre}.csv.gz")
+    ruta_temporal = f"{ruta}.tmp"
+
+    with connection.cursor() as cursor:
+        with gzip.open(ruta_temporal, "wb") as archivo:
+            # COPY transmite las filas en flujo: la memoria no depende del tamaño
+            cursor.copy_expert(
+                f"COPY {nombre} TO STDOUT WITH (FORMAT csv, HEADER true)", archivo
+            )
+    os.replace(ruta_temporal, ruta)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}")
+        cursor.execute(f"DROP TABLE {nombre}")
+    return ruta
+
+
+def estimar_total():
+    """
+    Estimación del número de filas según las estadísticas de PostgreSQL.
+    Evita un COUNT(*) completo sobre la tabla particionada.
+    """
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(GREATEST(child.reltuples, 0)), 0)::bigint "
+            "FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [TABLA],
+        )
+        fila = cursor.fetchone()
+    return int(fila[0]) if fila else None
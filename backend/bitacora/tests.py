@@ -1,3 +1,235 @@
+from datetime import datetime
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Bitacora
+from .particiones import (
+    asegurar_particiones,
+    crear_particion,
+    es_particionada,
+    nombre_particion,
+    sumar_meses,
+)
+
+
+class ParticionesTest(TestCase):
+    def test_sumar_meses(self):
+        self.assertEqual(sumar_meses(2025, 11, 3), (2026, 2))
+        self.assertEqual(sumar_meses(2025, 1, -1), (2024, 12))
+
+    def test_tabla_particionada(self):
+        self.assertTrue(es_particionada())
+        # Las particiones del mes actual y siguientes ya existen
+        self.assertEqual(asegurar_particiones(meses_adelante=3), [])
+
+    def test_crear_particion_traslada_filas_por_defecto(self):
+        registro = Bitacora.objects.create(
+            accion='Prueba', descripcion='Fuera de rango', modulo='TEST',
+            fecha_hora=datetime(2040, 6, 15, 10, 0),
+        )
+        with connection.cursor() as cursor:
+            self.assertTrue(crear_particion(cursor, 2040, 6))
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM bitacora_bitacora WHERE id = %s",
+                [registro.id],
+            )
+            self.assertEqual(cursor.fetchone()[0], nombre_particion(2040, 6))
+
+
+class BusquedaBitacoraTest(TestCase):
+    def setUp(self):
+        from users.models import CustomUser, Rol
+
+        rol = Rol.objects.create(nombre='Guardia')
+        self.usuario = CustomUser.objects.create_user(
+            username='jperez', password='clave12345', first_name='Juan', rol=rol
+        )
+        self.reserva = Bitacora.objects.create(
+            accion='CREACION_RESERVA', descripcion='Reserva del salón de eventos',
+            modulo='RESERVAS',
+        )
+        self.login = Bitacora.objects.create(
+            accion='LOGIN', descripcion='Inicio de sesión', modulo='USUARIOS',
+            usuario=self.usuario,
+        )
+
+    def _buscar(self, **params):
+        respuesta = self.client.get('/api/bitacora/', params)
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        return [r['id'] for r in datos.get('results', datos)]
+
+    def test_vector_mantenido_por_trigger(self):
+        self.reserva.refresh_from_db()
+        self.assertIsNotNone(self.reserva.busqueda)
+
+    def test_busqueda_por_texto_con_prefijo(self):
+        self.assertEqual(self._buscar(search='reserv'), [self.reserva.id])
+
+    def test_busqueda_por_usuario_y_rol(self):
+        self.assertEqual(self._buscar(search='jpe'), [self.login.id])
+        self.assertEqual(self._buscar(rol='guardia'), [self.login.id])
+
+
+class PaginacionBitacoraTest(TestCase):
+    def setUp(self):
+        # Misma fecha para verificar el desempate por id
+        fecha = datetime(2026, 1, 10, 8, 0)
+        self.ids = [
+            Bitacora.objects.create(
+                accion='LOGIN', descripcion=f'Registro {i}', modulo='USUARIOS',
+                fecha_hora=fecha,
+            ).id
+            for i in range(15)
+        ]
+
+    def test_paginacion_por_cursor_sin_conteo(self):
+        datos = self.client.get('/api/bitacora/').json()
+        self.assertNotIn('count', datos)
+        recibidos = [r['id'] for r in datos['results']]
+        datos = self.client.get(datos['next']).json()
+        recibidos += [r['id'] for r in datos['results']]
+        self.assertIsNone(datos['next'])
+        self.assertEqual(recibidos, sorted(self.ids, reverse=True))
+
+    def test_busqueda_pagina_por_numero_y_count_opcional(self):
+        datos = self.client.get('/api/bitacora/', {'search': 'registro'}).json()
+        self.assertEqual(datos['count'], 15)
+        datos = self.client.get(
+            '/api/bitacora/', {'search': 'registro', 'count': 'false', 'page': 2}
+        ).json()
+        self.assertNotIn('count', datos)
+        self.assertEqual(len(datos['results']), 5)
+        self.assertIsNone(datos['next'])
+        self.assertIsNotNone(datos['previous'])
+
+    def test_page_size_solo_en_el_cursor(self):
+        from unittest import mock
+        from core.pagination import FechaCursorPagination
+
+        datos = self.client.get('/api/bitacora/', {'page_size': 4}).json()
+        self.assertEqual(len(datos['results']), 4)
+        with mock.patch.object(FechaCursorPagination, 'max_page_size', 12):
+            datos = self.client.get('/api/bitacora/', {'page_size': 1000}).json()
+        self.assertEqual(len(datos['results']), 12)
+        # La paginación por número de página (por defecto) ignora page_size
+        datos = self.client.get('/api/bitacora/', {'search': 'registro', 'page_size': 4}).json()
+        self.assertEqual(len(datos['results']), 10)
+
+
+class ExportacionBitacoraTest(TestCase):
+    def setUp(self):
+        from rest_framework.test import APIClient
+        from users.models import CustomUser, Rol
+
+        Bitacora.objects.create(accion='LOGIN', descripcion='Inicio, con coma', modulo='USUARIOS')
+        Bitacora.objects.create(accion='LOGOUT', descripcion='Cierre', modulo='USUARIOS')
+        rol = Rol.objects.create(nombre='Administrador', descripcion='', es_administrativo=True)
+        self.admin = CustomUser.objects.create_user(
+            username='admin', email='admin@example.com', rol=rol, is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _contenido(self, respuesta):
+        return b''.join(respuesta.streaming_content)
+
+    def test_exportar_csv(self):
+        respuesta = self.client.get('/api/bitacora/exportar/', {'search': 'inicio'})
+        self.assertEqual(respuesta.status_code, 200)
+        lineas = self._contenido(respuesta).decode().splitlines()
+        self.assertTrue(lineas[0].startswith('id,fecha_hora,usuario'))
+        self.assertEqual(len(lineas), 2)
+        self.assertIn('"Inicio, con coma"', lineas[1])
+
+    def test_exportar_ndjson_gzip(self):
+        import gzip
+        import json
+
+        respuesta = self.client.get('/api/bitacora/exportar/', {'formato': 'ndjson', 'gzip': 'true'})
+        self.assertEqual(respuesta['Content-Type'], 'application/gzip')
+        filas = [
+            json.loads(linea)
+            for linea in gzip.decompress(self._contenido(respuesta)).decode().splitlines()
+        ]
+        self.assertEqual([f['accion'] for f in filas], ['LOGOUT', 'LOGIN'])
+
+    def test_exportar_requiere_administrador(self):
+        from rest_framework.test import APIClient
+        from users.models import CustomUser
+
+        anonimo = APIClient()
+        self.assertIn(anonimo.get('/api/bitacora/exportar/').status_code, (401, 403))
+
+        vecino = APIClient()
+        vecino.force_authenticate(
+            user=CustomUser.objects.create_user(username='vecino', email='vecino@example.com')
+        )
+        self.assertEqual(vecino.get('/api/bitacora/exportar/').status_code, 403)
+
+    def test_formato_invalido(self):
+        respuesta = self.client.get('/api/bitacora/exportar/', {'formato': 'xml'})
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_exportar_en_flujo_bajo_asgi(self):
+        import asyncio
+        import warnings
+        from unittest import mock
+        from asgiref.sync import async_to_sync
+        from django.core.handlers.asgi import ASGIHandler
+        from django.core.signals import request_finished, request_started
+        from django.db import close_old_connections
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from core import exportacion
+
+        Bitacora.objects.create(accion='LOGIN', descripcion='Otro inicio', modulo='USUARIOS')
+        token = RefreshToken.for_user(self.admin).access_token
+        eventos = []
+        por_lotes = exportacion._por_lotes
+
+        def lotes_registrados(iterable, tamano):
+            for lote in por_lotes(iterable, tamano):
+                eventos.append('lote')
+                yield lote
+
+        async def exportar():
+            scope = {
+                'type': 'http', 'method': 'GET', 'path': '/api/bitacora/exportar/',
+                'query_string': b'', 'server': ('testserver', 80),
+                'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+            }
+            desconexion = asyncio.Event()
+            mensajes = []
+
+            async def recibir():
+                if not mensajes:
+                    mensajes.append(None)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await desconexion.wait()
+                return {'type': 'http.disconnect'}
+
+            async def enviar(mensaje):
+                if mensaje['type'] == 'http.response.start':
+                    self.assertEqual(mensaje['status'], 200)
+                elif mensaje.get('body'):
+                    eventos.append('envio')
+
+            await ASGIHandler()(scope, recibir, enviar)
+
+        # Como el cliente de pruebas: la conexión de la transacción de la prueba
+        # no se cierra al empezar y terminar la petición
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with mock.patch.object(exportacion, 'TAMANO_LOTE', 1), \
+                    mock.patch.object(exportacion, '_por_lotes', lotes_registrados), \
+                    warnings.catch_warnings():
+                warnings.filterwarnings('error', message='StreamingHttpResponse must consume')
+                async_to_sync(exportar)()
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        # Encabezado y luego cada lote se envía antes de leer el siguiente
+        self.assertEqual(eventos, ['envio'] + ['lote', 'envio'] * 3)
@@ -1,5 +1,6 @@
 from .models import Bitacora
 from django.utils.timezone import now
+from core.metricas import REGISTROS_BITACORA
 
 def get_client_ip(request):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -31,4 +32,29 @@ def registrar_bitacora(request=None, usuario=None, accion="", descripcion="", mo
         ip=ip,
         user_agent=user_agent,
         modulo=modulo
-    )
\ No newline at end of file
+    )
+    REGISTROS_BITACORA.inc(modulo=modulo)
+
+def registrar_bitacora_lote(registros, modulo="GENERAL", usuario=None, request=None):
+    """
+    Crea varios registros en la bitácora con un solo INSERT.
+    ``registros`` es una lista de tuplas (accion, descripcion).
+    Sin request (comandos programados) no se guardan IP ni user agent.
+    """
+    fecha_hora = now()
+    ip = get_client_ip(request) if request else None
+    user_agent = get_user_agent(request) if request else ""
+    creados = Bitacora.objects.bulk_create([
+        Bitacora(
+            usuario=usuario,
+            accion=accion,
+            descripcion=descripcion,
+            fecha_hora=fecha_hora,
+            ip=ip,
+            user_agent=user_agent,
+            modulo=modulo
+        )
+        for accion, descripcion in registros
+    ])
+    REGISTROS_BITACORA.inc(len(creados), modulo=modulo)
+    return creados
@@ -1,28 +1,78 @@
-from django.db.models import Q
-from rest_framework import viewsets, filters
+from datetime import datetime, time, timedelta
+from django.utils.dateparse import parse_date
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from core.exportacion import exportar_queryset
+from core.pagination import ConteoOpcionalPagination, FechaCursorPagination
+from .busqueda import BitacoraSearchFilter
 from .models import Bitacora
 from .serializers import BitacoraSerializer
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from users.permissions import IsAdminPortalUser
+
+COLUMNAS_EXPORTACION = [
+    ('id', 'id'),
+    ('fecha_hora', 'fecha_hora'),
+    ('usuario', 'usuario__username'),
+    ('rol', 'usuario__rol__nombre'),
+    ('modulo', 'modulo'),
+    ('accion', 'accion'),
+    ('descripcion', 'descripcion'),
+    ('ip', 'ip'),
+    ('user_agent', 'user_agent'),
+]
+
 
 class BitacoraViewSet(viewsets.ModelViewSet):
     serializer_class = BitacoraSerializer
     permission_classes = [AllowAny]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [BitacoraSearchFilter]
+    pagination_class = FechaCursorPagination
+
+    @property
+    def paginator(self):
+        # Con búsqueda los resultados se ordenan por relevancia, que no sirve
+        # como cursor; en ese caso se pagina por número de página.
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('search', '').strip():
+                self._paginator = ConteoOpcionalPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
-        queryset = Bitacora.objects.all().order_by('-fecha_hora')
-        search = self.request.GET.get('search', '').strip()
-        if search:
+        # El serializer accede a usuario y usuario.rol en cada fila
+        queryset = Bitacora.objects.select_related('usuario__rol').order_by('-fecha_hora', '-id')
+        # search y rol se aplican en BitacoraSearchFilter
+        # Filtros por rango de fechas sobre la columna sin transformar, para que
+        # PostgreSQL descarte particiones completas y use los índices
+        fecha_desde = self._parse_fecha('fecha_desde')
+        if fecha_desde:
+            queryset = queryset.filter(fecha_hora__gte=datetime.combine(fecha_desde, time.min))
+        fecha_hasta = self._parse_fecha('fecha_hasta')
+        if fecha_hasta:
             queryset = queryset.filter(
-                Q(accion__icontains=search) |
-                Q(descripcion__icontains=search) |
-                Q(usuario__username__icontains=search) |
-                Q(usuario__first_name__icontains=search) |   
-                Q(usuario__last_name__icontains=search) | 
-                Q(usuario__rol__nombre__icontains=search)
+                fecha_hora__lt=datetime.combine(fecha_hasta + timedelta(days=1), time.min)
             )
-        rol = self.request.GET.get('rol', '').strip()
-        if rol:
-            queryset = queryset.filter(usuario__rol__nombre__iexact=rol)
 
-        return queryset
\ No newline at end of file
+        modulo = self.request.GET.get('modulo', '').strip()
+        if modulo:
+            queryset = queryset.filter(modulo=modulo.upper())
+
+        return queryset
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsAdminPortalUser])
+    def exportar(self, request):
+        """
+        Exporta la bitácora con los mismos filtros del listado (CSV o NDJSON).
+        Incluye IP y user agent: solo para el panel administrativo.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(request, queryset, COLUMNAS_EXPORTACION, 'bitacora')
+
+    def _parse_fecha(self, parametro):
+        valor = self.request.GET.get(parametro, '').strip()
+        try:
+            return parse_date(valor) if valor else None
+        except ValueError:
+            return None
\ No newline at end of file
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self):
+        """Invalidación de los contadores del dashboard por módulo"""
+        from .dashboard import conectar_senales
+
+        conectar_senales()
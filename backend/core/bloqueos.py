@@ -0,0 +1,33 @@
+"""
+Bloqueos consultivos (advisory locks) de PostgreSQL.
+
+Permiten que tareas programadas (comandos de management ejecutados por cron
+en varios contenedores) no se ejecuten en paralelo: solo el proceso que
+obtiene el bloqueo trabaja, el resto termina sin hacer nada.
+"""
+
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def bloqueo_consultivo(nombre):
+    """
+    Intenta obtener el bloqueo de sesión identificado por ``nombre`` sin
+    esperar. Entrega True si se obtuvo (y lo libera al salir) o False si otro
+    proceso lo tiene.
+    """
+    if connection.vendor != "postgresql":
+        yield True
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [nombre])
+        obtenido = cursor.fetchone()[0]
+    try:
+        yield obtenido
+    finally:
+        if obtenido:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [nombre])
@@ -0,0 +1,194 @@
+"""
+Caché compartida con espacios de nombres y métricas.
+
+settings.CACHES usa Redis (REDIS_URL) para que todos los procesos del
+servidor compartan la misma caché; en pruebas o sin Redis se usa
+LocMemCache. Cada app trabaja sobre su propio espacio::
+
+    DISPONIBILIDAD = espacio("reservas:disponibilidad")
+    DISPONIBILIDAD.get_many([...])
+
+- Las claves se prefijan con el nombre del espacio.
+- Un espacio ``versionado`` se invalida completo con ``invalidar()``:
+  se cambia la versión del espacio y las claves anteriores quedan
+  inaccesibles sin recorrerlas (expiran por su TTL).
+- Se cuentan aciertos, fallos, escrituras, borrados, errores y el tiempo
+  acumulado por espacio (``metricas()``, por proceso).
+- Un error del backend (Redis caído) se registra y se trata como fallo
+  de caché: la operación sigue contra la base de datos.
+"""
+
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CONTADORES = ("operaciones", "aciertos", "fallos", "escrituras", "borrados", "errores")
+
+_FALTA = object()
+_metricas = {}
+_metricas_lock = threading.Lock()
+
+
+def _nueva_version():
+    # Basada en el reloj: si la clave de versión se pierde (evicción) la
+    # nueva nunca coincide con una anterior y no reaparecen datos viejos
+    return time.time_ns()
+
+
+class EspacioCache:
+    """Vista de la caché restringida a un espacio de nombres"""
+
+    def __init__(self, nombre, versionado=False, alias="default"):
+        self.nombre = nombre
+        self.versionado = versionado
+        self.alias = alias
+        self._clave_version = f"{nombre}:version"
+        with _metricas_lock:
+            _metricas.setdefault(nombre, {**dict.fromkeys(CONTADORES, 0), "segundos": 0.0})
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def _clave(self, clave):
+        return f"{self.nombre}:{clave}"
+
+    def _version(self):
+        if not self.versionado:
+            return None
+        return self._cache.get_or_set(self._clave_version, _nueva_version, timeout=None)
+
+    def _registrar(self, inicio, **contadores):
+        with _metricas_lock:
+            metricas = _metricas[self.nombre]
+            metricas["operaciones"] += 1
+            metricas["segundos"] += time.perf_counter() - inicio
+            for contador, cantidad in contadores.items():
+                metricas[contador] += cantidad
+
+    def _error(self, inicio, operacion):
+        logger.warning("Error de caché en %s (%s)", self.nombre, operacion, exc_info=True)
+        self._registrar(inicio, errores=1)
+
+    def get(self, clave, default=None):
+        inicio = time.perf_counter()
+        try:
+            valor = self._cache.get(self._clave(clave), _FALTA, version=self._version())
+        except Exception:
+            self._error(inicio, "get")
+            return default
+        if valor is _FALTA:
+            self._registrar(inicio, fallos=1)
+            return default
+        self._registrar(inicio, aciertos=1)
+        return valor
+
+    def get_many(self, claves):
+        """Retorna {clave: valor} solo de las claves presentes"""
+        inicio = time.perf_counter()
+        completas = {self._clave(clave): clave for clave in claves}
+        try:
+            encontrados = self._cache.get_many(list(completas), version=self._version())
+        except Exception:
+            self._error(inicio, "get_many")
+            return {}
+        self._registrar(
+            inicio, aciertos=len(encontrados), fallos=len(completas) - len(encontrados)
+        )
+        return {completas[clave]: valor for clave, valor in encontrados.items()}
+
+    def set(self, clave, valor, timeout=DEFAULT_TIMEOUT):
+        inicio = time.perf_counter()
+        try:
+            self._cache.set(self._clave(clave), valor, timeout, version=self._version())
+        except Exception:
+            self._error(inicio, "set")
+            return
+        self._registrar(inicio, escrituras=1)
+
+    def set_many(self, valores, timeout=DEFAULT_TIMEOUT):
+        if not valores:
+            return
+        inicio = time.perf_counter()
+        try:
+            self._cache.set_many(
+                {self._clave(clave): valor for clave, valor in valores.items()},
+                timeout,
+                version=self._version(),
+            )
+        except Exception:
+            self._error(inicio, "set_many")
+            return
+        self._registrar(inicio, escrituras=len(valores))
+
+    def delete(self, clave):
+        self.delete_many([clave])
+
+    def consumir(self, clave, default=None):
+        """
+        Lee y borra una clave de un solo uso. Si dos procesos la consumen a
+        la vez solo la obtiene el que logra borrarla.
+        """
+        inicio = time.perf_counter()
+        completa = self._clave(clave)
+        version = self._version()
+        try:
+            valor = self._cache.get(completa, _FALTA, version=version)
+            borrada = valor is not _FALTA and self._cache.delete(completa, version=version)
+        except Exception:
+            self._error(inicio, "consumir")
+            return default
+        if not borrada:
+            self._registrar(inicio, fallos=1)
+            return default
+        self._registrar(inicio, aciertos=1, borrados=1)
+        return valor
+
+    def delete_many(self, claves):
+        claves = list(claves)
+        if not claves:
+            return
+        inicio = time.perf_counter()
+        try:
+            self._cache.delete_many(
+                [self._clave(clave) for clave in claves], version=self._version()
+            )
+        except Exception:
+            self._error(inicio, "delete_many")
+            return
+        self._registrar(inicio, borrados=len(claves))
+
+    def invalidar(self):
+        """Invalida todas las claves del espacio (solo espacios versionados)"""
+        if not self.versionado:
+            raise ValueError(f"El espacio de caché {self.nombre} no es versionado")
+        inicio = time.perf_counter()
+        try:
+            try:
+                self._cache.incr(self._clave_version)
+            except ValueError:
+                # La clave de versión no existe (nunca se leyó o se expulsó)
+                self._cache.set(self._clave_version, _nueva_version(), timeout=None)
+        except Exception:
+            self._error(inicio, "invalidar")
+            return
+        self._registrar(inicio, borrados=1)
+
+
+def espacio(nombre, versionado=False, alias="default"):
+    return EspacioCache(nombre, versionado=versionado, alias=alias)
+
+
+def metricas():
+    """Copia de los contadores por espacio, con la tasa de aciertos"""
+    with _metricas_lock:
+        copia = {nombre: dict(valores) for nombre, valores in _metricas.items()}
+    for valores in copia.values():
+        lecturas = valores["aciertos"] + valores["fallos"]
+        valores["tasa_aciertos"] = valores["aciertos"] / lecturas if lecturas else None
+    return copia
@@ -0,0 +1,72 @@
+"""
+Conteos agrupados para las acciones ``estadisticas``.
+
+En lugar de un ``count()`` por categoría, ``contar`` resuelve todos los
+conteos de un queryset en una o dos consultas:
+
+- las dimensiones (campos o rutas como ``rol__nombre``) con una sola
+  consulta ``values(*dimensiones).annotate(Count)``, sumando en Python el
+  desglose de cada dimensión;
+- el total y las condiciones (``{nombre: Q}``) con una consulta
+  ``aggregate(Count(filter=Q))``. Si no hay condiciones, el total se obtiene
+  de la consulta agrupada.
+
+Ejemplo::
+
+    conteos = contar(
+        Residente.objects.all(),
+        dimensiones=["estado", "tipo"],
+        condiciones={"nuevos_este_mes": Q(fecha_creacion__gte=inicio_mes)},
+    )
+    conteos["total"], conteos["nuevos_este_mes"], conteos["estado"]["activo"]
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count
+
+CONTEO = "conteo_agrupado"
+
+
+def _opciones(modelo, campo):
+    """Valores de ``choices`` de un campo directo del modelo (o vacío)"""
+    if "__" in campo:
+        return []
+    try:
+        return [valor for valor, _ in modelo._meta.get_field(campo).flatchoices]
+    except FieldDoesNotExist:
+        return []
+
+
+def contar(queryset, dimensiones=(), condiciones=None, completar=True):
+    """
+    Retorna ``{"total": n, <condición>: n, <dimensión>: {valor: n}}``.
+
+    Con ``completar`` las dimensiones con ``choices`` incluyen todas las
+    opciones, con 0 las que no tienen registros; sin él solo aparecen los
+    valores presentes.
+    """
+    # Sin orden (no agrega columnas al GROUP BY) ni prefetch (no aplica a values)
+    queryset = queryset.order_by().prefetch_related(None)
+    resultado = {}
+
+    if condiciones or not dimensiones:
+        resultado = queryset.aggregate(
+            total=Count("pk"),
+            **{nombre: Count("pk", filter=condicion) for nombre, condicion in (condiciones or {}).items()},
+        )
+
+    if dimensiones:
+        desglose = {
+            dimension: dict.fromkeys(_opciones(queryset.model, dimension) if completar else [], 0)
+            for dimension in dimensiones
+        }
+        total = 0
+        for fila in queryset.values(*dimensiones).annotate(**{CONTEO: Count("pk")}):
+            total += fila[CONTEO]
+            for dimension in dimensiones:
+                valores = desglose[dimension]
+                valores[fila[dimension]] = valores.get(fila[dimension], 0) + fila[CONTEO]
+        resultado.setdefault("total", total)
+        resultado.update(desglose)
+
+    return resultado
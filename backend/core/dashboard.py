@@ -0,0 +1,206 @@
+"""
+Contadores del dashboard administrativo.
+
+Cada módulo se resume con una sola consulta de agregación condicional
+(``aggregate(Count(..., filter=Q(...)))``) y el resultado se guarda en caché
+por módulo con un TTL corto, así la pantalla de inicio se resuelve con una
+lectura de caché y, como mucho, una consulta por módulo vencido.
+
+Al guardar o eliminar un registro de un módulo (señales post_save y
+post_delete, al confirmar la transacción) se borra solo la entrada de ese
+módulo, que se recalcula en la siguiente lectura. Las escrituras masivas
+(``update``/``bulk_create``) no emiten señales: cada una debe llamar a
+``invalidar_modelo``. Hoy lo hacen la importación masiva, la asignación de
+residentes, los cambios de estado y la creación recurrente de reservas, el
+ciclo de vida de reservas y el despacho de notificaciones; una escritura
+masiva nueva que no lo haga queda desactualizada hasta el TTL, que por lo
+demás solo cubre los contadores que dependen de la fecha (hoy, este mes).
+
+Cada usuario recibe solo los módulos que su rol le permite ver.
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .cache import espacio
+
+CACHE = espacio("core:dashboard")
+TTL_CACHE = 60
+
+
+def _usuarios():
+    User = apps.get_model("users", "CustomUser")
+    inicio_mes = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return User.objects.aggregate(
+        total=Count("id"),
+        activos=Count("id", filter=Q(is_active=True)),
+        administrativos=Count("id", filter=Q(rol__es_administrativo=True)),
+        clientes=Count("id", filter=Q(rol__es_administrativo=False)),
+        con_acceso_admin=Count("id", filter=Q(is_staff=True)),
+        nuevos_este_mes=Count("id", filter=Q(fecha_creacion__gte=inicio_mes)),
+    )
+
+
+def _residentes():
+    Residente = apps.get_model("residentes", "Residente")
+    return Residente.objects.aggregate(
+        total=Count("id"),
+        activos=Count("id", filter=Q(estado="activo")),
+        inactivos=Count("id", filter=Q(estado="inactivo")),
+        suspendidos=Count("id", filter=Q(estado="suspendido")),
+        en_proceso=Count("id", filter=Q(estado="en_proceso")),
+        sin_unidad=Count("id", filter=Q(unidad__isnull=True)),
+    )
+
+
+def _personal():
+    Personal = apps.get_model("personal", "Personal")
+    return Personal.objects.aggregate(
+        total=Count("id"),
+        activos=Count("id", filter=Q(estado=True)),
+        inactivos=Count("id", filter=Q(estado=False)),
+    )
+
+
+def _unidades():
+    UnidadHabitacional = apps.get_model("unidades", "UnidadHabitacional")
+    return UnidadHabitacional.objects.aggregate(
+        total=Count("id"),
+        ocupadas=Count("id", filter=Q(estado="OCUPADA")),
+        desocupadas=Count("id", filter=Q(estado="DESOCUPADA")),
+        en_mantenimiento=Count("id", filter=Q(estado="MANTENIMIENTO")),
+    )
+
+
+def _reservas():
+    Reserva = apps.get_model("reservas", "Reserva")
+    return Reserva.objects.aggregate(
+        total=Count("id"),
+        pendientes=Count("id", filter=Q(estado=Reserva.ESTADO_PENDIENTE)),
+        confirmadas=Count("id", filter=Q(estado=Reserva.ESTADO_CONFIRMADA)),
+        hoy=Count(
+            "id",
+            filter=Q(fecha_reserva=timezone.now().date(), estado__in=Reserva.ESTADOS_ACTIVOS),
+        ),
+    )
+
+
+def _inventario():
+    Inventario = apps.get_model("inventario", "Inventario")
+    return Inventario.objects.aggregate(
+        total=Count("id"),
+        activos=Count("id", filter=Q(estado="ACTIVO")),
+        en_reparacion=Count("id", filter=Q(estado="EN_REPARACION")),
+        dados_de_baja=Count("id", filter=Q(estado="DADO_DE_BAJA")),
+    )
+
+
+def _notificaciones():
+    Notificacion = apps.get_model("notificaciones", "Notificacion")
+    return Notificacion.objects.aggregate(
+        total=Count("id"),
+        programadas=Count("id", filter=Q(estado="programada")),
+        enviadas=Count("id", filter=Q(estado="enviada")),
+        activas=Count("id", filter=Q(activa=True)),
+    )
+
+
+def _seguridad():
+    AlertaSeguridad = apps.get_model("seguridad", "AlertaSeguridad")
+    RegistroAcceso = apps.get_model("seguridad", "RegistroAcceso")
+    inicio_dia = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        **AlertaSeguridad.objects.aggregate(
+            alertas_pendientes=Count("id", filter=Q(resuelta=False)),
+        ),
+        **RegistroAcceso.objects.filter(fecha_hora__gte=inicio_dia).aggregate(
+            accesos_hoy=Count("id"),
+            accesos_no_autorizados_hoy=Count("id", filter=Q(resultado="no_autorizado")),
+        ),
+    }
+
+
+# nombre: (modelos que lo invalidan, quién puede verlo, cálculo)
+MODULOS = {
+    "usuarios": (
+        ["users.CustomUser"],
+        lambda usuario: usuario.tiene_permiso("gestionar_usuarios"),
+        _usuarios,
+    ),
+    "residentes": (
+        ["residentes.Residente"],
+        lambda usuario: usuario.tiene_permiso("gestionar_residentes"),
+        _residentes,
+    ),
+    "personal": (
+        ["personal.Personal"],
+        lambda usuario: usuario.tiene_permiso("gestionar_personal") or usuario.tiene_permiso("ver_personal"),
+        _personal,
+    ),
+    "unidades": (
+        ["unidades.UnidadHabitacional"],
+        lambda usuario: True,
+        _unidades,
+    ),
+    "reservas": (
+        ["reservas.Reserva"],
+        lambda usuario: usuario.is_staff,
+        _reservas,
+    ),
+    "inventario": (
+        ["inventario.Inventario"],
+        lambda usuario: usuario.is_staff,
+        _inventario,
+    ),
+    "notificaciones": (
+        ["notificaciones.Notificacion"],
+        lambda usuario: usuario.is_staff and usuario.es_administrativo,
+        _notificaciones,
+    ),
+    "seguridad": (
+        ["seguridad.AlertaSeguridad", "seguridad.RegistroAcceso"],
+        lambda usuario: usuario.tiene_permisos(["seguridad.ver_estadisticas"]),
+        _seguridad,
+    ),
+}
+
+
+def modulos_visibles(usuario):
+    return [nombre for nombre, (_, puede_ver, _) in MODULOS.items() if puede_ver(usuario)]
+
+
+def calcular_dashboard(usuario):
+    """{modulo: contadores} de los módulos visibles para el usuario"""
+    nombres = modulos_visibles(usuario)
+    contadores = CACHE.get_many(nombres)
+    faltantes = {nombre: MODULOS[nombre][2]() for nombre in nombres if nombre not in contadores}
+    CACHE.set_many(faltantes, TTL_CACHE)
+    contadores.update(faltantes)
+    return {nombre: contadores[nombre] for nombre in nombres}
+
+
+def invalidar_modulo(nombre):
+    transaction.on_commit(lambda: CACHE.delete(nombre))
+
+
+def invalidar_modelo(modelo):
+    """Invalida los módulos que cuentan registros de ``modelo``"""
+    for nombre, (modelos, _, _) in MODULOS.items():
+        if modelo._meta.label in modelos:
+            invalidar_modulo(nombre)
+
+
+def conectar_senales():
+    """Conecta la invalidación por módulo a las señales de sus modelos"""
+    for nombre, (modelos, _, _) in MODULOS.items():
+        def receptor(sender, nombre=nombre, **kwargs):
+            invalidar_modulo(nombre)
+
+        for etiqueta in modelos:
+            modelo = apps.get_model(etiqueta)
+            uid = f"dashboard:{nombre}:{etiqueta}"
+            post_save.connect(receptor, sender=modelo, weak=False, dispatch_uid=uid)
+            post_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=uid)
@@ -0,0 +1,200 @@
+"""
+Eventos en tiempo real para el canal Server-Sent Events (core.sse).
+
+El código que genera eventos (envío de notificaciones, alertas de seguridad)
+llama a ``publicar`` y cada conexión SSE abierta recibe, a través del broker,
+los eventos cuya audiencia incluye a su usuario.
+
+- Broker en proceso: reparte los eventos a las suscripciones del mismo
+  proceso. Basta con un solo proceso del servidor ASGI.
+- Broker Redis (``EVENTOS_REDIS_URL``): los eventos se publican en un canal
+  pub/sub y cada proceso con suscriptores los recibe en un hilo de escucha,
+  de modo que funcionan varios procesos o réplicas.
+
+Cada suscripción tiene una cola acotada: si el cliente no consume a tiempo
+se marca como desbordada y la conexión se cierra; el cliente reconecta con
+``Last-Event-ID`` y recupera lo pendiente del historial reciente.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+TAMANO_HISTORIAL = 500
+TAMANO_COLA = 100
+CANAL_REDIS = "condominio:eventos"
+
+
+def visible_para(evento, rol_id, administrativo):
+    """Indica si el evento está dirigido al usuario (por rol o por ser administrativo)"""
+    audiencia = evento["audiencia"]
+    if audiencia.get("administrativos") and administrativo:
+        return True
+    return rol_id is not None and rol_id in audiencia.get("roles", ())
+
+
+class Suscripcion:
+    """Cola de eventos de una conexión SSE, atendida en el event loop del servidor"""
+
+    def __init__(self, loop, filtro, tamano_cola=TAMANO_COLA):
+        self.loop = loop
+        self.filtro = filtro
+        self.cola = asyncio.Queue(maxsize=tamano_cola)
+        self.desbordada = False
+
+    def _encolar(self, evento):
+        if self.desbordada:
+            return
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Cliente lento: se cierra la conexión y reconecta con Last-Event-ID
+            self.desbordada = True
+
+    def entregar(self, evento):
+        """Puede llamarse desde cualquier hilo"""
+        if not self.filtro(evento):
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._encolar, evento)
+        except RuntimeError:
+            # El event loop ya se cerró
+            pass
+
+
+class Broker:
+    """Broker en proceso con historial reciente para reconexiones"""
+
+    def __init__(self, tamano_historial=TAMANO_HISTORIAL):
+        self._lock = threading.Lock()
+        self._suscripciones = set()
+        self._historial = deque(maxlen=tamano_historial)
+        self._ultimo_id = 0
+
+    def nuevo_id(self):
+        # Ids crecientes basados en el reloj: comparables entre procesos
+        with self._lock:
+            self._ultimo_id = max(self._ultimo_id + 1, time.time_ns() // 1000)
+            return self._ultimo_id
+
+    def publicar(self, evento):
+        self.distribuir(evento)
+
+    def distribuir(self, evento):
+        with self._lock:
+            self._historial.append(evento)
+            suscripciones = list(self._suscripciones)
+        for suscripcion in suscripciones:
+            suscripcion.entregar(evento)
+
+    def suscribir(self, filtro, ultimo_id=None):
+        """
+        Registra una suscripción en el event loop actual. Retorna
+        (suscripcion, pendientes, incompleto): los eventos del historial
+        posteriores a ``ultimo_id`` y si pudo haberse perdido alguno.
+        """
+        suscripcion = Suscripcion(asyncio.get_running_loop(), filtro)
+        with self._lock:
+            self._suscripciones.add(suscripcion)
+            pendientes = []
+            incompleto = False
+            if ultimo_id is not None:
+                pendientes = [e for e in self._historial if e["id"] > ultimo_id and filtro(e)]
+                incompleto = (
+                    len(self._historial) == self._historial.maxlen
+                    and self._historial[0]["id"] > ultimo_id
+                )
+        return suscripcion, pendientes, incompleto
+
+    def cancelar(self, suscripcion):
+        with self._lock:
+            self._suscripciones.discard(suscripcion)
+
+
+class BrokerRedis(Broker):
+    """Publica en Redis pub/sub; un hilo por proceso reparte a las suscripciones locales"""
+
+    def __init__(self, url, **kwargs):
+        import redis
+
+        super().__init__(**kwargs)
+        self._redis = redis.Redis.from_url(url)
+        self._escuchando = False
+
+    def publicar(self, evento):
+        self._redis.publish(CANAL_REDIS, json.dumps(evento, cls=DjangoJSONEncoder))
+
+    def suscribir(self, filtro, ultimo_id=None):
+        self._iniciar_escucha()
+        return super().suscribir(filtro, ultimo_id)
+
+    def _iniciar_escucha(self):
+        with self._lock:
+            if self._escuchando:
+                return
+            self._escuchando = True
+        threading.Thread(target=self._escuchar, name="eventos-redis", daemon=True).start()
+
+    def _escuchar(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CANAL_REDIS)
+                for mensaje in pubsub.listen():
+                    self.distribuir(json.loads(mensaje["data"]))
+            except Exception:
+                logger.exception("Conexión con Redis perdida; reintentando")
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def obtener_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            url = settings.EVENTOS_REDIS_URL
+            if url:
+                try:
+                    _broker = BrokerRedis(url)
+                except ImportError:
+                    logger.warning("Paquete redis no instalado; se usa el broker en proceso")
+            if _broker is None:
+                _broker = Broker()
+        return _broker
+
+
+def _publicar(tipo, datos, roles, administrativos):
+    broker = obtener_broker()
+    evento = {
+        "id": broker.nuevo_id(),
+        "tipo": tipo,
+        "datos": datos,
+        "audiencia": {"roles": list(roles or []), "administrativos": administrativos},
+    }
+    try:
+        broker.publicar(evento)
+    except Exception:
+        # Un fallo del canal en tiempo real no debe afectar a la operación
+        logger.exception("No se pudo publicar el evento %s", tipo)
+
+
+def publicar(tipo, datos, roles=None, administrativos=False):
+    """
+    Publica un evento para los usuarios de ``roles`` (ids) y, si
+    ``administrativos``, para el personal administrativo. Se emite al
+    confirmar la transacción actual (o de inmediato fuera de una).
+    """
+    transaction.on_commit(partial(_publicar, tipo, datos, roles, administrativos))
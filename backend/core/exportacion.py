@@ -0,0 +1,138 @@
+"""
+Exportación en flujo (streaming) de listados grandes.
+
+Las filas se leen con un cursor del lado del servidor
+(``values_list(...).iterator(chunk_size=...)``) y se escriben por lotes en un
+``StreamingHttpResponse``, por lo que la memoria usada no depende del número
+de filas exportadas.
+
+Bajo ASGI (uvicorn) Django consume un iterador síncrono con
+``sync_to_async(list)``, es decir, arma la exportación entera en memoria antes
+de enviar el primer byte. Por eso en ese caso la respuesta recibe un
+generador asíncrono que pide cada lote con ``sync_to_async``; bajo WSGI se
+mantiene el generador síncrono.
+
+Parámetros de la petición:
+- ``formato``: ``csv`` (por defecto) o ``ndjson``. No se usa ``format`` porque
+  DRF lo reserva para elegir el renderer.
+- ``gzip``: ``true`` para comprimir la salida.
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+FORMATOS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+TAMANO_LOTE = 2000
+VALORES_VERDADEROS = ("true", "1", "si", "sí")
+
+
+def _lineas_csv(encabezados, filas):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(encabezados)
+    yield buffer.getvalue()
+    for lote in filas:
+        buffer.seek(0)
+        buffer.truncate()
+        escritor.writerows(lote)
+        yield buffer.getvalue()
+
+
+def _lineas_ndjson(encabezados, filas):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for lote in filas:
+        yield "".join(
+            encoder.encode(dict(zip(encabezados, fila))) + "\n" for fila in lote
+        )
+
+
+def _por_lotes(iterable, tamano):
+    lote = []
+    for fila in iterable:
+        lote.append(fila)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _comprimir(partes):
+    # wbits=31 produce un flujo con cabecera gzip
+    compresor = zlib.compressobj(wbits=31)
+    for parte in partes:
+        datos = compresor.compress(parte)
+        if datos:
+            yield datos
+    yield compresor.flush()
+
+
+async def _en_async(partes):
+    """
+    Recorre el generador síncrono desde un generador asíncrono: cada parte (un
+    lote ya formateado) se produce con sync_to_async, en el hilo de la
+    petición, que es el dueño del cursor del lado del servidor.
+    """
+    siguiente = sync_to_async(next)
+    try:
+        while True:
+            parte = await siguiente(partes, None)
+            if parte is None:
+                return
+            yield parte
+    finally:
+        # Cierra el cursor si el cliente se desconecta a mitad de la descarga
+        await sync_to_async(partes.close)()
+
+
+def exportar_queryset(request, queryset, columnas, nombre, tamano_lote=None):
+    """
+    Genera la respuesta de exportación del queryset.
+
+    ``columnas`` es una lista de tuplas (encabezado, ruta_de_campo), por
+    ejemplo ``[("usuario", "usuario__username")]``. Las rutas se resuelven con
+    ``values_list``, sin instanciar modelos.
+    """
+    formato = request.query_params.get("formato", "csv").strip().lower()
+    if formato not in FORMATOS:
+        return Response(
+            {"error": f"Formato no soportado. Use: {', '.join(FORMATOS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    comprimir = request.query_params.get("gzip", "").strip().lower() in VALORES_VERDADEROS
+    tamano_lote = tamano_lote or TAMANO_LOTE
+
+    encabezados = [encabezado for encabezado, _ in columnas]
+    campos = [campo for _, campo in columnas]
+    filas = _por_lotes(
+        queryset.values_list(*campos).iterator(chunk_size=tamano_lote), tamano_lote
+    )
+
+    generar = _lineas_csv if formato == "csv" else _lineas_ndjson
+    partes = (texto.encode("utf-8") for texto in generar(encabezados, filas))
+
+    tipo_contenido, extension = FORMATOS[formato]
+    archivo = f"{nombre}_{timezone.now():%Y%m%d_%H%M%S}.{extension}"
+    if comprimir:
+        partes = _comprimir(partes)
+        tipo_contenido = "application/gzip"
+        archivo += ".gz"
+
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        partes = _en_async(partes)
+    respuesta = StreamingHttpResponse(partes, content_type=tipo_contenido)
+    respuesta["Content-Disposition"] = f'attachment; filename="{archivo}"'
+    return respuesta
@@ -0,0 +1,285 @@
+"""
+Importación masiva (alta o actualización) desde CSV o XLSX.
+
+Contraparte de core.exportacion para cargar un condominio nuevo sin hacer
+un POST por fila:
+
+- El archivo se lee en flujo (CSV con ``csv.reader``, XLSX con openpyxl en
+  modo ``read_only``) y se procesa por lotes de ``TAMANO_LOTE`` filas.
+- Cada celda se valida con el campo del modelo (``field.clean``: tipo,
+  opciones, longitud y validadores), sin consultas por fila.
+- La unicidad se valida con conjuntos: las claves y los valores únicos
+  existentes se leen una sola vez al inicio y las filas del archivo se
+  comparan contra ellos y contra las filas anteriores.
+- Las filas válidas se escriben con ``bulk_create(update_conflicts=True)``
+  (un INSERT ... ON CONFLICT por lote) usando la columna ``clave`` para
+  decidir si se crea o se actualiza. Solo se actualizan las columnas
+  presentes en el archivo.
+- Las filas con errores se omiten y se informan con su número de fila.
+
+Parámetros de la petición (multipart):
+- ``archivo``: archivo ``.csv`` (UTF-8, separado por coma o punto y coma)
+  o ``.xlsx`` (primera hoja). La primera fila son los nombres de columna;
+  las fechas en formato AAAA-MM-DD y los booleanos como true/false o sí/no.
+- ``validar``: ``true`` para solo validar, sin escribir.
+"""
+
+import codecs
+import csv
+import itertools
+import os
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from bitacora.utils import registrar_bitacora
+
+from .dashboard import invalidar_modelo
+from .exportacion import VALORES_VERDADEROS, _por_lotes
+
+TAMANO_LOTE = 1000
+MAX_ERRORES = 500
+EXTENSIONES = (".csv", ".xlsx")
+VALORES_FALSOS = ("false", "0", "no")
+
+
+class ArchivoInvalido(Exception):
+    """El archivo no se puede leer o no tiene las columnas necesarias"""
+
+
+def _filas_csv(archivo):
+    texto = codecs.getreader("utf-8-sig")(archivo, errors="replace")
+    primera = texto.readline()
+    # Excel en español exporta CSV separado por punto y coma
+    separador = ";" if primera.count(";") > primera.count(",") else ","
+    return csv.reader(itertools.chain([primera], texto), delimiter=separador)
+
+
+def _filas_xlsx(archivo):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ArchivoInvalido("La importación de XLSX requiere openpyxl instalado")
+    try:
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except Exception:
+        raise ArchivoInvalido("El archivo XLSX no es válido")
+    return _celdas_xlsx(libro)
+
+
+def _celdas_xlsx(libro):
+    try:
+        for fila in libro.worksheets[0].iter_rows(values_only=True):
+            yield list(fila)
+    finally:
+        libro.close()
+
+
+def leer_filas(archivo):
+    """
+    Retorna (encabezados, filas) del archivo subido. ``filas`` es un
+    iterador de (numero_fila, [celdas]); se omiten las filas vacías.
+    """
+    extension = os.path.splitext(archivo.name or "")[1].lower()
+    if extension not in EXTENSIONES:
+        raise ArchivoInvalido(f"Formato no soportado. Use: {', '.join(EXTENSIONES)}")
+    filas = _filas_xlsx(archivo) if extension == ".xlsx" else _filas_csv(archivo)
+
+    encabezados = next(filas, None)
+    if not encabezados:
+        raise ArchivoInvalido("El archivo está vacío")
+    encabezados = [str(celda or "").strip().lower() for celda in encabezados]
+    numeradas = (
+        (numero, fila)
+        for numero, fila in enumerate(filas, start=2)
+        if any(celda not in (None, "") for celda in fila)
+    )
+    return encabezados, numeradas
+
+
+def _valor_celda(celda, campo):
+    if isinstance(celda, str):
+        celda = celda.strip()
+        if campo.get_internal_type() == "BooleanField" and celda.lower() in VALORES_VERDADEROS + VALORES_FALSOS:
+            return celda.lower() in VALORES_VERDADEROS
+        return celda
+    # Las celdas numéricas de Excel llegan como float (12345678.0)
+    if isinstance(celda, float) and celda.is_integer():
+        return int(celda)
+    return celda
+
+
+class Importador:
+    """
+    Valida y escribe filas de ``modelo`` identificadas por el campo único
+    ``clave``. ``campos`` son los campos que se aceptan como columnas y
+    ``obligatorias`` los que deben venir en el archivo (además de la clave).
+    """
+
+    def __init__(self, modelo, clave, campos, obligatorias=()):
+        self.modelo = modelo
+        self.clave = clave
+        self.campos = {nombre: modelo._meta.get_field(nombre) for nombre in campos}
+        self.obligatorias = {clave, *obligatorias}
+        self.unicos = [
+            nombre for nombre, campo in self.campos.items()
+            if campo.unique and nombre != clave
+        ]
+        # auto_now no se aplica en el UPDATE del ON CONFLICT si no se incluye
+        self.auto_now = [
+            campo.name for campo in modelo._meta.concrete_fields
+            if getattr(campo, "auto_now", False)
+        ]
+
+    def _validar_encabezados(self, encabezados):
+        faltantes = sorted(self.obligatorias - set(encabezados))
+        if faltantes:
+            raise ArchivoInvalido(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+        repetidas = sorted({nombre for nombre in encabezados if encabezados.count(nombre) > 1})
+        if repetidas:
+            raise ArchivoInvalido(f"Columnas repetidas: {', '.join(repetidas)}")
+        # Columnas desconocidas se ignoran (p. ej. "id" de una exportación)
+        return [(indice, nombre) for indice, nombre in enumerate(encabezados) if nombre in self.campos]
+
+    def _limpiar(self, columnas, fila):
+        """Retorna ({campo: valor}, {campo: [errores]}) de una fila"""
+        valores = {}
+        errores = {}
+        for indice, nombre in columnas:
+            campo = self.campos[nombre]
+            valor = _valor_celda(fila[indice], campo) if indice < len(fila) else None
+            if valor in ("", None):
+                if campo.has_default():
+                    valor = campo.get_default()
+                else:
+                    valor = None if campo.null or not campo.empty_strings_allowed else ""
+            try:
+                valores[nombre] = campo.clean(valor, None)
+            except ValidationError as error:
+                errores[nombre] = error.messages
+        return valores, errores
+
+    def _existentes(self):
+        """Claves y valores únicos ya guardados: ({clave}, {campo: {valor: clave}})"""
+        claves = set()
+        unicos = {nombre: {} for nombre in self.unicos}
+        filas = self.modelo.objects.values_list(self.clave, *self.unicos).iterator(chunk_size=5000)
+        for clave, *valores in filas:
+            claves.add(clave)
+            for nombre, valor in zip(self.unicos, valores):
+                if valor not in ("", None):
+                    unicos[nombre][valor] = clave
+        return claves, unicos
+
+    def importar(self, encabezados, filas, validar=False, tamano_lote=TAMANO_LOTE):
+        """
+        Procesa las filas y retorna el resumen de la importación. Si
+        ``validar`` es verdadero no escribe nada.
+        """
+        columnas = self._validar_encabezados(encabezados)
+        actualizar = [
+            nombre for _, nombre in columnas if nombre != self.clave
+        ] + [nombre for nombre in self.auto_now if nombre not in self.campos]
+
+        claves_existentes, unicos_existentes = self._existentes()
+        # Valores vistos en el archivo: {valor: (clave, numero_fila)}
+        vistos = {nombre: {} for nombre in [self.clave, *self.unicos]}
+        resumen = {"filas": 0, "creadas": 0, "actualizadas": 0, "con_errores": 0}
+        errores = []
+
+        def reportar(numero, errores_fila):
+            resumen["con_errores"] += 1
+            if len(errores) < MAX_ERRORES:
+                errores.append({"fila": numero, "errores": errores_fila})
+
+        with transaction.atomic():
+            for lote in _por_lotes(filas, tamano_lote):
+                objetos = []
+                for numero, fila in lote:
+                    resumen["filas"] += 1
+                    valores, errores_fila = self._limpiar(columnas, fila)
+                    clave = valores.get(self.clave)
+
+                    if clave not in (None, "") and self.clave not in errores_fila:
+                        for nombre in vistos:
+                            valor = valores.get(nombre)
+                            if nombre in errores_fila or valor in ("", None):
+                                continue
+                            previo = vistos[nombre].get(valor)
+                            if previo and (nombre == self.clave or previo[0] != clave):
+                                errores_fila[nombre] = [
+                                    f"Valor repetido en el archivo (fila {previo[1]})."
+                                ]
+                            elif unicos_existentes.get(nombre, {}).get(valor, clave) != clave:
+                                errores_fila[nombre] = [
+                                    f"Ya existe otro registro con {nombre} '{valor}'."
+                                ]
+
+                    if errores_fila:
+                        reportar(numero, errores_fila)
+                        continue
+
+                    for nombre in vistos:
+                        if valores.get(nombre) not in ("", None):
+                            vistos[nombre][valores[nombre]] = (clave, numero)
+                    if clave in claves_existentes:
+                        resumen["actualizadas"] += 1
+                    else:
+                        resumen["creadas"] += 1
+                    objetos.append(self.modelo(**valores))
+
+                if objetos and not validar:
+                    self.modelo.objects.bulk_create(
+                        objetos,
+                        update_conflicts=bool(actualizar),
+                        ignore_conflicts=not actualizar,
+                        unique_fields=[self.clave] if actualizar else None,
+                        update_fields=actualizar or None,
+                    )
+
+            if not validar and resumen["creadas"] + resumen["actualizadas"]:
+                # bulk_create no emite post_save
+                invalidar_modelo(self.modelo)
+
+        return {**resumen, "validacion": validar, "errores": errores}
+
+
+def importar_archivo(request, importador, nombre, modulo):
+    """
+    Genera la respuesta de importación del archivo de la petición y registra
+    el resumen en la bitácora (salvo en modo ``validar``).
+    """
+    archivo = request.FILES.get("archivo")
+    if archivo is None:
+        return Response(
+            {"error": "Debe enviar el archivo en el campo 'archivo'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    validar = str(request.data.get("validar", "")).strip().lower() in VALORES_VERDADEROS
+
+    try:
+        encabezados, filas = leer_filas(archivo)
+        resumen = importador.importar(encabezados, filas, validar=validar)
+    except ArchivoInvalido as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    except IntegrityError:
+        # Otro proceso guardó un valor único mientras se importaba
+        return Response(
+            {"error": f"Conflicto al importar {nombre}; vuelva a intentarlo"},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    if not validar:
+        registrar_bitacora(
+            request=request,
+            usuario=request.user,
+            accion="Importar",
+            descripcion=(
+                f"Importación de {nombre} ({archivo.name}): {resumen['creadas']} creados, "
+                f"{resumen['actualizadas']} actualizados, {resumen['con_errores']} con errores"
+            ),
+            modulo=modulo,
+        )
+    return Response(resumen)
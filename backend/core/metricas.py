@@ -0,0 +1,381 @@
+"""
+Métricas de la aplicación en formato Prometheus (``GET /metrics``).
+
+Contadores e histogramas de bajo costo: cada observación incrementa unos
+pocos valores en memoria, sin consultas ni red. Para sumar correctamente
+los procesos de un servidor con varios workers se define ``METRICAS_DIR``:
+cada proceso escribe sus valores en su propio archivo mapeado en memoria
+(``mmap``) dentro de ese directorio y ``/metrics`` suma todos los archivos.
+Sin ``METRICAS_DIR`` los valores quedan en la memoria del proceso.
+
+El directorio debe vaciarse al iniciar el servidor (no al reiniciar un
+worker): los archivos de procesos terminados se siguen sumando para que
+los contadores no retrocedan.
+
+Este módulo no importa modelos ni apps, así que puede usarse desde
+cualquier parte (bitácora, servicios de seguridad, middleware) sin ciclos.
+"""
+
+import bisect
+import functools
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+
+PREFIJO = "condominio_"
+
+# Límites (segundos) de los histogramas de latencia
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_CABECERA = 8
+_TAMANO_INICIAL = 1 << 16
+
+
+def _entradas(datos, usado):
+    """Recorre (clave, valor, posición del valor) de un archivo de métricas"""
+    posicion = _CABECERA
+    while posicion < usado:
+        largo = struct.unpack_from("i", datos, posicion)[0]
+        clave = bytes(datos[posicion + 4:posicion + 4 + largo]).decode("utf-8")
+        posicion += 4 + largo
+        posicion += 8 - posicion % 8 if posicion % 8 else 0
+        yield clave, struct.unpack_from("d", datos, posicion)[0], posicion
+        posicion += 8
+
+
+class _AlmacenMemoria:
+    def __init__(self):
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, clave, valor):
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0.0) + valor
+
+    def valores(self):
+        with self._lock:
+            return dict(self._valores)
+
+
+class _AlmacenMmap:
+    """
+    Valores de un proceso en un archivo mapeado en memoria. Formato: cabecera
+    con los bytes usados y entradas [largo][clave utf-8][relleno][double],
+    con el double alineado a 8 bytes. Solo este proceso escribe el archivo.
+    """
+
+    def __init__(self, ruta):
+        self._lock = threading.Lock()
+        self._archivo = open(ruta, "a+b")
+        if os.fstat(self._archivo.fileno()).st_size < _TAMANO_INICIAL:
+            self._archivo.truncate(_TAMANO_INICIAL)
+        self._mapear(os.fstat(self._archivo.fileno()).st_size)
+        self._usado = struct.unpack_from("i", self._mmap, 0)[0] or _CABECERA
+        self._posiciones = {
+            clave: posicion for clave, _, posicion in _entradas(self._mmap, self._usado)
+        }
+
+    def _mapear(self, capacidad):
+        self._capacidad = capacidad
+        self._mmap = mmap.mmap(self._archivo.fileno(), capacidad)
+
+    def _agregar(self, clave):
+        codificada = clave.encode("utf-8")
+        inicio_valor = self._usado + 4 + len(codificada)
+        inicio_valor += 8 - inicio_valor % 8 if inicio_valor % 8 else 0
+        fin = inicio_valor + 8
+        if fin > self._capacidad:
+            capacidad = self._capacidad
+            while fin > capacidad:
+                capacidad *= 2
+            self._mmap.close()
+            self._archivo.truncate(capacidad)
+            self._mapear(capacidad)
+        struct.pack_into("i", self._mmap, self._usado, len(codificada))
+        self._mmap[self._usado + 4:self._usado + 4 + len(codificada)] = codificada
+        struct.pack_into("d", self._mmap, inicio_valor, 0.0)
+        # La cabecera se actualiza al final: un lector nunca ve entradas a medias
+        self._usado = fin
+        struct.pack_into("i", self._mmap, 0, self._usado)
+        self._posiciones[clave] = inicio_valor
+        return inicio_valor
+
+    def incrementar(self, clave, valor):
+        with self._lock:
+            posicion = self._posiciones.get(clave)
+            if posicion is None:
+                posicion = self._agregar(clave)
+            actual = struct.unpack_from("d", self._mmap, posicion)[0]
+            struct.pack_into("d", self._mmap, posicion, actual + valor)
+
+    def valores(self):
+        with self._lock:
+            return {clave: valor for clave, valor, _ in _entradas(self._mmap, self._usado)}
+
+
+_almacen = None
+_almacen_pid = None
+_almacen_lock = threading.Lock()
+
+
+def _directorio():
+    return getattr(settings, "METRICAS_DIR", "")
+
+
+def _obtener_almacen():
+    global _almacen, _almacen_pid
+    pid = os.getpid()
+    if _almacen_pid != pid:
+        # Tras un fork cada worker necesita su propio archivo
+        with _almacen_lock:
+            if _almacen_pid != pid:
+                directorio = _directorio()
+                if directorio:
+                    os.makedirs(directorio, exist_ok=True)
+                    _almacen = _AlmacenMmap(os.path.join(directorio, f"metricas_{pid}.db"))
+                else:
+                    _almacen = _AlmacenMemoria()
+                _almacen_pid = pid
+    return _almacen
+
+
+def _leer_archivo(ruta):
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    if len(datos) < _CABECERA:
+        return {}
+    usado = min(struct.unpack_from("i", datos, 0)[0], len(datos))
+    return {clave: valor for clave, valor, _ in _entradas(datos, usado)}
+
+
+def recolectar():
+    """Suma de los valores de todos los procesos: {clave: valor}"""
+    directorio = _directorio()
+    if not directorio:
+        return _obtener_almacen().valores()
+    totales = {}
+    for ruta in glob.glob(os.path.join(directorio, "metricas_*.db")):
+        for clave, valor in _leer_archivo(ruta).items():
+            totales[clave] = totales.get(clave, 0.0) + valor
+    return totales
+
+
+# ---------------------------------------------------------------------------
+# Tipos de métricas
+# ---------------------------------------------------------------------------
+
+_registro = {}
+
+
+def _clave(nombre, sufijo, etiquetas):
+    return json.dumps([nombre, sufijo, etiquetas], ensure_ascii=False, separators=(",", ":"))
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = PREFIJO + nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        _registro[self.nombre] = self
+
+    def _valores_etiquetas(self, etiquetas):
+        return [str(etiquetas.get(nombre, "")) for nombre in self.etiquetas]
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor=1, **etiquetas):
+        _obtener_almacen().incrementar(
+            _clave(self.nombre, "total", self._valores_etiquetas(etiquetas)), valor
+        )
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), limites=LIMITES_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.limites = tuple(limites)
+
+    def observar(self, valor, **etiquetas):
+        valores = self._valores_etiquetas(etiquetas)
+        almacen = _obtener_almacen()
+        # Cuenta por intervalo (no acumulada): se acumula al exponer
+        indice = bisect.bisect_left(self.limites, valor)
+        almacen.incrementar(_clave(self.nombre, f"bucket:{indice}", valores), 1)
+        almacen.incrementar(_clave(self.nombre, "sum", valores), valor)
+        almacen.incrementar(_clave(self.nombre, "count", valores), 1)
+
+
+# ---------------------------------------------------------------------------
+# Métricas de la aplicación
+# ---------------------------------------------------------------------------
+
+PETICIONES = Histograma(
+    "http_request_duration_seconds",
+    "Duración de las peticiones HTTP por vista, método y estado",
+    ("vista", "metodo", "estado"),
+)
+TIEMPO_DB = Histograma(
+    "db_time_seconds",
+    "Tiempo total en la base de datos por petición",
+    ("vista", "metodo"),
+)
+CONSULTAS_DB = Contador(
+    "db_queries_total",
+    "Consultas SQL ejecutadas",
+    ("vista", "metodo"),
+)
+LLAMADAS_EXTERNAS = Histograma(
+    "external_call_duration_seconds",
+    "Duración de las llamadas a servicios externos",
+    ("proveedor", "operacion", "resultado"),
+)
+REGISTROS_BITACORA = Contador(
+    "bitacora_registros_total",
+    "Registros escritos en la bitácora",
+    ("modulo",),
+)
+
+
+def medir_externo(proveedor, operacion=None):
+    """
+    Decorador que mide la duración de una llamada a un servicio externo.
+    Una excepción o un dict con ``exito`` falso (convención de los
+    servicios de seguridad) cuentan como resultado ``error``.
+    """
+
+    def decorador(funcion):
+        nombre_operacion = operacion or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter()
+            resultado = "error"
+            try:
+                respuesta = funcion(*args, **kwargs)
+                if not (isinstance(respuesta, dict) and respuesta.get("exito") is False):
+                    resultado = "ok"
+                return respuesta
+            finally:
+                LLAMADAS_EXTERNAS.observar(
+                    time.perf_counter() - inicio,
+                    proveedor=proveedor, operacion=nombre_operacion, resultado=resultado,
+                )
+
+        return envoltura
+
+    return decorador
+
+
+# ---------------------------------------------------------------------------
+# Formato de exposición de Prometheus
+# ---------------------------------------------------------------------------
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatear_etiquetas(nombres, valores, extra=()):
+    pares = list(zip(nombres, valores)) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + "}"
+
+
+def _numero(valor):
+    return repr(int(valor)) if float(valor).is_integer() else repr(valor)
+
+
+def exponer():
+    """Texto de todas las métricas en formato de exposición de Prometheus 0.0.4"""
+    series = {}
+    for clave, valor in recolectar().items():
+        nombre, sufijo, etiquetas = json.loads(clave)
+        series.setdefault(nombre, {}).setdefault(tuple(etiquetas), {})[sufijo] = valor
+
+    lineas = []
+    for nombre, metrica in sorted(_registro.items()):
+        lineas.append(f"# HELP {nombre} {metrica.ayuda}")
+        lineas.append(f"# TYPE {nombre} {metrica.tipo}")
+        for etiquetas, valores in sorted(series.get(nombre, {}).items()):
+            if metrica.tipo == "counter":
+                # Los contadores se registran ya con el sufijo _total
+                texto = _formatear_etiquetas(metrica.etiquetas, etiquetas)
+                lineas.append(f"{nombre}{texto} {_numero(valores.get('total', 0))}")
+                continue
+            acumulado = 0
+            for indice, limite in enumerate(metrica.limites + (float("inf"),)):
+                acumulado += valores.get(f"bucket:{indice}", 0)
+                le = "+Inf" if limite == float("inf") else repr(float(limite))
+                texto = _formatear_etiquetas(metrica.etiquetas, etiquetas, [("le", le)])
+                lineas.append(f"{nombre}_bucket{texto} {_numero(acumulado)}")
+            texto = _formatear_etiquetas(metrica.etiquetas, etiquetas)
+            lineas.append(f"{nombre}_sum{texto} {_numero(valores.get('sum', 0))}")
+            lineas.append(f"{nombre}_count{texto} {_numero(valores.get('count', 0))}")
+    return "\n".join(lineas) + "\n"
+
+
+def vista_metricas(request):
+    """``GET /metrics``; con ``METRICAS_TOKEN`` exige ``Authorization: Bearer <token>``"""
+    token = getattr(settings, "METRICAS_TOKEN", "")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(exponer(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class _TiempoDB:
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+class MetricasMiddleware:
+    """Latencia, tiempo de base de datos y consultas por vista y método"""
+
+    def __init__(self, get_response):
+        if not settings.METRICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tiempo_db = _TiempoDB()
+        inicio = time.perf_counter()
+        with connections["default"].execute_wrapper(tiempo_db):
+            response = self.get_response(request)
+        duracion = time.perf_counter() - inicio
+
+        coincidencia = getattr(request, "resolver_match", None)
+        # Nombre de la ruta resuelta (no el path) para acotar las series
+        vista = coincidencia.view_name if coincidencia and coincidencia.view_name else "sin_ruta"
+        if vista == "metricas":
+            return response
+        PETICIONES.observar(duracion, vista=vista, metodo=request.method, estado=response.status_code)
+        TIEMPO_DB.observar(tiempo_db.segundos, vista=vista, metodo=request.method)
+        if tiempo_db.consultas:
+            CONSULTAS_DB.inc(tiempo_db.consultas, vista=vista, metodo=request.method)
+        return response
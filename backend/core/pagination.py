@@ -0,0 +1,95 @@
+"""
+Clases de paginación compartidas por las APIs.
+
+- ``ConteoOpcionalPagination``: paginación por número de página (la usada por
+  defecto) que permite omitir el ``COUNT(*)`` con ``?count=false``. Como la
+  anterior, usa siempre PAGE_SIZE: no acepta ``?page_size``.
+- ``FechaCursorPagination``: paginación por cursor sobre (fecha_hora, id) para
+  los listados que solo crecen en el tiempo (bitácora, registros de acceso,
+  alertas). No usa OFFSET ni cuenta el total, por lo que el costo de cada
+  página no depende de su profundidad. Acepta ``?page_size`` hasta 100.
+"""
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+VALORES_FALSOS = ("false", "0", "no")
+
+
+class ConteoOpcionalPagination(PageNumberPagination):
+    """
+    Igual a PageNumberPagination, pero con ``?count=false`` no calcula el total:
+    trae una fila adicional para saber si existe página siguiente y la
+    respuesta omite ``count``.
+    """
+
+    count_query_param = "count"
+
+    def omitir_conteo(self, request):
+        valor = request.query_params.get(self.count_query_param, "")
+        return valor.strip().lower() in VALORES_FALSOS
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.sin_conteo = self.omitir_conteo(request)
+        if not self.sin_conteo:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        try:
+            self.numero_pagina = int(request.query_params.get(self.page_query_param, 1))
+            if self.numero_pagina < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound("Página inválida.")
+
+        inicio = (self.numero_pagina - 1) * page_size
+        filas = list(queryset[inicio:inicio + page_size + 1])
+        self.hay_siguiente = len(filas) > page_size
+        filas = filas[:page_size]
+        if not filas and self.numero_pagina > 1:
+            raise NotFound("Página inválida.")
+        return filas
+
+    def get_paginated_response(self, data):
+        if not self.sin_conteo:
+            return super().get_paginated_response(data)
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        if not self.sin_conteo:
+            return super().get_next_link()
+        if not self.hay_siguiente:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.numero_pagina + 1)
+
+    def get_previous_link(self):
+        if not self.sin_conteo:
+            return super().get_previous_link()
+        if self.numero_pagina <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.numero_pagina == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.numero_pagina - 1)
+
+
+class FechaCursorPagination(CursorPagination):
+    """
+    Paginación por cursor ordenada por fecha_hora descendente con id como
+    desempate. Requiere un índice compuesto (fecha_hora, id) en el modelo.
+    """
+
+    ordering = ("-fecha_hora", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
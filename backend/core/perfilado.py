@@ -0,0 +1,139 @@
+"""
+Perfilado de consultas SQL por request y detección de N+1.
+
+PerfiladoSQLMiddleware se activa con ``PERFILADO_SQL=1`` (si no, Django lo
+descarta al arrancar y no tiene costo). En cada request muestreado
+(``PERFILADO_SQL_MUESTREO``) registra con ``connection.execute_wrapper``,
+sin depender de DEBUG:
+
+- cantidad de consultas y tiempo total en la base de datos;
+- huellas de las consultas (SQL normalizado sin literales ni listas IN),
+  para detectar la misma consulta repetida: si una huella aparece
+  ``PERFILADO_SQL_UMBRAL_N1`` veces o más se reporta como sospecha de N+1.
+
+La respuesta lleva la cabecera ``Server-Timing`` (visible en las
+herramientas del navegador) y se escribe una línea JSON en el logger
+``core.perfilado``: WARNING si el request superó ``PERFILADO_SQL_LENTO_MS``
+o tiene sospechas de N+1, DEBUG en otro caso.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MAX_SOSPECHAS = 5
+MAX_SQL_LOG = 300
+
+_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_CADENA = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql):
+    """SQL sin literales, con las listas IN colapsadas y espacios uniformes"""
+    sql = _CADENA.sub("?", sql).replace("%s", "?")
+    sql = _NUMERO.sub("?", sql)
+    sql = _LISTA_IN.sub("IN (...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def huella_sql(sql):
+    return hashlib.sha1(normalizar_sql(sql).encode()).hexdigest()[:12]
+
+
+class PerfilSQL:
+    """
+    Registra las consultas ejecutadas dentro del bloque ``with`` en todas
+    las conexiones configuradas.
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+        self.huellas = Counter()
+        self.ejemplos = {}
+        self._pila = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.consultas += 1
+            huella = huella_sql(sql)
+            self.huellas[huella] += 1
+            self.ejemplos.setdefault(huella, sql)
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        for conexion in connections.all():
+            self._pila.enter_context(conexion.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._pila.close()
+        return False
+
+    def sospechas_n1(self, umbral):
+        """[(huella, repeticiones, sql normalizado)] de las consultas repetidas"""
+        return [
+            (huella, repeticiones, normalizar_sql(self.ejemplos[huella])[:MAX_SQL_LOG])
+            for huella, repeticiones in self.huellas.most_common(MAX_SOSPECHAS)
+            if repeticiones >= umbral
+        ]
+
+
+class PerfiladoSQLMiddleware:
+    def __init__(self, get_response):
+        if not settings.PERFILADO_SQL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.muestreo = settings.PERFILADO_SQL_MUESTREO
+        self.lento_ms = settings.PERFILADO_SQL_LENTO_MS
+        self.umbral_n1 = settings.PERFILADO_SQL_UMBRAL_N1
+
+    def __call__(self, request):
+        if random.random() >= self.muestreo:
+            return self.get_response(request)
+
+        inicio = time.perf_counter()
+        with PerfilSQL() as perfil:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - inicio) * 1000
+        db_ms = perfil.segundos * 1000
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{perfil.consultas} consultas", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+        sospechas = perfil.sospechas_n1(self.umbral_n1)
+        nivel = logging.WARNING if sospechas or total_ms >= self.lento_ms else logging.DEBUG
+        if logger.isEnabledFor(nivel):
+            logger.log(nivel, "perfilado_sql %s", json.dumps({
+                "metodo": request.method,
+                "ruta": request.path,
+                "estado": response.status_code,
+                "total_ms": round(total_ms, 1),
+                "db_ms": round(db_ms, 1),
+                "consultas": perfil.consultas,
+                "consultas_unicas": len(perfil.huellas),
+                "n1_sospechas": [
+                    {"huella": huella, "repeticiones": repeticiones, "sql": sql}
+                    for huella, repeticiones, sql in sospechas
+                ],
+            }, ensure_ascii=False))
+        return response
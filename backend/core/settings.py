@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from datetime import timedelta
 # from dotenv import load_dotenv
 
@@ -161,6 +162,8 @@ SITE_ID = 1  # importante para allauth
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "core.metricas.MetricasMiddleware",  # Métricas Prometheus (/metrics)
+    "core.perfilado.PerfiladoSQLMiddleware",  # Solo con PERFILADO_SQL=1
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -293,6 +296,8 @@ LOGIN_ON_EMAIL_CONFIRMATION = True
 ACCOUNT_EMAIL_VERIFICATION_METHOD = (
     "link"  # Opciones: "link" (clásico) o "code" (moderno)
 )
+# Los correos de allauth pasan por la bandeja de salida (notificaciones.correos)
+ACCOUNT_ADAPTER = "users.adapters.CuentaAdapter"
 
 
 # En desarrollo, manda emails a la consola
@@ -302,6 +307,8 @@ EMAIL_HOST = (
 )
 EMAIL_PORT = 1025
 DEFAULT_FROM_EMAIL = "no-reply@localhost"
+# Un servidor SMTP que no responde no debe bloquear al trabajador de correos
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
 
 # ====== DRF + JWT ======
 REST_FRAMEWORK = {
@@ -313,7 +320,7 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     # --- NUEVO ---
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.ConteoOpcionalPagination",
     "PAGE_SIZE": 10,  # registros por página
 }
 # REST_USE_JWT = True
@@ -347,13 +354,33 @@ SOCIALACCOUNT_PROVIDERS = {
 }
 
 # ====== CACHE CONFIGURATION ======
-# Configuración para verificación móvil
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+# Caché compartida por todos los procesos en Redis (verificación móvil,
+# disponibilidad y estadísticas de reservas; ver core.cache). En pruebas o
+# sin REDIS_URL se usa una caché local del proceso.
+REDIS_URL = os.getenv("REDIS_URL", "")
+EJECUTANDO_TESTS = len(sys.argv) > 1 and sys.argv[1] == "test"
+
+if REDIS_URL and not EJECUTANDO_TESTS:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "condominio",
+            "TIMEOUT": 300,
+            "OPTIONS": {
+                # Un Redis caído no debe bloquear las peticiones
+                "socket_connect_timeout": 1,
+                "socket_timeout": 1,
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
     }
-}
 
 # ====== EMAIL BACKENDS ======
 # Backend de email personalizado para verificación móvil
@@ -388,3 +415,50 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 # Configuración de archivos estáticos
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+
+# ====== BITÁCORA ======
+# Retención de la bitácora particionada (comando bitacora_archivar)
+BITACORA_MESES_RETENCION = int(os.getenv("BITACORA_MESES_RETENCION", "12"))
+BITACORA_ARCHIVO_DIR = os.getenv(
+    "BITACORA_ARCHIVO_DIR", os.path.join(BASE_DIR, "archivos", "bitacora")
+)
+
+# ====== RESERVAS ======
+# Horario en que las áreas comunes se pueden reservar (cálculo de disponibilidad)
+RESERVAS_HORA_APERTURA = os.getenv("RESERVAS_HORA_APERTURA", "06:00")
+RESERVAS_HORA_CIERRE = os.getenv("RESERVAS_HORA_CIERRE", "23:00")
+RESERVAS_DISPONIBILIDAD_CACHE_TTL = int(
+    os.getenv("RESERVAS_DISPONIBILIDAD_CACHE_TTL", "3600")
+)
+
+# ====== NOTIFICACIONES ======
+# El despachador (comando notificaciones_despachar) también envía por correo
+NOTIFICACIONES_ENVIAR_CORREOS = os.getenv("NOTIFICACIONES_ENVIAR_CORREOS", "1") == "1"
+
+# ====== EVENTOS EN TIEMPO REAL ======
+# Canal SSE /api/eventos/ (core.sse). Con Redis los eventos llegan a todos los
+# procesos del servidor ASGI; sin Redis solo al proceso que los publica.
+EVENTOS_REDIS_URL = "" if EJECUTANDO_TESTS else os.getenv("EVENTOS_REDIS_URL", REDIS_URL)
+EVENTOS_HEARTBEAT = int(os.getenv("EVENTOS_HEARTBEAT", "15"))
+# Vigencia (segundos) del ticket de un solo uso para abrir el canal
+EVENTOS_TICKET_TTL = int(os.getenv("EVENTOS_TICKET_TTL", "30"))
+
+# ====== PERFILADO SQL ======
+# Middleware core.perfilado.PerfiladoSQLMiddleware: consultas, tiempo de base
+# de datos y sospechas de N+1 por request (cabecera Server-Timing y log).
+PERFILADO_SQL = os.getenv("PERFILADO_SQL", "0") == "1"
+# Fracción de requests perfilados (0.0 a 1.0)
+PERFILADO_SQL_MUESTREO = float(os.getenv("PERFILADO_SQL_MUESTREO", "1.0"))
+# Requests más lentos que esto (ms) se registran como WARNING
+PERFILADO_SQL_LENTO_MS = int(os.getenv("PERFILADO_SQL_LENTO_MS", "500"))
+# Repeticiones de la misma consulta a partir de las que se sospecha N+1
+PERFILADO_SQL_UMBRAL_N1 = int(os.getenv("PERFILADO_SQL_UMBRAL_N1", "5"))
+
+# ====== MÉTRICAS ======
+# Métricas en formato Prometheus en /metrics (core.metricas)
+METRICAS = os.getenv("METRICAS", "1") == "1"
+# Con varios workers: directorio compartido donde cada proceso escribe sus
+# valores (vaciarlo al iniciar el servidor). Vacío: memoria del proceso.
+METRICAS_DIR = os.getenv("METRICAS_DIR", "")
+# Si se define, /metrics exige "Authorization: Bearer <token>"
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN", "")
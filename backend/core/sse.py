@@ -0,0 +1,140 @@
+"""
+Endpoint Server-Sent Events: ``GET /api/eventos/``.
+
+Mantiene abierta la respuesta y envía los eventos (core.eventos) dirigidos
+al usuario: ``notificacion`` al enviarse una notificación a su rol y
+``alerta_seguridad`` al personal administrativo. Requiere un servidor ASGI
+(``uvicorn core.asgi:application``).
+
+- Autenticación: cabecera ``Authorization: Bearer <token>``, sesión o
+  ``?ticket=`` (EventSource no permite cabeceras). El ticket se pide con
+  ``POST /api/eventos/ticket/``, vence en ``EVENTOS_TICKET_TTL`` segundos y
+  sirve para una sola conexión: el token JWT nunca viaja en la URL, que
+  queda registrada en los logs de acceso del servidor y de los proxies. Al
+  reconectar el cliente pide un ticket nuevo.
+- Heartbeat: un comentario cada ``EVENTOS_HEARTBEAT`` segundos mantiene la
+  conexión viva a través de proxies.
+- Reconexión: el navegador reenvía ``Last-Event-ID`` y se reenvían los
+  eventos pendientes del historial. Si ya no están, se envía
+  ``resincronizar`` para que el cliente recargue sus listados.
+- Contrapresión: si el cliente no consume a tiempo se envía ``desbordado``
+  y se cierra la conexión (el cliente reconecta y recupera lo pendiente).
+"""
+
+import asyncio
+import json
+import secrets
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.contrib.auth import get_user_model
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .cache import espacio
+from .eventos import obtener_broker, visible_para
+
+REINTENTO_MS = 3000
+
+# Compartida entre procesos: el ticket se emite en un worker y se usa en otro
+TICKETS = espacio("core:eventos_tickets")
+
+
+@api_view(["POST"])
+def ticket_eventos(request):
+    """Emite un ticket de un solo uso para abrir el canal de eventos"""
+    ticket = secrets.token_urlsafe(32)
+    TICKETS.set(ticket, request.user.id, settings.EVENTOS_TICKET_TTL)
+    return Response({"ticket": ticket, "expira_en": settings.EVENTOS_TICKET_TTL})
+
+
+def _autenticar(request):
+    """Retorna (rol_id, administrativo) del usuario o None si no está autenticado"""
+    autenticacion = JWTAuthentication()
+    usuario = None
+    try:
+        resultado = autenticacion.authenticate(request)
+        if resultado:
+            usuario = resultado[0]
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+
+    if usuario is None and request.GET.get("ticket"):
+        usuario_id = TICKETS.consumir(request.GET["ticket"])
+        if usuario_id is None:
+            return None
+        usuario = get_user_model().objects.filter(id=usuario_id).select_related("rol").first()
+        if usuario is None:
+            return None
+
+    usuario = usuario or request.user
+    if not usuario.is_authenticated or not usuario.is_active:
+        return None
+    return usuario.rol_id, bool(usuario.is_staff and usuario.es_administrativo)
+
+
+def _formatear(evento):
+    datos = json.dumps(evento["datos"], cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {datos}\n\n"
+
+
+def _ultimo_id(request):
+    valor = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        return int(valor) if valor else None
+    except ValueError:
+        return None
+
+
+async def _flujo(broker, suscripcion, pendientes, incompleto):
+    try:
+        yield f"retry: {REINTENTO_MS}\n\n"
+        if incompleto:
+            yield "event: resincronizar\ndata: {}\n\n"
+        for evento in pendientes:
+            yield _formatear(evento)
+        while True:
+            try:
+                evento = await asyncio.wait_for(
+                    suscripcion.cola.get(), timeout=settings.EVENTOS_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if suscripcion.desbordada:
+                yield "event: desbordado\ndata: {}\n\n"
+                return
+            yield _formatear(evento)
+    finally:
+        broker.cancelar(suscripcion)
+
+
+async def eventos(request):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "El canal de eventos requiere un servidor ASGI"}, status=501
+        )
+
+    usuario = await sync_to_async(_autenticar)(request)
+    if usuario is None:
+        return JsonResponse({"error": "No autenticado"}, status=401)
+
+    broker = obtener_broker()
+    filtro = partial(visible_para, rol_id=usuario[0], administrativo=usuario[1])
+    suscripcion, pendientes, incompleto = broker.suscribir(filtro, _ultimo_id(request))
+
+    respuesta = StreamingHttpResponse(
+        _flujo(broker, suscripcion, pendientes, incompleto),
+        content_type="text/event-stream",
+    )
+    respuesta["Cache-Control"] = "no-cache"
+    # Evita que nginx acumule la respuesta en buffer
+    respuesta["X-Accel-Buffering"] = "no"
+    return respuesta
@@ -0,0 +1,378 @@
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from users.models import Rol
+
+from .perfilado import PerfiladoSQLMiddleware, huella_sql, normalizar_sql
+
+
+class PerfiladoSQLTest(TestCase):
+    def test_normaliza_literales_y_listas_in(self):
+        self.assertEqual(
+            normalizar_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND x = 5 AND y = 'a''b'"),
+            "SELECT * FROM t WHERE id IN (...) AND x = ? AND y = ?",
+        )
+        self.assertEqual(
+            huella_sql("SELECT * FROM t WHERE id IN (%s)"),
+            huella_sql("SELECT  *  FROM t WHERE id IN (%s, %s)"),
+        )
+
+    @override_settings(PERFILADO_SQL=False)
+    def test_desactivado_por_defecto(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            PerfiladoSQLMiddleware(lambda request: HttpResponse())
+
+    @override_settings(
+        PERFILADO_SQL=True, PERFILADO_SQL_MUESTREO=1.0,
+        PERFILADO_SQL_LENTO_MS=10000, PERFILADO_SQL_UMBRAL_N1=3,
+    )
+    def test_detecta_consultas_repetidas(self):
+        roles = [Rol.objects.create(nombre=f"Rol {i}", descripcion="x") for i in range(4)]
+
+        def vista(request):
+            # N+1: una consulta por rol
+            for rol in roles:
+                list(Rol.objects.filter(id=rol.id))
+            return HttpResponse()
+
+        middleware = PerfiladoSQLMiddleware(vista)
+        with self.assertLogs("core.perfilado", level="WARNING") as logs:
+            response = middleware(RequestFactory().get("/api/roles/"))
+
+        self.assertIn('desc="4 consultas"', response["Server-Timing"])
+        self.assertIn('"repeticiones": 4', logs.output[0])
+
+    @override_settings(PERFILADO_SQL=True, PERFILADO_SQL_MUESTREO=0.0)
+    def test_sin_muestreo_no_perfila(self):
+        middleware = PerfiladoSQLMiddleware(lambda request: HttpResponse())
+        response = middleware(RequestFactory().get("/"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class MetricasTest(TestCase):
+    def test_almacen_mmap_suma_procesos(self):
+        import os
+        import tempfile
+        from . import metricas
+
+        with tempfile.TemporaryDirectory() as directorio:
+            uno = metricas._AlmacenMmap(os.path.join(directorio, "metricas_1.db"))
+            otro = metricas._AlmacenMmap(os.path.join(directorio, "metricas_2.db"))
+            for i in range(3000):  # obliga a crecer el archivo
+                uno.incrementar(f"clave-{i}", 1)
+            uno.incrementar("clave-0", 1.5)
+            otro.incrementar("clave-0", 2)
+
+            with override_settings(METRICAS_DIR=directorio):
+                totales = metricas.recolectar()
+            self.assertEqual(totales["clave-0"], 4.5)
+            self.assertEqual(len(totales), 3000)
+            # Reabrir el archivo conserva los valores
+            self.assertEqual(
+                metricas._AlmacenMmap(os.path.join(directorio, "metricas_1.db")).valores()["clave-1"], 1
+            )
+
+    def test_exposicion_prometheus(self):
+        from .metricas import _registro, Histograma, exponer, medir_externo
+
+        histograma = Histograma("prueba_seconds", "Prueba", ("proveedor",), limites=(0.1, 1))
+        self.addCleanup(_registro.pop, histograma.nombre)
+        histograma.observar(0.05, proveedor="a")
+        histograma.observar(0.5, proveedor="a")
+
+        @medir_externo("prueba", "fallida")
+        def fallida():
+            return {"exito": False}
+
+        fallida()
+        texto = exponer()
+        self.assertIn("# TYPE condominio_prueba_seconds histogram", texto)
+        self.assertIn('condominio_prueba_seconds_bucket{proveedor="a",le="0.1"} 1', texto)
+        self.assertIn('condominio_prueba_seconds_bucket{proveedor="a",le="+Inf"} 2', texto)
+        self.assertIn('condominio_prueba_seconds_count{proveedor="a"} 2', texto)
+        self.assertIn(
+            'condominio_external_call_duration_seconds_count'
+            '{proveedor="prueba",operacion="fallida",resultado="error"} 1',
+            texto,
+        )
+
+    def test_exposicion_contador(self):
+        from .metricas import CONSULTAS_DB, exponer
+
+        CONSULTAS_DB.inc(3, vista="prueba-contador", metodo="GET")
+        texto = exponer()
+        self.assertIn("# TYPE condominio_db_queries_total counter", texto)
+        self.assertIn('\ncondominio_db_queries_total{vista="prueba-contador",metodo="GET"} 3\n', texto)
+        self.assertNotIn("_total_total", texto)
+
+    def test_endpoint_metrics(self):
+        respuesta = self.client.get("/api/notificaciones/")
+        self.assertEqual(respuesta.status_code, 401)
+
+        respuesta = self.client.get("/metrics")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn(
+            'condominio_http_request_duration_seconds_count'
+            '{vista="notificaciones-list",metodo="GET",estado="401"}',
+            respuesta.content.decode(),
+        )
+        with override_settings(METRICAS_TOKEN="secreto"):
+            self.assertEqual(self.client.get("/metrics").status_code, 401)
+
+
+class ImportacionTest(TestCase):
+    def _archivo(self, contenido, nombre="personas.csv"):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        return SimpleUploadedFile(nombre, contenido.encode("utf-8-sig"))
+
+    def _importar(self, contenido, **kwargs):
+        from seguridad.models import PersonaAutorizada
+        from .importacion import Importador, leer_filas
+
+        importador = Importador(
+            PersonaAutorizada, clave="ci",
+            campos=["ci", "nombre", "email", "tipo_acceso", "activo"], obligatorias=["nombre"],
+        )
+        encabezados, filas = leer_filas(self._archivo(contenido))
+        return importador.importar(encabezados, filas, **kwargs)
+
+    def test_alta_y_actualizacion_por_lotes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from seguridad.models import PersonaAutorizada
+
+        PersonaAutorizada.objects.create(nombre="Previo", ci="100", tipo_acceso="proveedor")
+        filas = "".join(f"{100 + i};Persona {i};p{i}@test.com;sí\n" for i in range(25))
+        with CaptureQueriesContext(connection) as consultas:
+            resumen = self._importar("CI;Nombre;Email;Activo\n" + filas, tamano_lote=10)
+
+        self.assertEqual((resumen["creadas"], resumen["actualizadas"]), (24, 1))
+        self.assertEqual(resumen["con_errores"], 0)
+        # Lectura de claves existentes + un INSERT por lote (sin contar savepoints)
+        inserciones = [c for c in consultas if c["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserciones), 3)
+        previo = PersonaAutorizada.objects.get(ci="100")
+        # Solo se actualizan las columnas del archivo
+        self.assertEqual((previo.nombre, previo.tipo_acceso), ("Persona 0", "proveedor"))
+
+    def test_errores_por_fila(self):
+        from seguridad.models import PersonaAutorizada
+
+        PersonaAutorizada.objects.create(nombre="Otro", ci="900")
+        resumen = self._importar(
+            "ci,nombre,tipo_acceso\n"
+            "1,Ana,visitante\n"
+            "1,Ana repetida,visitante\n"
+            "2,,visitante\n"
+            "3,Luis,desconocido\n"
+            "4,Eva,\n"
+        )
+        self.assertEqual(resumen["creadas"], 2)
+        self.assertEqual([error["fila"] for error in resumen["errores"]], [3, 4, 5])
+        self.assertIn("ci", resumen["errores"][0]["errores"])
+        self.assertIn("nombre", resumen["errores"][1]["errores"])
+        self.assertIn("tipo_acceso", resumen["errores"][2]["errores"])
+        # Columna vacía: valor por defecto del modelo
+        self.assertEqual(PersonaAutorizada.objects.get(ci="4").tipo_acceso, "visitante")
+
+    def test_validar_no_escribe_y_encabezados(self):
+        from seguridad.models import PersonaAutorizada
+        from .importacion import ArchivoInvalido
+
+        resumen = self._importar("ci,nombre\n1,Ana\n", validar=True)
+        self.assertEqual(resumen["creadas"], 1)
+        self.assertFalse(PersonaAutorizada.objects.exists())
+        with self.assertRaises(ArchivoInvalido):
+            self._importar("ci,email\n1,a@test.com\n")
+
+
+class DashboardTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from . import dashboard
+
+        dashboard.CACHE._cache.clear()
+        rol = Rol.objects.create(nombre="Administrador", es_administrativo=True)
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin_dashboard", email="admin_dashboard@test.com", password="x", rol=rol
+        )
+
+    def _pedir(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get("/api/admin/dashboard-estadisticas/")
+        self.assertEqual(respuesta.status_code, 200)
+        # Sin contar sesión y usuario del request
+        return respuesta.json(), len([c for c in consultas if "COUNT(" in c["sql"]])
+
+    def test_una_consulta_por_modulo_y_cache(self):
+        from . import dashboard
+
+        datos, consultas = self._pedir()
+        self.assertEqual(set(datos), set(dashboard.MODULOS))
+        self.assertEqual(datos["usuarios"]["administrativos"], 1)
+        # seguridad usa dos modelos
+        self.assertEqual(consultas, len(dashboard.MODULOS) + 1)
+
+        _, consultas = self._pedir()
+        self.assertEqual(consultas, 0)
+
+    def test_invalidacion_por_modulo(self):
+        from datetime import date
+        from personal.models import Personal
+
+        self._pedir()
+        with self.captureOnCommitCallbacks(execute=True):
+            Personal.objects.create(
+                nombre="Ana", apellido="Paz", fecha_nacimiento=date(1990, 1, 1), telefono="1",
+                email="ana_dash@test.com", ci="d-1", codigo_empleado="D1", fecha_ingreso=date.today(),
+            )
+        datos, consultas = self._pedir()
+        self.assertEqual(consultas, 1)
+        self.assertEqual(datos["personal"], {"total": 1, "activos": 1, "inactivos": 0})
+
+    def test_escrituras_masivas_invalidan(self):
+        from datetime import date
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from personal.views import IMPORTADOR
+        from residentes.models import Residente
+        from unidades.asignacion import asignar
+        from unidades.models import UnidadHabitacional
+        from .importacion import leer_filas
+
+        unidad = UnidadHabitacional.objects.create(codigo="DASH-1")
+        residente = Residente.objects.create(
+            nombre="Luis", apellido="Mar", ci="r-dash", email="luis_dash@test.com",
+            telefono="1", tipo="propietario", fecha_ingreso=date(2024, 1, 1),
+        )
+        self._pedir()
+
+        archivo = SimpleUploadedFile(
+            "personal.csv",
+            "ci,nombre,apellido,fecha_nacimiento,telefono,email,codigo_empleado,fecha_ingreso\n"
+            "d-2,Eva,Sol,1990-01-01,1,eva_dash@test.com,D2,2024-01-01\n".encode(),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            IMPORTADOR.importar(*leer_filas(archivo))
+            asignar({unidad.id: [residente.id]})
+        datos, consultas = self._pedir()
+        self.assertEqual(consultas, 2)
+        self.assertEqual(datos["personal"]["total"], 1)
+        self.assertEqual(datos["residentes"]["sin_unidad"], 0)
+
+    def _reserva_datos(self):
+        from datetime import date, time
+        from reservas.models import AreaComun
+        from residentes.models import Residente
+
+        return {
+            "area_comun": AreaComun.objects.create(nombre="Salón dashboard", monto_hora=50),
+            "residente": Residente.objects.create(
+                nombre="Inés", apellido="Vega", ci="r-dash-2", email="ines_dash@test.com",
+                telefono="1", tipo="propietario", fecha_ingreso=date(2024, 1, 1),
+            ),
+            "hora_inicio": time(8, 0),
+            "hora_fin": time(9, 0),
+        }
+
+    def test_cambio_de_estado_en_lote_invalida(self):
+        from datetime import date, timedelta
+        from reservas.models import Reserva
+        from reservas.transiciones import cambiar_estado
+
+        Reserva.objects.create(fecha_reserva=date.today() + timedelta(days=3), **self._reserva_datos())
+        self.assertEqual(self._pedir()[0]["reservas"]["pendientes"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cambiar_estado(Reserva.objects.all(), Reserva.ESTADO_CONFIRMADA)
+        datos, _ = self._pedir()
+        self.assertEqual((datos["reservas"]["pendientes"], datos["reservas"]["confirmadas"]), (0, 1))
+
+    def test_ciclo_de_vida_invalida(self):
+        from datetime import date, datetime, time, timedelta
+        from reservas.ciclo_vida import procesar_ciclo_vida
+        from reservas.models import Reserva
+
+        fecha = date.today() + timedelta(days=3)
+        Reserva.objects.create(fecha_reserva=fecha, estado=Reserva.ESTADO_CONFIRMADA, **self._reserva_datos())
+        self.assertEqual(self._pedir()[0]["reservas"]["confirmadas"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            procesar_ciclo_vida(ahora=datetime.combine(fecha, time(12, 0)))
+        self.assertEqual(self._pedir()[0]["reservas"]["confirmadas"], 0)
+
+    def test_reservas_recurrentes_invalidan(self):
+        from datetime import date, timedelta
+        from reservas.recurrencia import crear_reservas
+
+        datos = self._reserva_datos()
+        self.assertEqual(self._pedir()[0]["reservas"]["total"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            crear_reservas(datos, [date.today() + timedelta(days=7 * i) for i in range(1, 4)])
+        self.assertEqual(self._pedir()[0]["reservas"]["total"], 3)
+
+    def test_despacho_de_notificaciones_invalida(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from notificaciones.despacho import despachar
+        from notificaciones.models import Notificacion
+
+        ahora = timezone.now()
+        Notificacion.objects.create(
+            nombre="Aviso", descripcion="Programado", estado="programada",
+            fecha_programada=ahora - timedelta(minutes=5),
+        )
+        self.assertEqual(self._pedir()[0]["notificaciones"]["programadas"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            despachar(ahora=ahora, enviar_correos=False)
+        datos, _ = self._pedir()
+        self.assertEqual((datos["notificaciones"]["programadas"], datos["notificaciones"]["enviadas"]), (0, 1))
+
+
+class ConteosTest(TestCase):
+    def setUp(self):
+        from inventario.models import Inventario
+
+        for nombre, categoria, estado in [
+            ("Silla", "MOBILIARIO", "ACTIVO"),
+            ("Mesa", "MOBILIARIO", "EN_REPARACION"),
+            ("Taladro", "HERRAMIENTA", "ACTIVO"),
+        ]:
+            Inventario.objects.create(
+                nombre=nombre, categoria=categoria, estado=estado, valor_estimado=1,
+                ubicacion="Depósito", fecha_adquisicion="2024-01-01",
+            )
+
+    def test_dimensiones_en_una_consulta(self):
+        from inventario.models import Inventario
+        from .conteos import contar
+
+        with self.assertNumQueries(1):
+            conteos = contar(Inventario.objects.all(), dimensiones=["estado", "categoria"])
+        self.assertEqual(conteos["total"], 3)
+        self.assertEqual(conteos["estado"], {"ACTIVO": 2, "INACTIVO": 0, "EN_REPARACION": 1, "DADO_DE_BAJA": 0})
+        self.assertEqual(conteos["categoria"]["OTRO"], 0)
+
+        sin_completar = contar(Inventario.objects.all(), dimensiones=["categoria"], completar=False)
+        self.assertEqual(sin_completar["categoria"], {"MOBILIARIO": 2, "HERRAMIENTA": 1})
+
+    def test_condiciones_y_total(self):
+        from django.db.models import Q
+        from inventario.models import Inventario
+        from .conteos import contar
+
+        with self.assertNumQueries(2):
+            conteos = contar(
+                Inventario.objects.filter(categoria="MOBILIARIO"),
+                dimensiones=["estado"],
+                condiciones={"activos": Q(estado="ACTIVO")},
+            )
+        self.assertEqual((conteos["total"], conteos["activos"]), (2, 1))
+        self.assertEqual(contar(Inventario.objects.none()), {"total": 0})
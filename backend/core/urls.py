@@ -18,6 +18,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from users.auth_views import logout_view
+from core.metricas import vista_metricas
+from core.sse import eventos, ticket_eventos
 # import test_seguridad_simple  # Módulo eliminado - comentado temporalmente
 from seguridad.facial_recognition_views import (
     detect_faces,
@@ -32,6 +34,8 @@ from seguridad.facial_recognition_views import (
 urlpatterns = [
     # Panel de administración de Django
     path("admin/", admin.site.urls),
+    # Métricas para Prometheus
+    path("metrics", vista_metricas, name="metricas"),
     # ENDPOINTS DE API (todos bajo /api/)
     # Auth: login/logout/password/reset para clientes
     # Ruta personalizada para logout
@@ -51,6 +55,9 @@ urlpatterns = [
     # Notificaciones: gestión de notificaciones del condominio
     path("api/notificaciones/", include("notificaciones.urls")),
     path("api/bitacora/", include("bitacora.urls")),
+    # Eventos en tiempo real (Server-Sent Events, requiere ASGI)
+    path("api/eventos/", eventos, name="eventos"),
+    path("api/eventos/ticket/", ticket_eventos, name="eventos-ticket"),
     path("api/areas-comunes/", include("areas_comunes.urls")),
     # Reservas: gestión de reservas de áreas comunes
     path("api/reservas/", include("reservas.urls")),
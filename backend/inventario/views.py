@@ -3,6 +3,8 @@ from rest_framework import filters, permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.conteos import contar
+
 from .models import Inventario
 from .serializers import InventarioSerializer, InventarioDetailSerializer
 
@@ -36,24 +38,19 @@ class InventarioViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def estadisticas(self, request):
         """Obtener estadísticas de inventario."""
-        total = Inventario.objects.count()
-        activos = Inventario.objects.filter(estado='ACTIVO').count()
-        inactivos = Inventario.objects.filter(estado='INACTIVO').count()
-        en_reparacion = Inventario.objects.filter(estado='EN_REPARACION').count()
-        dados_de_baja = Inventario.objects.filter(estado='DADO_DE_BAJA').count()
-        
-        # Distribución por categorías
-        categorias = {}
-        for categoria, _ in Inventario.CATEGORIA_CHOICES:
-            categorias[categoria] = Inventario.objects.filter(categoria=categoria).count()
+        conteos = contar(Inventario.objects.all(), dimensiones=['estado', 'categoria'])
+        por_estado = conteos['estado']
         
         return Response({
-            'total': total,
+            'total': conteos['total'],
             'por_estado': {
-                'activos': activos,
-                'inactivos': inactivos,
-                'en_reparacion': en_reparacion,
-                'dados_de_baja': dados_de_baja,
+                'activos': por_estado['ACTIVO'],
+                'inactivos': por_estado['INACTIVO'],
+                'en_reparacion': por_estado['EN_REPARACION'],
+                'dados_de_baja': por_estado['DADO_DE_BAJA'],
             },
-            'por_categoria': categorias
+            'por_categoria': {
+                categoria: conteos['categoria'][categoria]
+                for categoria, _ in Inventario.CATEGORIA_CHOICES
+            }
         })
\ No newline at end of file
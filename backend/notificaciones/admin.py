@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Notificacion
+from .bandeja import entregar
+from .models import CorreoSaliente, Notificacion
 
 
 @admin.register(Notificacion)
@@ -49,4 +50,21 @@ class NotificacionAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not change:  # Si es un nuevo objeto
             obj.creado_por = request.user
-        super().save_model(request, obj, form, change)
\ No newline at end of file
+        super().save_model(request, obj, form, change)
+    
+    def save_related(self, request, form, formsets, change):
+        # Los roles destinatarios se guardan aquí: entregar después de ellos
+        super().save_related(request, form, formsets, change)
+        if form.instance.estado == 'enviada':
+            entregar(form.instance)
+
+
+@admin.register(CorreoSaliente)
+class CorreoSalienteAdmin(admin.ModelAdmin):
+    list_display = ['tipo', 'asunto', 'estado', 'intentos', 'proximo_intento', 'fecha_creacion', 'fecha_envio']
+    list_filter = ['estado', 'tipo', 'fecha_creacion']
+    search_fields = ['asunto', 'destinatarios']
+    # El contexto y los cuerpos pueden incluir códigos de verificación y
+    # enlaces de confirmación o de restablecimiento de contraseña
+    exclude = ['contexto', 'cuerpo_texto', 'cuerpo_html']
+    readonly_fields = ['fecha_creacion', 'fecha_envio', 'intentos', 'ultimo_error']
@@ -0,0 +1,96 @@
+"""
+Bandeja de entrada de notificaciones por usuario.
+
+Al enviar una notificación se crea en bloque una fila de NotificacionUsuario
+por cada usuario activo de sus roles destinatarios (fan-out). Desde entonces
+las bandejas, el conteo de no leídas y las marcas de lectura/confirmación son
+consultas sobre esa tabla indexada por (usuario, leida_en), sin recorrer la
+relación con los roles.
+
+Cada entrega también se publica en el canal en tiempo real (core.eventos)
+para los roles destinatarios.
+"""
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.eventos import publicar
+from users.models import CustomUser
+
+from .models import Notificacion, NotificacionUsuario
+
+TAMANO_LOTE = 1000
+
+
+def entregar(notificacion):
+    """
+    Crea las filas de bandeja que falten para los usuarios activos de los
+    roles destinatarios. Es idempotente: reenviar solo agrega a los usuarios
+    que todavía no la tienen. Retorna la cantidad de destinatarios.
+    """
+    roles = list(notificacion.roles_destinatarios.values_list('id', flat=True))
+    usuarios = list(
+        CustomUser.objects.filter(rol__in=roles, is_active=True).values_list('id', flat=True)
+    )
+    ahora = timezone.now()
+    NotificacionUsuario.objects.bulk_create(
+        [
+            NotificacionUsuario(usuario_id=usuario_id, notificacion=notificacion, fecha_entrega=ahora)
+            for usuario_id in usuarios
+        ],
+        ignore_conflicts=True,
+        batch_size=TAMANO_LOTE,
+    )
+    publicar(
+        'notificacion',
+        {
+            'id': notificacion.id,
+            'nombre': notificacion.nombre,
+            'tipo': notificacion.tipo,
+            'prioridad': notificacion.prioridad,
+        },
+        roles=roles,
+    )
+    return len(usuarios)
+
+
+def bandeja(usuario, solo_no_leidas=False):
+    """
+    Notificaciones activas y enviadas entregadas al usuario, con ``leida_en``
+    y ``confirmada_en`` de su bandeja anotados. Una notificación que vuelve a
+    borrador o se cancela deja de aparecer aunque ya se haya entregado.
+    """
+    filtros = {'entregas__usuario': usuario, 'activa': True, 'estado': 'enviada'}
+    if solo_no_leidas:
+        filtros['entregas__leida_en__isnull'] = True
+    # Un solo filter(): las anotaciones usan la misma fila de la bandeja
+    return Notificacion.objects.filter(**filtros).annotate(
+        leida_en=F('entregas__leida_en'),
+        confirmada_en=F('entregas__confirmada_en'),
+        fecha_entrega=F('entregas__fecha_entrega'),
+    )
+
+
+def contar_no_leidas(usuario):
+    return NotificacionUsuario.objects.filter(
+        usuario=usuario,
+        leida_en__isnull=True,
+        notificacion__activa=True,
+        notificacion__estado='enviada',
+    ).count()
+
+
+def marcar_leidas(usuario, notificacion_ids=None):
+    """Marca como leídas las notificaciones indicadas (o todas). Retorna cuántas cambiaron"""
+    entregas = NotificacionUsuario.objects.filter(usuario=usuario, leida_en__isnull=True)
+    if notificacion_ids is not None:
+        entregas = entregas.filter(notificacion_id__in=notificacion_ids)
+    return entregas.update(leida_en=timezone.now())
+
+
+def confirmar(usuario, notificacion_id):
+    """Registra la confirmación de lectura (y la lectura, si faltaba)"""
+    ahora = timezone.now()
+    entregas = NotificacionUsuario.objects.filter(usuario=usuario, notificacion_id=notificacion_id)
+    entregas.filter(leida_en__isnull=True).update(leida_en=ahora)
+    return entregas.filter(confirmada_en__isnull=True).update(confirmada_en=ahora)
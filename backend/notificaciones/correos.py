@@ -0,0 +1,222 @@
+"""
+Bandeja de salida de correos (CorreoSaliente).
+
+Las peticiones no se comunican con el servidor SMTP: ``encolar`` y
+``encolar_mensaje`` solo insertan una fila, dentro de la transacción de la
+petición (si la petición se revierte, el correo tampoco sale). El trabajador
+(comando correos_enviar) los envía con ``enviar_pendientes``:
+
+- Toma lotes de pendientes vencidos con ``SELECT ... FOR UPDATE SKIP
+  LOCKED`` (índice correo_estado_intento_idx), así que varias réplicas del
+  trabajador no envían el mismo correo.
+- Las plantillas de cada tipo se cargan una sola vez por proceso; por correo
+  solo se renderizan con su contexto.
+- Todo el envío reutiliza una conexión SMTP abierta. Si un envío falla, la
+  conexión se reabre para el siguiente; si no se puede abrir, el resto del
+  lote se reprograma sin intentarlo.
+- Un correo fallido se reintenta con espera exponencial
+  (``REINTENTO_BASE * 2^(intentos - 1)`` segundos) y al llegar a
+  ``MAX_INTENTOS`` queda 'fallido'.
+- Al pasar a 'enviado' o 'fallido' se borran el contexto y los cuerpos
+  (códigos de verificación, enlaces de confirmación): solo quedan los datos
+  de entrega.
+
+Los bloqueos del lote se mantienen durante el envío: solo compiten por esas
+filas otros trabajadores, que las saltan. Si el proceso muere a mitad de un
+lote, el rollback deja esos correos pendientes y se vuelven a enviar (entrega
+al menos una vez).
+"""
+
+import functools
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import CorreoSaliente
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 50
+MAX_INTENTOS = 5
+REINTENTO_BASE = 60
+
+# tipo: asunto y plantillas con que se renderiza al enviarse
+TIPOS = {
+    "verificacion_movil": {
+        "asunto": "Código de verificación - MoviFleet",
+        "texto": "account/email/mobile_verification.txt",
+        "html": "account/email/mobile_verification.html",
+    },
+}
+
+
+def encolar(tipo, destinatarios, contexto, remitente=None):
+    """
+    Encola un correo de un tipo registrado en TIPOS. ``contexto`` debe ser
+    serializable a JSON. Retorna el CorreoSaliente creado.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de correo desconocido: {tipo}")
+    return CorreoSaliente.objects.create(
+        tipo=tipo,
+        destinatarios=list(destinatarios),
+        remitente=remitente or settings.DEFAULT_FROM_EMAIL,
+        asunto=TIPOS[tipo]["asunto"],
+        contexto=contexto,
+    )
+
+
+def encolar_mensaje(mensaje, tipo):
+    """Encola un EmailMessage ya renderizado (p. ej. los correos de allauth)"""
+    html = next(
+        (contenido for contenido, mimetype in getattr(mensaje, "alternatives", []) if mimetype == "text/html"),
+        "",
+    )
+    texto = mensaje.body
+    if mensaje.content_subtype == "html":
+        html, texto = mensaje.body, ""
+    return CorreoSaliente.objects.create(
+        tipo=tipo,
+        destinatarios=list(mensaje.to),
+        remitente=mensaje.from_email or settings.DEFAULT_FROM_EMAIL,
+        asunto=mensaje.subject,
+        cuerpo_texto=texto,
+        cuerpo_html=html,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _plantillas(tipo):
+    """(plantilla de texto, plantilla HTML o None) de un tipo, cargadas una vez"""
+    definicion = TIPOS[tipo]
+    html = definicion.get("html")
+    return get_template(definicion["texto"]), get_template(html) if html else None
+
+
+def _mensaje(correo):
+    if correo.tipo in TIPOS:
+        texto, html = _plantillas(correo.tipo)
+        texto = texto.render(correo.contexto)
+        html = html.render(correo.contexto) if html else ""
+    else:
+        texto, html = correo.cuerpo_texto, correo.cuerpo_html
+
+    mensaje = EmailMultiAlternatives(
+        subject=correo.asunto,
+        body=texto or html,
+        from_email=correo.remitente or settings.DEFAULT_FROM_EMAIL,
+        to=correo.destinatarios,
+    )
+    if html and texto:
+        mensaje.attach_alternative(html, "text/html")
+    elif html:
+        mensaje.content_subtype = "html"
+    return mensaje
+
+
+def _cerrar(conexion):
+    try:
+        conexion.close()
+    except Exception:
+        logger.debug("No se pudo cerrar la conexión de correo", exc_info=True)
+
+
+def _reprogramar(correo, error, ahora):
+    correo.intentos += 1
+    correo.ultimo_error = f"{type(error).__name__}: {error}"[:1000]
+    if correo.intentos >= MAX_INTENTOS:
+        correo.estado = CorreoSaliente.ESTADO_FALLIDO
+        # No se volverá a enviar: se descarta el contenido sensible
+        correo.contexto = {}
+        correo.cuerpo_texto = correo.cuerpo_html = ''
+    else:
+        correo.proximo_intento = ahora + timedelta(seconds=REINTENTO_BASE * 2 ** (correo.intentos - 1))
+
+
+def _enviar(conexion, lote, ahora):
+    """Envía el lote por la conexión. Retorna (ids enviados, correos reprogramados)"""
+    enviados = []
+    fallidos = []
+    for indice, correo in enumerate(lote):
+        try:
+            # Sin efecto si la conexión ya está abierta
+            conexion.open()
+        except Exception as error:
+            logger.warning("No se pudo conectar al servidor de correo: %s", error)
+            for pendiente in lote[indice:]:
+                _reprogramar(pendiente, error, ahora)
+                fallidos.append(pendiente)
+            break
+
+        try:
+            if not conexion.send_messages([_mensaje(correo)]):
+                raise ValueError("El correo no tiene destinatarios válidos")
+        except Exception as error:
+            logger.warning("No se pudo enviar el correo %s: %s", correo.id, error)
+            _reprogramar(correo, error, ahora)
+            fallidos.append(correo)
+            # La conexión puede haber quedado inservible: se reabre en el siguiente
+            _cerrar(conexion)
+        else:
+            enviados.append(correo.id)
+    return enviados, fallidos
+
+
+def _procesar_lote(conexion, ahora, tamano_lote):
+    with transaction.atomic():
+        lote = list(
+            CorreoSaliente.objects.filter(
+                estado=CorreoSaliente.ESTADO_PENDIENTE, proximo_intento__lte=ahora
+            )
+            .order_by('proximo_intento', 'id')
+            .select_for_update(skip_locked=True)[:tamano_lote]
+        )
+        enviados, fallidos = _enviar(conexion, lote, ahora)
+
+        if enviados:
+            # El contenido ya no hace falta y puede incluir códigos o enlaces
+            # de un solo uso: solo se conservan los datos de entrega
+            CorreoSaliente.objects.filter(id__in=enviados).update(
+                estado=CorreoSaliente.ESTADO_ENVIADO,
+                intentos=F('intentos') + 1,
+                ultimo_error='',
+                fecha_envio=timezone.now(),
+                contexto={},
+                cuerpo_texto='',
+                cuerpo_html='',
+            )
+        if fallidos:
+            CorreoSaliente.objects.bulk_update(
+                fallidos,
+                ['intentos', 'estado', 'proximo_intento', 'ultimo_error', 'contexto', 'cuerpo_texto', 'cuerpo_html'],
+            )
+    return lote, enviados, fallidos
+
+
+def enviar_pendientes(tamano_lote=TAMANO_LOTE, ahora=None):
+    """
+    Envía por lotes los correos pendientes cuyo próximo intento ya llegó.
+    Retorna {'enviados': n, 'reintentos': n, 'fallidos': n}.
+    """
+    ahora = ahora or timezone.now()
+    resumen = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+    conexion = get_connection()
+
+    try:
+        while True:
+            lote, enviados, fallidos = _procesar_lote(conexion, ahora, tamano_lote)
+            resumen['enviados'] += len(enviados)
+            for correo in fallidos:
+                clave = 'fallidos' if correo.estado == CorreoSaliente.ESTADO_FALLIDO else 'reintentos'
+                resumen[clave] += 1
+
+            if len(lote) < tamano_lote:
+                return resumen
+    finally:
+        _cerrar(conexion)
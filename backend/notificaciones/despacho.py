@@ -0,0 +1,119 @@
+"""
+Despacho de notificaciones programadas.
+
+Cada lote toma las notificaciones 'programada' con ``fecha_programada``
+vencida mediante ``SELECT ... FOR UPDATE SKIP LOCKED`` (índice
+notif_estado_fecha_idx), así que varias réplicas del despachador pueden
+trabajar a la vez sin tomar la misma notificación. En la misma transacción:
+
+- las vencidas por ``fecha_expiracion`` pasan a 'cancelada' sin enviarse;
+- el resto se entrega a las bandejas (fan-out) y pasa a 'enviada'.
+
+Los correos se envían después de confirmar el lote, reutilizando una sola
+conexión SMTP para todo el despacho y agrupando destinatarios en BCC.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import invalidar_modelo
+
+from .bandeja import entregar
+from .models import Notificacion, NotificacionUsuario
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 50
+DESTINATARIOS_POR_CORREO = 50
+
+
+def pendientes(ahora):
+    return Notificacion.objects.filter(
+        estado='programada', activa=True, fecha_programada__lte=ahora
+    )
+
+
+def _correos(notificaciones):
+    """Mensajes (uno por cada grupo de destinatarios) de las notificaciones enviadas"""
+    por_notificacion = {}
+    destinatarios = NotificacionUsuario.objects.filter(
+        notificacion__in=notificaciones
+    ).exclude(usuario__email='').values_list('notificacion_id', 'usuario__email')
+    for notificacion_id, email in destinatarios:
+        por_notificacion.setdefault(notificacion_id, []).append(email)
+
+    mensajes = []
+    for notificacion in notificaciones:
+        emails = por_notificacion.get(notificacion.id, [])
+        for inicio in range(0, len(emails), DESTINATARIOS_POR_CORREO):
+            mensajes.append(EmailMessage(
+                subject=f"[{notificacion.get_tipo_display()}] {notificacion.nombre}",
+                body=notificacion.descripcion,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                bcc=emails[inicio:inicio + DESTINATARIOS_POR_CORREO],
+            ))
+    return mensajes
+
+
+def _procesar_lote(ahora, tamano_lote):
+    """Retorna (enviadas, expiradas) del lote; listas vacías si no hay pendientes"""
+    with transaction.atomic():
+        lote = list(
+            pendientes(ahora)
+            .order_by('fecha_programada', 'id')
+            .select_for_update(skip_locked=True)[:tamano_lote]
+        )
+        expiradas = [n for n in lote if n.fecha_expiracion and n.fecha_expiracion <= ahora]
+        enviadas = [n for n in lote if n not in expiradas]
+
+        if expiradas:
+            Notificacion.objects.filter(id__in=[n.id for n in expiradas]).update(
+                estado='cancelada', fecha_actualizacion=ahora
+            )
+        for notificacion in enviadas:
+            entregar(notificacion)
+        if enviadas:
+            Notificacion.objects.filter(id__in=[n.id for n in enviadas]).update(
+                estado='enviada', fecha_actualizacion=ahora
+            )
+        if lote:
+            # update() no emite señales: los contadores del dashboard cambiaron
+            invalidar_modelo(Notificacion)
+    return enviadas, expiradas
+
+
+def despachar(tamano_lote=TAMANO_LOTE, ahora=None, enviar_correos=None):
+    """
+    Despacha por lotes todas las notificaciones programadas vencidas.
+    Retorna {'enviadas': n, 'expiradas': n, 'correos': n}.
+    """
+    ahora = ahora or timezone.now()
+    if enviar_correos is None:
+        enviar_correos = settings.NOTIFICACIONES_ENVIAR_CORREOS
+    resumen = {'enviadas': 0, 'expiradas': 0, 'correos': 0}
+    conexion = get_connection(fail_silently=True) if enviar_correos else None
+
+    try:
+        while True:
+            enviadas, expiradas = _procesar_lote(ahora, tamano_lote)
+            resumen['enviadas'] += len(enviadas)
+            resumen['expiradas'] += len(expiradas)
+
+            if conexion is not None and enviadas:
+                # Fuera de la transacción: un SMTP lento no retiene los bloqueos.
+                # Con fail_silently un error de SMTP no detiene el despacho.
+                mensajes = _correos(enviadas)
+                enviados = (conexion.send_messages(mensajes) or 0) if mensajes else 0
+                if enviados < len(mensajes):
+                    logger.warning("Se enviaron %s de %s correos de notificaciones", enviados, len(mensajes))
+                resumen['correos'] += enviados
+
+            if len(enviadas) + len(expiradas) < tamano_lote:
+                return resumen
+    finally:
+        if conexion is not None:
+            conexion.close()
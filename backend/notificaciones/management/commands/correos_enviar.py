@@ -0,0 +1,58 @@
+"""
+Trabajador de la bandeja de salida de correos.
+
+Envía los correos encolados (verificación móvil, confirmaciones de allauth)
+por lotes con una sola conexión SMTP y reprograma los que fallan. Se puede
+ejecutar por cron o como proceso continuo, y en varias réplicas a la vez
+(FOR UPDATE SKIP LOCKED).
+
+Uso:
+    python manage.py correos_enviar [--lote 50] [--continuo] [--intervalo 5]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notificaciones.correos import TAMANO_LOTE, enviar_pendientes
+
+
+class Command(BaseCommand):
+    help = 'Envía los correos pendientes de la bandeja de salida'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help='Correos tomados por transacción'
+        )
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Seguir consultando cada --intervalo segundos'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=5,
+            help='Segundos entre consultas en modo continuo'
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1 or options['intervalo'] < 1:
+            self.stdout.write(self.style.ERROR('--lote e --intervalo deben ser al menos 1'))
+            return
+
+        while True:
+            resumen = enviar_pendientes(tamano_lote=options['lote'])
+            if any(resumen.values()) or not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ Enviados: {resumen['enviados']} · Reintentos: {resumen['reintentos']}"
+                    f" · Fallidos: {resumen['fallidos']}"
+                ))
+            if not options['continuo']:
+                return
+            # Evitar conexiones caídas o viejas entre consultas
+            close_old_connections()
+            time.sleep(options['intervalo'])
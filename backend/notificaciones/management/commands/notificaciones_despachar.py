@@ -0,0 +1,57 @@
+"""
+Despachador de notificaciones programadas.
+
+Envía las notificaciones cuya fecha_programada ya llegó (bandejas y correo)
+y cancela las que expiraron sin enviarse. Se puede ejecutar por cron o como
+proceso continuo, y en varias réplicas a la vez (FOR UPDATE SKIP LOCKED).
+
+Uso:
+    python manage.py notificaciones_despachar [--lote 50] [--continuo] [--intervalo 30]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notificaciones.despacho import TAMANO_LOTE, despachar
+
+
+class Command(BaseCommand):
+    help = 'Envía las notificaciones programadas vencidas y cancela las expiradas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help='Notificaciones tomadas por transacción'
+        )
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Seguir consultando cada --intervalo segundos'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=int,
+            default=30,
+            help='Segundos entre consultas en modo continuo'
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1 or options['intervalo'] < 1:
+            self.stdout.write(self.style.ERROR('--lote e --intervalo deben ser al menos 1'))
+            return
+
+        while True:
+            resumen = despachar(tamano_lote=options['lote'])
+            if resumen['enviadas'] or resumen['expiradas'] or not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ Enviadas: {resumen['enviadas']} · Expiradas: {resumen['expiradas']}"
+                    f" · Correos: {resumen['correos']}"
+                ))
+            if not options['continuo']:
+                return
+            # Evitar conexiones caídas o viejas entre consultas
+            close_old_connections()
+            time.sleep(options['intervalo'])
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def poblar_bandejas(apps, schema_editor):
+    """
+    Entrega las notificaciones ya enviadas a los usuarios activos de sus
+    roles. Las marcadas como 'leida' (estado global anterior) quedan leídas
+    para todos y vuelven al estado 'enviada'.
+    """
+    Notificacion = apps.get_model('notificaciones', 'Notificacion')
+    NotificacionUsuario = apps.get_model('notificaciones', 'NotificacionUsuario')
+    CustomUser = apps.get_model('users', 'CustomUser')
+    ahora = django.utils.timezone.now()
+
+    for notificacion in Notificacion.objects.filter(estado__in=['enviada', 'leida']):
+        usuarios = CustomUser.objects.filter(
+            rol__in=notificacion.roles_destinatarios.all(), is_active=True
+        ).values_list('id', flat=True)
+        leida_en = ahora if notificacion.estado == 'leida' else None
+        NotificacionUsuario.objects.bulk_create(
+            [
+                NotificacionUsuario(
+                    usuario_id=usuario_id,
+                    notificacion_id=notificacion.id,
+                    fecha_entrega=notificacion.fecha_actualizacion,
+                    leida_en=leida_en,
+                )
+                for usuario_id in usuarios
+            ],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+    Notificacion.objects.filter(estado='leida').update(estado='enviada')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0002_alter_notificacion_estado'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificacion',
+            name='estado',
+            field=models.CharField(choices=[('borrador', 'Borrador'), ('programada', 'Programada'), ('enviada', 'Enviada'), ('cancelada', 'Cancelada')], default='borrador', max_length=20, verbose_name='Estado'),
+        ),
+        migrations.CreateModel(
+            name='NotificacionUsuario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_entrega', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Entrega')),
+                ('leida_en', models.DateTimeField(blank=True, null=True, verbose_name='Leída en')),
+                ('confirmada_en', models.DateTimeField(blank=True, null=True, verbose_name='Confirmada en')),
+                ('notificacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entregas', to='notificaciones.notificacion', verbose_name='Notificación')),
+                ('usuario', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bandeja_notificaciones', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Notificación de Usuario',
+                'verbose_name_plural': 'Bandeja de Notificaciones',
+                'ordering': ['-fecha_entrega'],
+                'indexes': [models.Index(fields=['usuario', 'leida_en'], include=('notificacion',), name='notif_bandeja_leida_idx'), models.Index(fields=['usuario', '-fecha_entrega'], name='notif_bandeja_fecha_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificacionusuario',
+            constraint=models.UniqueConstraint(fields=('usuario', 'notificacion'), name='notif_usuario_unica'),
+        ),
+        migrations.RunPython(poblar_bandejas, migrations.RunPython.noop),
+    ]
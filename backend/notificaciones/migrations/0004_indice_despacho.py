@@ -0,0 +1,20 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0003_bandeja_usuario'),
+        ('users', '0002_auto_20250925_1635'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(fields=['estado', 'fecha_programada'], name='notif_estado_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificaciones', '0004_indice_despacho'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorreoSaliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50, verbose_name='Tipo')),
+                ('destinatarios', models.JSONField(default=list, verbose_name='Destinatarios')),
+                ('remitente', models.CharField(blank=True, max_length=254, verbose_name='Remitente')),
+                ('asunto', models.CharField(blank=True, max_length=255, verbose_name='Asunto')),
+                ('contexto', models.JSONField(blank=True, default=dict, verbose_name='Contexto')),
+                ('cuerpo_texto', models.TextField(blank=True, verbose_name='Cuerpo (texto)')),
+                ('cuerpo_html', models.TextField(blank=True, verbose_name='Cuerpo (HTML)')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('enviado', 'Enviado'), ('fallido', 'Fallido')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próximo intento')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('fecha_envio', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Envío')),
+            ],
+            options={
+                'verbose_name': 'Correo Saliente',
+                'verbose_name_plural': 'Correos Salientes',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='correo_estado_intento_idx')],
+            },
+        ),
+    ]
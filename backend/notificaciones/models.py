@@ -1,11 +1,33 @@
 from django.db import models
-from users.models import Rol
+from django.utils import timezone
+from users.models import CustomUser, Rol
+
+
+class NotificacionQuerySet(models.QuerySet):
+    """QuerySet de notificaciones con los datos que usa NotificacionSerializer"""
+    
+    def con_destinatarios(self):
+        """
+        Precarga el creador y los roles destinatarios, estos últimos con la
+        cantidad de usuarios activos calculada en la misma consulta agrupada.
+        Con esto el serializer no hace consultas por fila.
+        """
+        roles = Rol.objects.annotate(
+            total_usuarios=models.Count(
+                'customuser', filter=models.Q(customuser__is_active=True)
+            )
+        )
+        return self.select_related('creado_por').prefetch_related(
+            models.Prefetch('roles_destinatarios', queryset=roles)
+        )
 
 
 class Notificacion(models.Model):
     """
     Modelo para gestionar notificaciones del sistema de condominio
     """
+    objects = NotificacionQuerySet.as_manager()
+    
     TIPO_CHOICES = [
         ('general', 'General'),
         ('mantenimiento', 'Mantenimiento'),
@@ -21,7 +43,6 @@ class Notificacion(models.Model):
         ('programada', 'Programada'),
         ('enviada', 'Enviada'),
         ('cancelada', 'Cancelada'),
-        ('leida', 'Leída'),
     ]
 
     # Campos principales
@@ -126,6 +147,10 @@ class Notificacion(models.Model):
         verbose_name = "Notificación"
         verbose_name_plural = "Notificaciones"
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Búsqueda de programadas vencidas del despachador
+            models.Index(fields=['estado', 'fecha_programada'], name='notif_estado_fecha_idx'),
+        ]
         
     def __str__(self):
         return f"{self.nombre} ({self.get_tipo_display()})"
@@ -133,9 +158,11 @@ class Notificacion(models.Model):
     @property
     def total_destinatarios(self):
         """Calcula el número total de destinatarios basado en los roles"""
-        if self.roles_destinatarios.exists():
-            return sum(rol.usuarios.filter(is_active=True).count() for rol in self.roles_destinatarios.all())
-        return 0
+        roles = self.roles_destinatarios.all()
+        # Con con_destinatarios() los roles ya traen su total de usuarios
+        if all(hasattr(rol, 'total_usuarios') for rol in roles):
+            return sum(rol.total_usuarios for rol in roles)
+        return CustomUser.objects.filter(rol__in=roles, is_active=True).count()
     
     @property
     def estado_display(self):
@@ -149,4 +176,120 @@ class Notificacion(models.Model):
         return {
             'estado': self.get_estado_display(),
             'color': colors.get(self.estado, 'gray')
-        }
\ No newline at end of file
+        }
+
+
+class NotificacionUsuario(models.Model):
+    """
+    Bandeja de entrada: una fila por (usuario, notificación) creada al enviar
+    la notificación a los usuarios de sus roles destinatarios. Guarda el
+    estado de lectura y confirmación de cada usuario.
+    """
+    usuario = models.ForeignKey(
+        'users.CustomUser',
+        on_delete=models.CASCADE,
+        related_name='bandeja_notificaciones',
+        # Cubierto por los índices compuestos que empiezan por usuario
+        db_index=False,
+        verbose_name="Usuario"
+    )
+    
+    notificacion = models.ForeignKey(
+        Notificacion,
+        on_delete=models.CASCADE,
+        related_name='entregas',
+        verbose_name="Notificación"
+    )
+    
+    fecha_entrega = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Fecha de Entrega"
+    )
+    
+    leida_en = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Leída en"
+    )
+    
+    confirmada_en = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Confirmada en"
+    )
+
+    class Meta:
+        verbose_name = "Notificación de Usuario"
+        verbose_name_plural = "Bandeja de Notificaciones"
+        ordering = ['-fecha_entrega']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['usuario', 'notificacion'],
+                name='notif_usuario_unica'
+            ),
+        ]
+        indexes = [
+            # Conteo de no leídas con un index-only scan
+            models.Index(
+                fields=['usuario', 'leida_en'],
+                include=['notificacion'],
+                name='notif_bandeja_leida_idx'
+            ),
+            models.Index(
+                fields=['usuario', '-fecha_entrega'],
+                name='notif_bandeja_fecha_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.notificacion_id} → {self.usuario_id}"
+
+
+class CorreoSaliente(models.Model):
+    """
+    Bandeja de salida de correos. Las peticiones solo guardan el correo y el
+    trabajador (comando correos_enviar) lo envía por lotes con reintentos.
+    Los correos con ``tipo`` registrado en notificaciones.correos se
+    renderizan al enviarse a partir de ``contexto``; el resto llega con
+    el asunto y los cuerpos ya renderizados.
+    """
+    ESTADO_PENDIENTE = 'pendiente'
+    ESTADO_ENVIADO = 'enviado'
+    ESTADO_FALLIDO = 'fallido'
+    ESTADO_CHOICES = [
+        (ESTADO_PENDIENTE, 'Pendiente'),
+        (ESTADO_ENVIADO, 'Enviado'),
+        (ESTADO_FALLIDO, 'Fallido'),
+    ]
+
+    tipo = models.CharField(max_length=50, verbose_name="Tipo")
+    destinatarios = models.JSONField(default=list, verbose_name="Destinatarios")
+    remitente = models.CharField(max_length=254, blank=True, verbose_name="Remitente")
+    asunto = models.CharField(max_length=255, blank=True, verbose_name="Asunto")
+    contexto = models.JSONField(default=dict, blank=True, verbose_name="Contexto")
+    cuerpo_texto = models.TextField(blank=True, verbose_name="Cuerpo (texto)")
+    cuerpo_html = models.TextField(blank=True, verbose_name="Cuerpo (HTML)")
+
+    estado = models.CharField(
+        max_length=20,
+        choices=ESTADO_CHOICES,
+        default=ESTADO_PENDIENTE,
+        verbose_name="Estado"
+    )
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")
+    proximo_intento = models.DateTimeField(default=timezone.now, verbose_name="Próximo intento")
+    ultimo_error = models.TextField(blank=True, verbose_name="Último error")
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    fecha_envio = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Envío")
+
+    class Meta:
+        verbose_name = "Correo Saliente"
+        verbose_name_plural = "Correos Salientes"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            # Búsqueda de pendientes vencidos del trabajador
+            models.Index(fields=['estado', 'proximo_intento'], name='correo_estado_intento_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} → {', '.join(self.destinatarios)} ({self.estado})"
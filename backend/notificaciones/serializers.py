@@ -1,8 +1,15 @@
 from rest_framework import serializers
-from .models import Notificacion
+from .models import CorreoSaliente, Notificacion
 from users.models import Rol, CustomUser
 
 
+def _total_usuarios(rol):
+    """Usuarios activos del rol; sin consulta si viene anotado (con_destinatarios)"""
+    if hasattr(rol, 'total_usuarios'):
+        return rol.total_usuarios
+    return rol.customuser_set.filter(is_active=True).count()
+
+
 class NotificacionSerializer(serializers.ModelSerializer):
     """
     Serializer para el modelo Notificacion
@@ -13,6 +20,9 @@ class NotificacionSerializer(serializers.ModelSerializer):
     tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
     prioridad_display = serializers.CharField(source='get_prioridad_display', read_only=True)
     creado_por_info = serializers.SerializerMethodField()
+    # Solo presentes en la bandeja del usuario (anotados en bandeja.bandeja)
+    leida_en = serializers.SerializerMethodField()
+    confirmada_en = serializers.SerializerMethodField()
     
     class Meta:
         model = Notificacion
@@ -38,6 +48,8 @@ class NotificacionSerializer(serializers.ModelSerializer):
             'fecha_creacion',
             'fecha_actualizacion',
             'total_destinatarios',
+            'leida_en',
+            'confirmada_en',
         ]
         read_only_fields = [
             'fecha_creacion',
@@ -52,11 +64,17 @@ class NotificacionSerializer(serializers.ModelSerializer):
                 'id': rol.id,
                 'nombre': rol.nombre,
                 'descripcion': rol.descripcion,
-                'total_usuarios': rol.customuser_set.filter(is_active=True).count()
+                'total_usuarios': _total_usuarios(rol)
             }
             for rol in obj.roles_destinatarios.all()
         ]
     
+    def get_leida_en(self, obj):
+        return getattr(obj, 'leida_en', None)
+    
+    def get_confirmada_en(self, obj):
+        return getattr(obj, 'confirmada_en', None)
+    
     def get_creado_por_info(self, obj):
         """Devuelve información del usuario que creó la notificación"""
         if obj.creado_por:
@@ -122,4 +140,19 @@ class RolSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre', 'descripcion', 'total_usuarios']
     
     def get_total_usuarios(self, obj):
-        return obj.customuser_set.filter(is_active=True).count()
\ No newline at end of file
+        return _total_usuarios(obj)
+
+class CorreoSalienteSerializer(serializers.ModelSerializer):
+    """
+    Estado de entrega de un correo de la bandeja de salida. No expone el
+    contexto ni los cuerpos (pueden contener códigos de verificación).
+    """
+    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+
+    class Meta:
+        model = CorreoSaliente
+        fields = [
+            'id', 'tipo', 'destinatarios', 'asunto', 'estado', 'estado_display',
+            'intentos', 'proximo_intento', 'ultimo_error', 'fecha_creacion', 'fecha_envio',
+        ]
+        read_only_fields = fields
@@ -67,4 +67,382 @@ class NotificacionModelTest(TestCase):
         
         estado_info = notificacion.estado_display
         self.assertEqual(estado_info['estado'], 'Programada')
-        self.assertEqual(estado_info['color'], 'blue')
\ No newline at end of file
+        self.assertEqual(estado_info['color'], 'blue')
+
+class BandejaNotificacionesTest(TestCase):
+    def setUp(self):
+        from .bandeja import entregar
+
+        self.rol = Rol.objects.create(nombre='Propietario', descripcion='Propietarios')
+        self.ana = User.objects.create_user(username='ana', email='ana@example.com', rol=self.rol)
+        self.beto = User.objects.create_user(username='beto', email='beto@example.com', rol=self.rol)
+        User.objects.create_user(
+            username='inactivo', email='inactivo@example.com', rol=self.rol, is_active=False
+        )
+        self.notificacion = Notificacion.objects.create(
+            nombre='Corte de agua', descripcion='Mañana de 8 a 12', estado='enviada'
+        )
+        self.notificacion.roles_destinatarios.add(self.rol)
+        self.destinatarios = entregar(self.notificacion)
+
+    def test_entrega_a_usuarios_activos_de_los_roles(self):
+        from .bandeja import entregar
+
+        self.assertEqual(self.destinatarios, 2)
+        # Reenviar no duplica filas
+        entregar(self.notificacion)
+        self.assertEqual(self.notificacion.entregas.count(), 2)
+
+    def test_lectura_por_usuario(self):
+        from .bandeja import contar_no_leidas, marcar_leidas
+
+        self.assertEqual(marcar_leidas(self.ana, [self.notificacion.id]), 1)
+        self.assertEqual(contar_no_leidas(self.ana), 0)
+        self.assertEqual(contar_no_leidas(self.beto), 1)
+        self.notificacion.refresh_from_db()
+        self.assertEqual(self.notificacion.estado, 'enviada')
+
+    def test_retirada_despues_de_entregar_sale_de_la_bandeja(self):
+        from .bandeja import bandeja, contar_no_leidas
+
+        Notificacion.objects.filter(id=self.notificacion.id).update(estado='cancelada')
+        self.assertFalse(bandeja(self.ana).exists())
+        self.assertEqual(contar_no_leidas(self.ana), 0)
+
+    def test_api_bandeja_no_leidas(self):
+        from rest_framework.test import APIClient
+
+        cliente = APIClient()
+        cliente.force_authenticate(user=self.ana)
+        respuesta = cliente.post(f'/api/notificaciones/{self.notificacion.id}/marcar_como_leida/')
+        self.assertEqual(respuesta.status_code, 200)
+
+        respuesta = cliente.get('/api/notificaciones/?usuario_actual=true&no_leidas=true')
+        self.assertEqual(respuesta.data['count'], 0)
+        respuesta = cliente.get('/api/notificaciones/?usuario_actual=true')
+        self.assertIsNotNone(respuesta.data['results'][0]['leida_en'])
+
+        cliente.force_authenticate(user=self.beto)
+        self.assertEqual(cliente.get('/api/notificaciones/no_leidas/').data, {'no_leidas': 1})
+
+
+class DespachoNotificacionesTest(TestCase):
+    def setUp(self):
+        self.rol = Rol.objects.create(nombre='Inquilino', descripcion='Inquilinos')
+        User.objects.create_user(username='carla', email='carla@example.com', rol=self.rol)
+        User.objects.create_user(username='dani', email='dani@example.com', rol=self.rol)
+        self.ahora = timezone.now()
+
+    def _programada(self, nombre, minutos, expiracion=None):
+        notificacion = Notificacion.objects.create(
+            nombre=nombre,
+            descripcion='Aviso programado',
+            estado='programada',
+            fecha_programada=self.ahora + timedelta(minutes=minutos),
+            fecha_expiracion=expiracion,
+        )
+        notificacion.roles_destinatarios.add(self.rol)
+        return notificacion
+
+    def test_despacha_vencidas_y_cancela_expiradas(self):
+        from django.core import mail
+        from .despacho import despachar
+
+        vencida = self._programada('Asamblea', -10)
+        futura = self._programada('Fumigación', 60)
+        expirada = self._programada('Corte de luz', -60, expiracion=self.ahora - timedelta(minutes=5))
+
+        resumen = despachar(tamano_lote=1, ahora=self.ahora, enviar_correos=True)
+
+        self.assertEqual(resumen, {'enviadas': 1, 'expiradas': 1, 'correos': 1})
+        estados = dict(Notificacion.objects.values_list('id', 'estado'))
+        self.assertEqual(estados[vencida.id], 'enviada')
+        self.assertEqual(estados[futura.id], 'programada')
+        self.assertEqual(estados[expirada.id], 'cancelada')
+        self.assertEqual(vencida.entregas.count(), 2)
+        self.assertEqual(expirada.entregas.count(), 0)
+        self.assertEqual(sorted(mail.outbox[0].bcc), ['carla@example.com', 'dani@example.com'])
+
+
+class NotificacionConsultasTest(TestCase):
+    def setUp(self):
+        self.admin_rol = Rol.objects.create(nombre='Admin', descripcion='', es_administrativo=True)
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', rol=self.admin_rol, is_staff=True
+        )
+        self.roles = [
+            Rol.objects.create(nombre=f'Rol {i}', descripcion='') for i in range(3)
+        ]
+        for i, rol in enumerate(self.roles):
+            for j in range(i + 1):
+                User.objects.create_user(username=f'u{i}{j}', email=f'u{i}{j}@example.com', rol=rol)
+
+    def _crear(self, cantidad):
+        for i in range(cantidad):
+            notificacion = Notificacion.objects.create(
+                nombre=f'Aviso {i}', descripcion='Test', creado_por=self.admin
+            )
+            notificacion.roles_destinatarios.set(self.roles)
+
+    def _consultas_listado(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIClient
+
+        cliente = APIClient()
+        cliente.force_authenticate(user=self.admin)
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = cliente.get('/api/notificaciones/')
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta, len(consultas)
+
+    def test_listado_con_consultas_constantes(self):
+        self._crear(2)
+        _, pocas = self._consultas_listado()
+        self._crear(8)
+        respuesta, muchas = self._consultas_listado()
+
+        self.assertEqual(pocas, muchas)
+        fila = respuesta.data['results'][0]
+        self.assertEqual(fila['total_destinatarios'], 6)
+        self.assertEqual(
+            sorted(rol['total_usuarios'] for rol in fila['roles_destinatarios_info']), [1, 2, 3]
+        )
+        self.assertEqual(fila['creado_por_info']['username'], 'admin')
+
+    def test_estadisticas_en_dos_consultas(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIClient
+
+        self._crear(3)
+        Notificacion.objects.create(
+            nombre='Urgente', descripcion='Test', tipo='emergencia', prioridad='urgente',
+            estado='enviada', es_individual=True, activa=False,
+        )
+        cliente = APIClient()
+        cliente.force_authenticate(user=self.admin)
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = cliente.get('/api/notificaciones/estadisticas/')
+
+        self.assertEqual(len(consultas), 2)
+        self.assertEqual(respuesta.data['total'], 4)
+        self.assertEqual(
+            respuesta.data['por_estado'], {'borrador': 3, 'programada': 0, 'enviada': 1, 'cancelada': 0}
+        )
+        self.assertEqual(list(respuesta.data['por_tipo']), [tipo for tipo, _ in Notificacion.TIPO_CHOICES])
+        self.assertEqual(respuesta.data['por_tipo']['emergencia'], 1)
+        self.assertEqual(respuesta.data['por_prioridad']['urgente'], 1)
+        self.assertEqual((respuesta.data['individuales'], respuesta.data['activas']), (1, 3))
+
+
+class EventosTiempoRealTest(TestCase):
+    def test_suscripcion_filtra_por_audiencia(self):
+        import asyncio
+        from functools import partial
+        from core.eventos import Broker, visible_para
+
+        async def escenario():
+            broker = Broker()
+            residente, _, _ = broker.suscribir(partial(visible_para, rol_id=1, administrativo=False))
+            admin, _, _ = broker.suscribir(partial(visible_para, rol_id=2, administrativo=True))
+            broker.publicar({'id': 1, 'tipo': 'notificacion', 'datos': {},
+                             'audiencia': {'roles': [1], 'administrativos': False}})
+            broker.publicar({'id': 2, 'tipo': 'alerta_seguridad', 'datos': {},
+                             'audiencia': {'roles': [], 'administrativos': True}})
+            await asyncio.sleep(0)
+            return residente.cola.qsize(), admin.cola.qsize(), (await residente.cola.get())['id']
+
+        self.assertEqual(asyncio.run(escenario()), (1, 1, 1))
+
+    def test_reconexion_y_desborde(self):
+        import asyncio
+        from core.eventos import Broker
+
+        def evento(i):
+            return {'id': i, 'tipo': 'notificacion', 'datos': {},
+                    'audiencia': {'roles': [1], 'administrativos': False}}
+
+        async def escenario():
+            broker = Broker(tamano_historial=3)
+            for i in range(1, 5):
+                broker.publicar(evento(i))
+            _, pendientes, incompleto = broker.suscribir(lambda e: True, ultimo_id=2)
+            _, _, perdidos = broker.suscribir(lambda e: True, ultimo_id=0)
+
+            lenta, _, _ = broker.suscribir(lambda e: True)
+            for i in range(5, 5 + lenta.cola.maxsize + 1):
+                broker.publicar(evento(i))
+            await asyncio.sleep(0)
+            return [e['id'] for e in pendientes], incompleto, perdidos, lenta.desbordada
+
+        self.assertEqual(asyncio.run(escenario()), ([3, 4], False, True, True))
+
+    def test_entregar_publica_para_los_roles(self):
+        from unittest import mock
+        from .bandeja import entregar
+
+        rol = Rol.objects.create(nombre='Residente', descripcion='Residentes')
+        notificacion = Notificacion.objects.create(nombre='Corte de agua', descripcion='Test')
+        notificacion.roles_destinatarios.set([rol])
+
+        with mock.patch('notificaciones.bandeja.publicar') as publicar:
+            entregar(notificacion)
+        publicar.assert_called_once()
+        self.assertEqual(publicar.call_args.args[0], 'notificacion')
+        self.assertEqual(publicar.call_args.kwargs['roles'], [rol.id])
+
+    def test_endpoint_requiere_asgi(self):
+        from rest_framework.test import APIClient
+
+        respuesta = APIClient().get('/api/eventos/')
+        self.assertEqual(respuesta.status_code, 501)
+
+    def test_ticket_de_un_solo_uso(self):
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        from rest_framework.test import APIClient
+        from core.sse import _autenticar
+
+        self.assertEqual(APIClient().post('/api/eventos/ticket/').status_code, 401)
+
+        rol = Rol.objects.create(nombre='Residente', descripcion='Residentes')
+        usuario = User.objects.create_user(username='eva', email='eva@example.com', rol=rol)
+        cliente = APIClient()
+        cliente.force_authenticate(user=usuario)
+        ticket = cliente.post('/api/eventos/ticket/').data['ticket']
+
+        def abrir(**parametros):
+            request = RequestFactory().get('/api/eventos/', parametros)
+            request.user = AnonymousUser()
+            return _autenticar(request)
+
+        self.assertEqual(abrir(ticket=ticket), (rol.id, False))
+        # Ya usado, o un token JWT en la URL: no autentican
+        self.assertIsNone(abrir(ticket=ticket))
+        self.assertIsNone(abrir(token='cualquiera'))
+
+
+class FalloSMTPBackend:
+    """Backend de correo que siempre falla al enviar (para los reintentos)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def open(self):
+        return False
+
+    def close(self):
+        pass
+
+    def send_messages(self, mensajes):
+        import smtplib
+        raise smtplib.SMTPServerDisconnected('Servidor no disponible')
+
+
+class CorreosSalientesTest(TestCase):
+    def test_verificacion_movil_se_encola_y_se_envia_por_lotes(self):
+        from unittest import mock
+        from django.core import mail
+        from rest_framework.test import APIClient
+        from . import correos
+        from .models import CorreoSaliente
+
+        for i in range(3):
+            User.objects.create_user(username=f'movil{i}', email=f'movil{i}@example.com', is_active=False)
+            respuesta = APIClient().post('/api/admin/mobile/send-code/', {'email': f'movil{i}@example.com'})
+            self.assertEqual(respuesta.status_code, 200)
+
+        # La petición no envía: solo deja el correo pendiente
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(CorreoSaliente.objects.filter(estado='pendiente', tipo='verificacion_movil').count(), 3)
+        codigo = CorreoSaliente.objects.get(destinatarios=['movil0@example.com']).contexto['verification_code']
+
+        with mock.patch('notificaciones.correos.get_connection', wraps=correos.get_connection) as conexion:
+            resumen = correos.enviar_pendientes(tamano_lote=2)
+
+        self.assertEqual(resumen, {'enviados': 3, 'reintentos': 0, 'fallidos': 0})
+        self.assertEqual(conexion.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].subject, 'Código de verificación - MoviFleet')
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        correo = CorreoSaliente.objects.get(destinatarios=['movil0@example.com'])
+        self.assertIn(codigo, mail.outbox[0].body)
+        self.assertEqual((correo.estado, correo.intentos), ('enviado', 1))
+        # El código no queda guardado después del envío
+        self.assertEqual(correo.contexto, {})
+        self.assertIsNotNone(correo.fecha_envio)
+
+    def test_reintentos_con_espera_exponencial(self):
+        from django.test import override_settings
+        from . import correos
+
+        correo = correos.encolar('verificacion_movil', ['ana@example.com'], {'verification_code': '123456'})
+        ahora = correo.proximo_intento
+        with override_settings(EMAIL_BACKEND='notificaciones.tests.FalloSMTPBackend'):
+            for intento in range(1, correos.MAX_INTENTOS):
+                self.assertEqual(correos.enviar_pendientes(ahora=ahora)['reintentos'], 1)
+                correo.refresh_from_db()
+                espera = timedelta(seconds=correos.REINTENTO_BASE * 2 ** (intento - 1))
+                self.assertEqual((correo.estado, correo.intentos), ('pendiente', intento))
+                self.assertEqual(correo.proximo_intento, ahora + espera)
+                self.assertIn('SMTPServerDisconnected', correo.ultimo_error)
+                # Antes de la espera no se vuelve a intentar
+                self.assertEqual(correos.enviar_pendientes(ahora=ahora + espera / 2)['reintentos'], 0)
+                ahora += espera
+
+            self.assertEqual(correos.enviar_pendientes(ahora=ahora)['fallidos'], 1)
+        correo.refresh_from_db()
+        self.assertEqual((correo.estado, correo.intentos), ('fallido', correos.MAX_INTENTOS))
+        self.assertEqual(correo.contexto, {})
+
+    def test_encolar_mensaje_renderizado(self):
+        from django.core import mail
+        from django.core.mail import EmailMultiAlternatives
+        from . import correos
+
+        mensaje = EmailMultiAlternatives('Confirme su email', 'Texto', 'a@example.com', ['b@example.com'])
+        mensaje.attach_alternative('<p>HTML</p>', 'text/html')
+        correos.encolar_mensaje(mensaje, tipo='cuenta:email_confirmation')
+        self.assertEqual(mail.outbox, [])
+
+        correos.enviar_pendientes()
+        enviado = mail.outbox[0]
+        self.assertEqual((enviado.subject, enviado.body, enviado.to), ('Confirme su email', 'Texto', ['b@example.com']))
+        self.assertEqual(enviado.alternatives[0][0], '<p>HTML</p>')
+        self.assertFalse(correos.CorreoSaliente.objects.filter(cuerpo_texto__gt='').exists())
+        self.assertFalse(correos.CorreoSaliente.objects.filter(cuerpo_html__gt='').exists())
+
+    def test_estado_de_entrega_solo_administrativos(self):
+        from rest_framework.test import APIClient
+        from . import correos
+
+        correos.encolar('verificacion_movil', ['ana@example.com'], {'verification_code': '123456'})
+        enviado = correos.encolar('verificacion_movil', ['beto@example.com'], {'verification_code': '654321'})
+        correos.CorreoSaliente.objects.filter(id=enviado.id).update(estado='enviado')
+
+        rol = Rol.objects.create(nombre='Admin', descripcion='', es_administrativo=True)
+        admin = User.objects.create_user(username='admin', email='admin@example.com', rol=rol, is_staff=True)
+        cliente = APIClient()
+        cliente.force_authenticate(user=User.objects.create_user(username='vecino', email='v@example.com'))
+        self.assertEqual(cliente.get('/api/notificaciones/correos/').status_code, 403)
+
+        cliente.force_authenticate(user=admin)
+        respuesta = cliente.get(f'/api/notificaciones/correos/{enviado.id}/')
+        self.assertEqual(respuesta.data['estado'], 'enviado')
+        self.assertNotIn('contexto', respuesta.data)
+        respuesta = cliente.get('/api/notificaciones/correos/', {'estado': 'pendiente'})
+        self.assertEqual([c['destinatarios'] for c in respuesta.data['results']], [['ana@example.com']])
+        respuesta = cliente.get('/api/notificaciones/correos/resumen/')
+        self.assertEqual(respuesta.data['por_estado'], {'pendiente': 1, 'enviado': 1, 'fallido': 0})
+        self.assertEqual(respuesta.data['por_tipo'], {'verificacion_movil': 2})
+
+    def test_estado_de_entrega_requiere_administrador(self):
+        from rest_framework.test import APIClient
+
+        anonimo = APIClient()
+        vecino = APIClient()
+        vecino.force_authenticate(user=User.objects.create_user(username='vecino', email='v@example.com'))
+        for ruta in ('/api/notificaciones/correos/', '/api/notificaciones/correos/resumen/'):
+            self.assertEqual(anonimo.get(ruta).status_code, 401)
+            self.assertEqual(vecino.get(ruta).status_code, 403)
@@ -1,9 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificacionViewSet
+from .views import CorreoSalienteViewSet, NotificacionViewSet
 
 # Router para las rutas del ViewSet
 router = DefaultRouter()
+# Antes que el prefijo vacío, para que 'correos/' no se tome como un id
+router.register(r'correos', CorreoSalienteViewSet, basename='correos')
 router.register(r'', NotificacionViewSet, basename='notificaciones')
 
 urlpatterns = [
@@ -2,11 +2,15 @@ from rest_framework import viewsets, status, filters, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 
-from .models import Notificacion
+from core.conteos import contar
+
+from .bandeja import bandeja, confirmar, contar_no_leidas, entregar, marcar_leidas
+from .models import CorreoSaliente, Notificacion
 from .serializers import (
+    CorreoSalienteSerializer,
     NotificacionSerializer, 
     NotificacionCreateUpdateSerializer,
     RolSerializer
@@ -29,38 +33,26 @@ class NotificacionViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filtrar notificaciones según el usuario y parámetros de consulta"""
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().con_destinatarios()
         user = self.request.user
         
-        # Si NO es administrador, filtrar solo notificaciones dirigidas al usuario
-        if not (user.es_administrativo and user.is_staff):
-            # Solo mostrar notificaciones activas y enviadas
-            queryset = queryset.filter(activa=True, estado='enviada')
-            
-            # Filtrar por roles del usuario actual
-            if user.rol:
-                queryset = queryset.filter(roles_destinatarios=user.rol)
-        
         # Verificar si se solicita sólo las notificaciones del usuario actual
         if self.request.query_params.get('usuario_actual') == 'true':
-            # Filtramos para mostrar las notificaciones según los parámetros
-            
-            # Filtrar por estado
+            # Bandeja del usuario: lectura por usuario, sin join con los roles
             estado = self.request.query_params.get('estado')
-            if estado == 'no_leida':
-                # Mostrar todas excepto las que ya están marcadas como leídas
-                queryset = queryset.exclude(estado='leida')
-            elif estado:
+            solo_no_leidas = (
+                estado == 'no_leida' or self.request.query_params.get('no_leidas') == 'true'
+            )
+            queryset = bandeja(user, solo_no_leidas=solo_no_leidas).con_destinatarios()
+            if estado and estado != 'no_leida':
                 queryset = queryset.filter(estado=estado)
-            
-            # Nuevo filtro para notificaciones no leídas usando parámetro no_leidas
-            no_leidas = self.request.query_params.get('no_leidas')
-            if no_leidas == 'true':
-                queryset = queryset.exclude(estado='leida')
-            
             return queryset
         
-        return queryset.distinct()
+        # Si NO es administrador, solo las notificaciones entregadas al usuario
+        if not (user.es_administrativo and user.is_staff):
+            queryset = queryset.filter(activa=True, estado='enviada', entregas__usuario=user)
+        
+        return queryset
     
     def get_serializer_class(self):
         """Usar diferentes serializers según la acción"""
@@ -74,7 +66,15 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         if not (self.request.user.es_administrativo and self.request.user.is_staff):
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("Solo los administradores pueden crear notificaciones")
-        serializer.save(creado_por=self.request.user)
+        notificacion = serializer.save(creado_por=self.request.user)
+        if notificacion.estado == 'enviada':
+            entregar(notificacion)
+    
+    def perform_update(self, serializer):
+        """Entrega la notificación si queda enviada (solo a quienes aún no la tienen)"""
+        notificacion = serializer.save()
+        if notificacion.estado == 'enviada':
+            entregar(notificacion)
     
     def update(self, request, *args, **kwargs):
         """Solo administradores pueden actualizar notificaciones"""
@@ -95,32 +95,32 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         """
         Devuelve estadísticas de las notificaciones
         """
-        queryset = self.get_queryset()
+        conteos = contar(
+            self.get_queryset(),
+            dimensiones=['estado', 'tipo', 'prioridad'],
+            condiciones={
+                'individuales': Q(es_individual=True),
+                'activas': Q(activa=True),
+            },
+        )
         
         stats = {
-            'total': queryset.count(),
+            'total': conteos['total'],
             'por_estado': {
-                'borrador': queryset.filter(estado='borrador').count(),
-                'programada': queryset.filter(estado='programada').count(),
-                'enviada': queryset.filter(estado='enviada').count(),
-                'cancelada': queryset.filter(estado='cancelada').count(),
+                estado: conteos['estado'].get(estado, 0)
+                for estado in ('borrador', 'programada', 'enviada', 'cancelada')
+            },
+            'por_tipo': {
+                tipo: conteos['tipo'].get(tipo, 0) for tipo, _ in Notificacion.TIPO_CHOICES
             },
-            'por_tipo': {},
             'por_prioridad': {
-                'baja': queryset.filter(prioridad='baja').count(),
-                'normal': queryset.filter(prioridad='normal').count(),
-                'alta': queryset.filter(prioridad='alta').count(),
-                'urgente': queryset.filter(prioridad='urgente').count(),
+                prioridad: conteos['prioridad'].get(prioridad, 0)
+                for prioridad in ('baja', 'normal', 'alta', 'urgente')
             },
-            'individuales': queryset.filter(es_individual=True).count(),
-            'activas': queryset.filter(activa=True).count(),
+            'individuales': conteos['individuales'],
+            'activas': conteos['activas'],
         }
         
-        # Estadísticas por tipo
-        tipos = dict(Notificacion.TIPO_CHOICES)
-        for tipo_key, tipo_name in tipos.items():
-            stats['por_tipo'][tipo_key] = queryset.filter(tipo=tipo_key).count()
-        
         return Response(stats)
     
     @action(detail=False, methods=['get'])
@@ -152,8 +152,12 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         
         notificacion.estado = 'enviada'
         notificacion.save()
+        destinatarios = entregar(notificacion)
         
-        return Response({'message': 'Notificación enviada correctamente'})
+        return Response({
+            'message': 'Notificación enviada correctamente',
+            'destinatarios': destinatarios
+        })
     
     @action(detail=True, methods=['post'])
     def cancelar(self, request, pk=None):
@@ -178,7 +182,9 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         """
         Devuelve los roles disponibles para asignar a notificaciones
         """
-        roles = Rol.objects.all().order_by('nombre')
+        roles = Rol.objects.annotate(
+            total_usuarios=Count('customuser', filter=Q(customuser__is_active=True))
+        ).order_by('nombre')
         serializer = RolSerializer(roles, many=True)
         return Response(serializer.data)
     
@@ -188,15 +194,39 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         Marcar una notificación como leída para el usuario actual
         """
         notificacion = self.get_object()
-        
-        # Actualizar el estado a "leida"
-        notificacion.estado = 'leida'
-        notificacion.save()
+        marcar_leidas(request.user, [notificacion.id])
         
         return Response({
             'message': 'Notificación marcada como leída correctamente',
             'notificacion_id': notificacion.id
         })
+    
+    @action(detail=False, methods=['post'])
+    def marcar_todas_leidas(self, request):
+        """
+        Marcar como leídas todas las notificaciones del usuario actual
+        """
+        return Response({'marcadas': marcar_leidas(request.user)})
+    
+    @action(detail=True, methods=['post'])
+    def confirmar_lectura(self, request, pk=None):
+        """
+        Confirmar la lectura de una notificación que lo requiere
+        """
+        notificacion = self.get_object()
+        confirmar(request.user, notificacion.id)
+        
+        return Response({
+            'message': 'Lectura confirmada correctamente',
+            'notificacion_id': notificacion.id
+        })
+    
+    @action(detail=False, methods=['get'])
+    def no_leidas(self, request):
+        """
+        Cantidad de notificaciones no leídas del usuario actual
+        """
+        return Response({'no_leidas': contar_no_leidas(request.user)})
         
     @action(detail=False, methods=['get'])
     def usuarios_por_rol(self, request):
@@ -250,46 +280,45 @@ class NotificacionViewSet(viewsets.ModelViewSet):
         """
         Endpoint específico para residentes - obtener sus notificaciones
         """
-        try:
-            # Obtener el residente asociado al usuario
-            if hasattr(request.user, 'residente_profile'):
-                residente = request.user.residente_profile
-                
-                # Filtrar notificaciones que incluyan al residente
-                # Primero obtenemos el rol correspondiente al tipo de residente
-                from users.models import Rol
-                try:
-                    rol_residente = Rol.objects.get(nombre=residente.tipo)
-                    queryset = Notificacion.objects.filter(
-                        roles_destinatarios=rol_residente
-                    ).distinct()
-                except Rol.DoesNotExist:
-                    # Si no existe el rol, mostrar todas las notificaciones generales
-                    queryset = Notificacion.objects.filter(
-                        es_individual=False
-                    ).distinct()
-                
-                # Aplicar filtros adicionales
-                estado = request.query_params.get('estado')
-                if estado == 'no_leida':
-                    queryset = queryset.exclude(estado='leida')
-                elif estado:
-                    queryset = queryset.filter(estado=estado)
-                
-                no_leidas = request.query_params.get('no_leidas')
-                if no_leidas == 'true':
-                    queryset = queryset.exclude(estado='leida')
-                
-                # Serializar y devolver
-                serializer = NotificacionSerializer(queryset, many=True)
-                return Response(serializer.data)
-            else:
-                return Response(
-                    {'error': 'Usuario no tiene perfil de residente'}, 
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except Exception as e:
+        if not hasattr(request.user, 'residente_profile'):
             return Response(
-                {'error': str(e)}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+                {'error': 'Usuario no tiene perfil de residente'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Bandeja del usuario, con los mismos filtros de estado
+        estado = request.query_params.get('estado')
+        solo_no_leidas = estado == 'no_leida' or request.query_params.get('no_leidas') == 'true'
+        queryset = bandeja(request.user, solo_no_leidas=solo_no_leidas).con_destinatarios().order_by(
+            '-fecha_entrega'
+        )
+        if estado and estado != 'no_leida':
+            queryset = queryset.filter(estado=estado)
+        
+        serializer = NotificacionSerializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class CorreoSalienteViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Estado de entrega de los correos de la bandeja de salida (solo lectura,
+    para el panel administrativo)
+    """
+    queryset = CorreoSaliente.objects.all()
+    serializer_class = CorreoSalienteSerializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminPortalUser]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['estado', 'tipo']
+    search_fields = ['destinatarios', 'asunto']
+    ordering_fields = ['fecha_creacion', 'fecha_envio', 'proximo_intento', 'intentos']
+    ordering = ['-fecha_creacion']
+
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        """Cantidad de correos por estado y tipo"""
+        conteos = contar(self.filter_queryset(self.get_queryset()), dimensiones=['estado', 'tipo'])
+        return Response({
+            'total': conteos['total'],
+            'por_estado': conteos['estado'],
+            'por_tipo': conteos['tipo'],
+        })
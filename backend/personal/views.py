@@ -6,6 +6,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
 from django.utils import timezone
 from bitacora.utils import registrar_bitacora
+from core.importacion import Importador, importar_archivo
 from .models import Personal
 from .serializers import (
     PersonalSerializer,
@@ -14,6 +15,20 @@ from .serializers import (
     PersonalEstadoSerializer
 )
 
+IMPORTADOR = Importador(
+    Personal,
+    clave="ci",
+    campos=[
+        "ci", "nombre", "apellido", "fecha_nacimiento", "telefono", "email",
+        "codigo_empleado", "fecha_ingreso", "estado", "telefono_emergencia",
+        "contacto_emergencia",
+    ],
+    obligatorias=[
+        "nombre", "apellido", "fecha_nacimiento", "telefono", "email",
+        "codigo_empleado", "fecha_ingreso",
+    ],
+)
+
 
 class PersonalViewSet(viewsets.ModelViewSet):
     """ViewSet para el CRUD de personal - Refactorizado"""
@@ -158,6 +173,16 @@ class PersonalViewSet(viewsets.ModelViewSet):
 
         return Response(stats)
 
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        """Alta o actualización masiva de personal por CI desde CSV o XLSX"""
+        if not request.user.tiene_permiso("gestionar_personal"):
+            return Response(
+                {"error": "No tienes permisos para importar personal"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return importar_archivo(request, IMPORTADOR, "personal", "PERSONAL")
+
     @action(detail=False, methods=["get"])
     def disponibles_para_usuario(self, request):
         """Lista personal disponible para vincular con usuarios"""
@@ -1,15 +1,46 @@
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Sum
-from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import datetime
-from bitacora.utils import registrar_bitacora
+from bitacora.utils import registrar_bitacora, registrar_bitacora_lote
+from core.exportacion import exportar_queryset
+from .disponibilidad import disponibilidad as calcular_disponibilidad
+from .estadisticas import calcular_estadisticas
 from .models import Reserva
+from .recurrencia import crear_reservas
+from .serializers import ReservaAprobacionLoteSerializer, ReservaMultipleSerializer
+from .transiciones import DECISIONES, decidir_lote
 from areas_comunes.models import AreaComun
 
 
+COLUMNAS_EXPORTACION = [
+    ('id', 'id'),
+    ('area_comun', 'area_comun__nombre'),
+    ('residente_nombre', 'residente__nombre'),
+    ('residente_apellido', 'residente__apellido'),
+    ('fecha_reserva', 'fecha_reserva'),
+    ('hora_inicio', 'hora_inicio'),
+    ('hora_fin', 'hora_fin'),
+    ('tipo_reserva', 'tipo_reserva'),
+    ('estado', 'estado'),
+    ('numero_personas', 'numero_personas'),
+    ('costo_total', 'costo_total'),
+    ('motivo', 'motivo'),
+    ('fecha_creacion', 'fecha_creacion'),
+    ('fecha_aprobacion', 'fecha_aprobacion'),
+]
+
+# Rango máximo de la consulta de disponibilidad (una vista mensual)
+MAX_DIAS_DISPONIBILIDAD = 62
+
+
+def _parse_fecha_param(request, parametro):
+    """Lee un parámetro de fecha YYYY-MM-DD opcional (ValueError si es inválido)"""
+    valor = request.query_params.get(parametro)
+    return datetime.strptime(valor, '%Y-%m-%d').date() if valor else None
+
+
 def add_reserva_actions(viewset_class):
     """Agrega las acciones personalizadas al ViewSet de reservas"""
     
@@ -134,6 +165,84 @@ def add_reserva_actions(viewset_class):
         serializer = self.get_serializer(reserva)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def decision_lote(self, request):
+        """
+        Aprueba o rechaza varias reservas pendientes con un solo UPDATE.
+        Cuerpo: ids, accion (aprobar|rechazar) y observaciones (opcional).
+        """
+        if not request.user.is_staff:
+            return Response(
+                {'error': 'Solo los administradores pueden aprobar o rechazar reservas'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = ReservaAprobacionLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        accion = serializer.validated_data['accion']
+        
+        resultados = decidir_lote(
+            self.get_queryset(),
+            serializer.validated_data['ids'],
+            accion,
+            request.user,
+            serializer.validated_data.get('observaciones', ''),
+        )
+        
+        _, resultado, accion_bitacora = DECISIONES[accion]
+        procesadas = [r['id'] for r in resultados if r['resultado'] == resultado]
+        registrar_bitacora_lote(
+            [(accion_bitacora, f"Reserva {reserva_id} {resultado}") for reserva_id in procesadas],
+            modulo="RESERVAS",
+            usuario=request.user,
+            request=request,
+        )
+        
+        return Response({'procesadas': len(procesadas), 'resultados': resultados})
+    
+    @action(detail=False, methods=['post'])
+    def multiples(self, request):
+        """
+        Crea varias reservas con el mismo horario a partir de una lista de
+        fechas o de una regla de recurrencia. Retorna el resultado por fecha.
+        """
+        serializer = ReservaMultipleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = dict(serializer.validated_data)
+        fechas = datos.pop('fechas')
+        omitir_conflictos = datos.pop('omitir_conflictos')
+        
+        # Los residentes solo pueden reservar a su nombre
+        if hasattr(request.user, 'residente_profile'):
+            datos['residente'] = request.user.residente_profile
+        elif not request.user.is_staff or not datos.get('residente'):
+            return Response(
+                {'error': 'Debe especificar el residente de las reservas'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        creadas, resultados = crear_reservas(datos, fechas, omitir_conflictos)
+        
+        if creadas:
+            registrar_bitacora(
+                request=request,
+                usuario=request.user,
+                accion="Crear Reservas Múltiples",
+                descripcion=f"{len(creadas)} reservas creadas para {datos['area_comun'].nombre}",
+                modulo="RESERVAS"
+            )
+        
+        return Response(
+            {
+                'creadas': len(creadas),
+                'resultados': [
+                    {**resultado, 'fecha': resultado['fecha'].isoformat()}
+                    for resultado in resultados
+                ],
+            },
+            status=status.HTTP_201_CREATED if creadas else status.HTTP_409_CONFLICT
+        )
+    
     @action(detail=False, methods=['get'])
     def mis_reservas(self, request):
         """Lista las reservas del usuario actual"""
@@ -206,6 +315,50 @@ def add_reserva_actions(viewset_class):
         
         return Response(areas_disponibles)
     
+    @action(detail=False, methods=['get'])
+    def disponibilidad(self, request):
+        """
+        Slots libres por área para un rango de fechas.
+        Parámetros: fecha_inicio, fecha_fin (opcional), areas (ids separados
+        por coma, opcional) e intervalo en minutos (por defecto 60).
+        """
+        try:
+            fecha_inicio = datetime.strptime(request.query_params.get('fecha_inicio', ''), '%Y-%m-%d').date()
+            fecha_fin = datetime.strptime(
+                request.query_params.get('fecha_fin') or fecha_inicio.isoformat(), '%Y-%m-%d'
+            ).date()
+        except ValueError:
+            return Response(
+                {'error': 'Debe especificar fecha_inicio (y opcionalmente fecha_fin) en formato YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if fecha_fin < fecha_inicio or (fecha_fin - fecha_inicio).days + 1 > MAX_DIAS_DISPONIBILIDAD:
+            return Response(
+                {'error': f'El rango de fechas debe ser válido y de máximo {MAX_DIAS_DISPONIBILIDAD} días'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            intervalo = int(request.query_params.get('intervalo', 60))
+            area_ids = [int(a) for a in request.query_params.get('areas', '').split(',') if a.strip()]
+        except ValueError:
+            return Response(
+                {'error': 'intervalo y areas deben ser números enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 5 <= intervalo <= 24 * 60:
+            return Response(
+                {'error': 'El intervalo debe estar entre 5 y 1440 minutos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        areas = AreaComun.objects.filter(estado=AreaComun.ESTADO_ACTIVO).only('id', 'nombre', 'monto_hora')
+        if area_ids:
+            areas = areas.filter(id__in=area_ids)
+        
+        return Response(calcular_disponibilidad(list(areas), fecha_inicio, fecha_fin, intervalo))
+    
     @action(detail=False, methods=['get'])
     def estadisticas(self, request):
         """Estadísticas de reservas"""
@@ -215,44 +368,17 @@ def add_reserva_actions(viewset_class):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Estadísticas básicas
-        total_reservas = Reserva.objects.count()
-        reservas_pendientes = Reserva.objects.filter(estado=Reserva.ESTADO_PENDIENTE).count()
-        reservas_confirmadas = Reserva.objects.filter(estado=Reserva.ESTADO_CONFIRMADA).count()
-        reservas_canceladas = Reserva.objects.filter(estado=Reserva.ESTADO_CANCELADA).count()
-        reservas_completadas = Reserva.objects.filter(estado=Reserva.ESTADO_COMPLETADA).count()
-        reservas_rechazadas = Reserva.objects.filter(estado=Reserva.ESTADO_RECHAZADA).count()
-        
-        # Ingresos totales
-        ingresos_totales = Reserva.objects.aggregate(
-            total=Sum('costo_total')
-        )['total'] or 0
-        
-        # Reservas por mes (últimos 12 meses)
-        reservas_por_mes = Reserva.objects.annotate(
-            mes=TruncMonth('fecha_creacion')
-        ).values('mes').annotate(
-            count=Count('id')
-        ).order_by('mes')[:12]
-        
-        # Áreas más populares
-        areas_populares = Reserva.objects.values(
-            'area_comun__nombre'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count')[:5]
-        
-        estadisticas = {
-            'total_reservas': total_reservas,
-            'reservas_pendientes': reservas_pendientes,
-            'reservas_confirmadas': reservas_confirmadas,
-            'reservas_canceladas': reservas_canceladas,
-            'reservas_completadas': reservas_completadas,
-            'reservas_rechazadas': reservas_rechazadas,
-            'ingresos_totales': ingresos_totales,
-            'reservas_por_mes': list(reservas_por_mes),
-            'areas_mas_populares': list(areas_populares),
-        }
+        try:
+            fecha_desde = _parse_fecha_param(request, 'fecha_desde')
+            fecha_hasta = _parse_fecha_param(request, 'fecha_hasta')
+            area_comun_id = int(request.query_params.get('area_comun') or 0) or None
+        except ValueError:
+            return Response(
+                {'error': 'Filtros inválidos. Use fechas YYYY-MM-DD y el id numérico del área'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        estadisticas = calcular_estadisticas(fecha_desde, fecha_hasta, area_comun_id)
         
         from .serializers import ReservaEstadisticasSerializer
         serializer = ReservaEstadisticasSerializer(estadisticas)
@@ -270,14 +396,24 @@ def add_reserva_actions(viewset_class):
         serializer = self.get_serializer(proximas_reservas, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta las reservas con los mismos filtros del listado (CSV o NDJSON)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(request, queryset, COLUMNAS_EXPORTACION, 'reservas')
+    
     # Agregar los métodos al ViewSet
     viewset_class.aprobar = aprobar
     viewset_class.rechazar = rechazar
     viewset_class.cancelar = cancelar
     viewset_class.completar = completar
+    viewset_class.decision_lote = decision_lote
+    viewset_class.multiples = multiples
     viewset_class.mis_reservas = mis_reservas
     viewset_class.disponibles = disponibles
+    viewset_class.disponibilidad = disponibilidad
     viewset_class.estadisticas = estadisticas
     viewset_class.proximas = proximas
+    viewset_class.exportar = exportar
     
     return viewset_class
@@ -3,6 +3,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
 from .models import Reserva
+from .transiciones import cambiar_estado
 
 
 @admin.register(Reserva)
@@ -38,6 +39,7 @@ class ReservaAdmin(admin.ModelAdmin):
     readonly_fields = [
         'fecha_creacion',
         'fecha_actualizacion',
+        'tarifa_hora',
         'costo_total',
         'duracion_horas',
         'puede_cancelar',
@@ -61,6 +63,7 @@ class ReservaAdmin(admin.ModelAdmin):
         ('Estado y Control', {
             'fields': (
                 'estado',
+                'tarifa_hora',
                 'costo_total',
                 'duracion_horas',
                 'puede_cancelar',
@@ -132,10 +135,12 @@ class ReservaAdmin(admin.ModelAdmin):
     
     def aprobar_reservas(self, request, queryset):
         """Aprueba las reservas seleccionadas"""
-        reservas_aprobadas = 0
-        for reserva in queryset.filter(estado=Reserva.ESTADO_PENDIENTE):
-            reserva.aprobar(request.user)
-            reservas_aprobadas += 1
+        reservas_aprobadas = len(cambiar_estado(
+            queryset.filter(estado=Reserva.ESTADO_PENDIENTE),
+            Reserva.ESTADO_CONFIRMADA,
+            administrador_aprobacion=request.user,
+            fecha_aprobacion=timezone.now(),
+        ))
         
         self.message_user(
             request,
@@ -145,10 +150,13 @@ class ReservaAdmin(admin.ModelAdmin):
     
     def rechazar_reservas(self, request, queryset):
         """Rechaza las reservas seleccionadas"""
-        reservas_rechazadas = 0
-        for reserva in queryset.filter(estado=Reserva.ESTADO_PENDIENTE):
-            reserva.rechazar(request.user, "Rechazada desde admin")
-            reservas_rechazadas += 1
+        reservas_rechazadas = len(cambiar_estado(
+            queryset.filter(estado=Reserva.ESTADO_PENDIENTE),
+            Reserva.ESTADO_RECHAZADA,
+            administrador_aprobacion=request.user,
+            fecha_aprobacion=timezone.now(),
+            observaciones_admin="Rechazada desde admin",
+        ))
         
         self.message_user(
             request,
@@ -158,10 +166,11 @@ class ReservaAdmin(admin.ModelAdmin):
     
     def cancelar_reservas(self, request, queryset):
         """Cancela las reservas seleccionadas"""
-        reservas_canceladas = 0
-        for reserva in queryset.filter(estado__in=[Reserva.ESTADO_PENDIENTE, Reserva.ESTADO_CONFIRMADA]):
-            reserva.cancelar("Cancelada desde admin")
-            reservas_canceladas += 1
+        reservas_canceladas = len(cambiar_estado(
+            queryset.filter(estado__in=Reserva.ESTADOS_ACTIVOS),
+            Reserva.ESTADO_CANCELADA,
+            observaciones_admin="Cancelada desde admin",
+        ))
         
         self.message_user(
             request,
@@ -171,10 +180,10 @@ class ReservaAdmin(admin.ModelAdmin):
     
     def completar_reservas(self, request, queryset):
         """Marca como completadas las reservas seleccionadas"""
-        reservas_completadas = 0
-        for reserva in queryset.filter(estado=Reserva.ESTADO_CONFIRMADA):
-            reserva.completar()
-            reservas_completadas += 1
+        reservas_completadas = len(cambiar_estado(
+            queryset.filter(estado=Reserva.ESTADO_CONFIRMADA),
+            Reserva.ESTADO_COMPLETADA,
+        ))
         
         self.message_user(
             request,
@@ -0,0 +1,99 @@
+"""
+Transiciones automáticas del ciclo de vida de las reservas.
+
+- CONFIRMADA cuya hora de fin ya pasó → COMPLETADA.
+- PENDIENTE cuya hora de inicio ya pasó sin aprobación → CANCELADA.
+
+Cada lote selecciona ids con ``FOR UPDATE SKIP LOCKED``, los actualiza con un
+único ``UPDATE ... WHERE id IN (...)`` y registra las transiciones en la
+bitácora con un solo INSERT. La ejecución completa se protege con un bloqueo
+consultivo para que dos instancias del comando no trabajen a la vez.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bitacora.utils import registrar_bitacora_lote
+from core.bloqueos import bloqueo_consultivo
+from core.dashboard import invalidar_modelo
+
+from .disponibilidad import invalidar_disponibilidad
+from .estadisticas import invalidar_estadisticas
+from .models import Reserva
+
+NOMBRE_BLOQUEO = "reservas.ciclo_vida"
+TAMANO_LOTE = 500
+
+
+def _vencidas(estado, campo_hora, ahora):
+    """Reservas en ``estado`` cuya fecha + ``campo_hora`` es anterior a ahora"""
+    hoy = ahora.date()
+    return Reserva.objects.filter(
+        Q(fecha_reserva__lt=hoy) | Q(fecha_reserva=hoy, **{f'{campo_hora}__lte': ahora.time()}),
+        estado=estado,
+    )
+
+
+TRANSICIONES = [
+    # (estado actual, campo de hora que marca el vencimiento, nuevo estado, acción de bitácora)
+    (Reserva.ESTADO_CONFIRMADA, 'hora_fin', Reserva.ESTADO_COMPLETADA, "Completar Reserva"),
+    (Reserva.ESTADO_PENDIENTE, 'hora_inicio', Reserva.ESTADO_CANCELADA, "Cancelar Reserva Vencida"),
+]
+
+
+def _procesar_lote(estado, campo_hora, nuevo_estado, accion, ahora, tamano_lote):
+    with transaction.atomic():
+        filas = list(
+            _vencidas(estado, campo_hora, ahora)
+            .order_by('fecha_reserva', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', 'area_comun_id', 'fecha_reserva')[:tamano_lote]
+        )
+        if not filas:
+            return filas
+
+        ids = [reserva_id for reserva_id, _, _ in filas]
+        Reserva.objects.filter(id__in=ids, estado=estado).update(
+            estado=nuevo_estado,
+            fecha_actualizacion=ahora,
+        )
+        registrar_bitacora_lote(
+            [
+                (accion, f"Reserva {reserva_id} pasó de {estado} a {nuevo_estado} automáticamente")
+                for reserva_id in ids
+            ],
+            modulo="RESERVAS",
+        )
+        # update() no emite señales: invalidar las cachés a mano
+        pares = [(area_id, fecha) for _, area_id, fecha in filas]
+        transaction.on_commit(lambda: invalidar_disponibilidad(pares))
+        transaction.on_commit(invalidar_estadisticas)
+        invalidar_modelo(Reserva)
+    return filas
+
+
+def procesar_ciclo_vida(tamano_lote=TAMANO_LOTE, simular=False, ahora=None):
+    """
+    Aplica las transiciones pendientes por lotes.
+    Retorna {nuevo_estado: cantidad}, o None si otra ejecución tiene el bloqueo.
+    En modo ``simular`` solo cuenta las reservas que cambiarían.
+    """
+    ahora = ahora or timezone.now()
+    with bloqueo_consultivo(NOMBRE_BLOQUEO) as obtenido:
+        if not obtenido:
+            return None
+
+        resumen = {}
+        for estado, campo_hora, nuevo_estado, accion in TRANSICIONES:
+            if simular:
+                resumen[nuevo_estado] = _vencidas(estado, campo_hora, ahora).count()
+                continue
+            total = 0
+            while True:
+                filas = _procesar_lote(estado, campo_hora, nuevo_estado, accion, ahora, tamano_lote)
+                total += len(filas)
+                if len(filas) < tamano_lote:
+                    break
+            resumen[nuevo_estado] = total
+        return resumen
@@ -0,0 +1,164 @@
+"""
+Cálculo de disponibilidad de áreas comunes.
+
+Para cada (área, fecha) se calculan los bloques libres dentro del horario de
+apertura: una sola consulta trae los intervalos ocupados ordenados por área,
+fecha y hora de inicio, y un barrido lineal los fusiona y obtiene los huecos.
+
+Los bloques libres se guardan en caché por (área, fecha); los slots de la
+granularidad pedida se derivan de ellos en cada respuesta. La caché se
+invalida desde reservas.signals cuando una reserva se guarda o elimina.
+"""
+
+from datetime import time, timedelta
+
+from django.conf import settings
+
+from core.cache import espacio
+
+from .models import Reserva
+
+CACHE = espacio("reservas:disponibilidad")
+
+
+def clave_cache(area_id, fecha):
+    return f"{area_id}:{fecha.isoformat()}"
+
+
+def invalidar_disponibilidad(pares):
+    """Invalida la caché de los pares (area_id, fecha) indicados"""
+    claves = {clave_cache(area_id, fecha) for area_id, fecha in pares if area_id and fecha}
+    CACHE.delete_many(claves)
+
+
+def _a_minutos(hora, redondear_arriba=False):
+    minutos = hora.hour * 60 + hora.minute
+    if redondear_arriba and (hora.second or hora.microsecond):
+        minutos += 1
+    return minutos
+
+
+def _a_hora(minutos):
+    if minutos >= 24 * 60:
+        return "24:00"
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def horario_apertura():
+    """Retorna (apertura, cierre) en minutos desde la medianoche"""
+    apertura = time.fromisoformat(settings.RESERVAS_HORA_APERTURA)
+    cierre = time.fromisoformat(settings.RESERVAS_HORA_CIERRE)
+    return _a_minutos(apertura), _a_minutos(cierre) or 24 * 60
+
+
+def bloques_libres(ocupados, apertura, cierre):
+    """
+    Barrido sobre intervalos ocupados (inicio, fin) en minutos, ordenados por
+    inicio. Retorna los bloques libres [inicio, fin) dentro de la apertura.
+    """
+    libres = []
+    cursor = apertura
+    for inicio, fin in ocupados:
+        if fin <= cursor:
+            continue
+        if inicio >= cierre:
+            break
+        if inicio > cursor:
+            libres.append((cursor, inicio))
+        cursor = max(cursor, fin)
+    if cursor < cierre:
+        libres.append((cursor, cierre))
+    return libres
+
+
+def dividir_en_slots(libres, intervalo, apertura):
+    """
+    Divide los bloques libres en slots de ``intervalo`` minutos alineados con
+    la hora de apertura. Solo se incluyen slots completamente libres.
+    """
+    slots = []
+    for inicio, fin in libres:
+        # Primer múltiplo del intervalo (desde la apertura) dentro del bloque
+        desfase = (inicio - apertura) % intervalo
+        actual = inicio if desfase == 0 else inicio + intervalo - desfase
+        while actual + intervalo <= fin:
+            slots.append((actual, actual + intervalo))
+            actual += intervalo
+    return slots
+
+
+def _fechas(fecha_inicio, fecha_fin):
+    fecha = fecha_inicio
+    while fecha <= fecha_fin:
+        yield fecha
+        fecha += timedelta(days=1)
+
+
+def calcular_libres(area_ids, fecha_inicio, fecha_fin):
+    """
+    Retorna {(area_id, fecha): [(inicio, fin), ...]} con los bloques libres,
+    usando la caché y consultando solo los pares que faltan.
+    """
+    pares = [(area_id, fecha) for area_id in area_ids for fecha in _fechas(fecha_inicio, fecha_fin)]
+    claves = {clave_cache(area_id, fecha): (area_id, fecha) for area_id, fecha in pares}
+    en_cache = CACHE.get_many(claves)
+    resultado = {claves[clave]: valor for clave, valor in en_cache.items()}
+
+    faltantes = [par for par in pares if par not in resultado]
+    if not faltantes:
+        return resultado
+
+    areas_faltantes = {area_id for area_id, _ in faltantes}
+    fechas_faltantes = [fecha for _, fecha in faltantes]
+    ocupados = Reserva.objects.filter(
+        area_comun_id__in=areas_faltantes,
+        fecha_reserva__gte=min(fechas_faltantes),
+        fecha_reserva__lte=max(fechas_faltantes),
+        estado__in=Reserva.ESTADOS_ACTIVOS,
+    ).order_by('area_comun_id', 'fecha_reserva', 'hora_inicio').values_list(
+        'area_comun_id', 'fecha_reserva', 'hora_inicio', 'hora_fin'
+    )
+
+    intervalos = {}
+    for area_id, fecha, hora_inicio, hora_fin in ocupados:
+        intervalos.setdefault((area_id, fecha), []).append(
+            (_a_minutos(hora_inicio), _a_minutos(hora_fin, redondear_arriba=True))
+        )
+
+    apertura, cierre = horario_apertura()
+    nuevos = {}
+    for par in faltantes:
+        libres = bloques_libres(intervalos.get(par, []), apertura, cierre)
+        resultado[par] = libres
+        nuevos[clave_cache(*par)] = libres
+    CACHE.set_many(nuevos, timeout=settings.RESERVAS_DISPONIBILIDAD_CACHE_TTL)
+    return resultado
+
+
+def disponibilidad(areas, fecha_inicio, fecha_fin, intervalo):
+    """
+    Arma la respuesta de disponibilidad: por cada área y fecha, los slots
+    libres de ``intervalo`` minutos.
+    """
+    libres = calcular_libres([area.id for area in areas], fecha_inicio, fecha_fin)
+    apertura, _ = horario_apertura()
+
+    respuesta = []
+    for area in areas:
+        dias = []
+        for fecha in _fechas(fecha_inicio, fecha_fin):
+            slots = dividir_en_slots(libres[(area.id, fecha)], intervalo, apertura)
+            dias.append({
+                'fecha': fecha.isoformat(),
+                'disponible': bool(slots),
+                'slots': [
+                    {'inicio': _a_hora(inicio), 'fin': _a_hora(fin)} for inicio, fin in slots
+                ],
+            })
+        respuesta.append({
+            'id': area.id,
+            'nombre': area.nombre,
+            'monto_hora': area.monto_hora,
+            'dias': dias,
+        })
+    return respuesta
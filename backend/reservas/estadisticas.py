@@ -0,0 +1,88 @@
+"""
+Estadísticas de reservas.
+
+Se resuelven con dos consultas: una agregación condicional para los totales
+por estado e ingresos, y una agregación agrupada por (mes, área) de la que se
+derivan tanto las reservas por mes como las áreas más populares.
+
+Los resultados se guardan en caché por combinación de filtros. Cualquier
+escritura de reservas incrementa una versión global que invalida todas las
+combinaciones a la vez (espacio de caché versionado, ver reservas.signals).
+"""
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from core.cache import espacio
+
+from .models import Reserva
+
+CACHE = espacio("reservas:estadisticas", versionado=True)
+TTL_CACHE = 60 * 15
+MESES_HISTORIAL = 12
+MAX_AREAS_POPULARES = 5
+
+
+def invalidar_estadisticas():
+    """Invalida todas las estadísticas en caché"""
+    CACHE.invalidar()
+
+
+def _clave_cache(fecha_desde, fecha_hasta, area_comun_id):
+    return f"{fecha_desde}:{fecha_hasta}:{area_comun_id}"
+
+
+def calcular_estadisticas(fecha_desde=None, fecha_hasta=None, area_comun_id=None):
+    """
+    Estadísticas de las reservas cuya fecha_reserva está en el rango indicado
+    (ambos extremos opcionales e inclusivos), opcionalmente de una sola área.
+    """
+    clave = _clave_cache(fecha_desde, fecha_hasta, area_comun_id)
+    estadisticas = CACHE.get(clave)
+    if estadisticas is not None:
+        return estadisticas
+
+    reservas = Reserva.objects.all()
+    if fecha_desde:
+        reservas = reservas.filter(fecha_reserva__gte=fecha_desde)
+    if fecha_hasta:
+        reservas = reservas.filter(fecha_reserva__lte=fecha_hasta)
+    if area_comun_id:
+        reservas = reservas.filter(area_comun_id=area_comun_id)
+
+    totales = reservas.order_by().aggregate(
+        total_reservas=Count('id'),
+        reservas_pendientes=Count('id', filter=Q(estado=Reserva.ESTADO_PENDIENTE)),
+        reservas_confirmadas=Count('id', filter=Q(estado=Reserva.ESTADO_CONFIRMADA)),
+        reservas_canceladas=Count('id', filter=Q(estado=Reserva.ESTADO_CANCELADA)),
+        reservas_completadas=Count('id', filter=Q(estado=Reserva.ESTADO_COMPLETADA)),
+        reservas_rechazadas=Count('id', filter=Q(estado=Reserva.ESTADO_RECHAZADA)),
+        ingresos_totales=Sum('costo_total'),
+    )
+    totales['ingresos_totales'] = totales['ingresos_totales'] or 0
+
+    agrupado = reservas.annotate(mes=TruncMonth('fecha_reserva')).values(
+        'mes', 'area_comun__nombre'
+    ).annotate(count=Count('id')).order_by()
+
+    por_mes = {}
+    por_area = {}
+    for fila in agrupado:
+        por_mes[fila['mes']] = por_mes.get(fila['mes'], 0) + fila['count']
+        nombre = fila['area_comun__nombre']
+        por_area[nombre] = por_area.get(nombre, 0) + fila['count']
+
+    # Los últimos 12 meses con reservas, en orden cronológico
+    meses = sorted(por_mes)[-MESES_HISTORIAL:]
+    areas = sorted(por_area.items(), key=lambda item: (-item[1], item[0]))
+
+    estadisticas = {
+        **totales,
+        'reservas_por_mes': [{'mes': mes, 'count': por_mes[mes]} for mes in meses],
+        'areas_mas_populares': [
+            {'area_comun__nombre': nombre, 'count': count}
+            for nombre, count in areas[:MAX_AREAS_POPULARES]
+        ],
+    }
+    CACHE.set(clave, estadisticas, timeout=TTL_CACHE)
+    return estadisticas
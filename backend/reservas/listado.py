@@ -0,0 +1,137 @@
+"""
+Representación rápida del listado de reservas.
+
+Produce exactamente la misma salida que ``ReservaListSerializer``, pero a
+partir de una proyección ``.values()`` con los campos calculados resueltos en
+la base de datos (duración, permisos de cancelación/modificación, estado del
+usuario del residente). No se instancian modelos ni serializers anidados.
+"""
+
+from django.db.models import BooleanField, Case, CharField, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Concat, Extract, Trim
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Reserva
+
+# Campos DRF reutilizados solo para dar formato (fechas, decimales)
+_FECHA = serializers.DateField()
+_HORA = serializers.TimeField()
+_FECHA_HORA = serializers.DateTimeField()
+_DECIMAL = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+CAMPOS_AREA = {
+    'id': 'area_comun_id',
+    'nombre': 'area_comun__nombre',
+    'monto_hora': 'area_comun__monto_hora',
+    'estado': 'area_comun__estado',
+    'created_at': 'area_comun__created_at',
+    'updated_at': 'area_comun__updated_at',
+}
+
+CAMPOS_RESIDENTE = {
+    'id': 'residente_id',
+    'usuario': 'residente__usuario_id',
+    'username': 'residente__usuario__username',
+    'nombre': 'residente__nombre',
+    'apellido': 'residente__apellido',
+    'ci': 'residente__ci',
+    'email': 'residente__email',
+    'telefono': 'residente__telefono',
+    'unidad_habitacional': 'residente__unidad__codigo',
+    'tipo': 'residente__tipo',
+    'fecha_ingreso': 'residente__fecha_ingreso',
+    'estado': 'residente__estado',
+    'nombre_completo': 'residente_nombre_completo',
+    'puede_acceder': 'residente_puede_acceder',
+    'estado_usuario': 'residente_estado_usuario',
+    'fecha_creacion': 'residente__fecha_creacion',
+    'fecha_actualizacion': 'residente__fecha_actualizacion',
+}
+
+CAMPOS_RESERVA = [
+    'id', 'fecha_reserva', 'hora_inicio', 'hora_fin', 'tipo_reserva', 'estado', 'costo_total',
+]
+
+FORMATOS = {
+    'area_comun__monto_hora': _DECIMAL,
+    'area_comun__created_at': _FECHA_HORA,
+    'area_comun__updated_at': _FECHA_HORA,
+    'residente__fecha_ingreso': _FECHA,
+    'residente__fecha_creacion': _FECHA_HORA,
+    'residente__fecha_actualizacion': _FECHA_HORA,
+    'fecha_reserva': _FECHA,
+    'hora_inicio': _HORA,
+    'hora_fin': _HORA,
+    'costo_total': _DECIMAL,
+}
+
+
+def _si(condicion):
+    return Case(When(condicion, then=Value(True)), default=Value(False), output_field=BooleanField())
+
+
+def proyectar(queryset, hoy=None):
+    """Proyección .values() del listado con los campos calculados como anotaciones"""
+    hoy = hoy or timezone.now().date()
+    activa = Q(estado__in=Reserva.ESTADOS_ACTIVOS)
+    return queryset.annotate(
+        duracion=Cast(Extract(F('hora_fin') - F('hora_inicio'), 'epoch'), FloatField()) / Value(3600.0),
+        activa_estado=_si(activa),
+        activa_hoy=_si(Q(estado=Reserva.ESTADO_CONFIRMADA, fecha_reserva__gte=hoy)),
+        residente_nombre_completo=Trim(
+            Concat('residente__nombre', Value(' '), 'residente__apellido', output_field=CharField())
+        ),
+        # Sin usuario la propiedad del modelo retorna None, no False
+        residente_puede_acceder=Case(
+            When(residente__usuario__isnull=True, then=Value(None)),
+            When(Q(residente__usuario__is_active=True, residente__estado='activo'), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+        residente_estado_usuario=Case(
+            When(residente__usuario__isnull=True, then=Value('sin_usuario')),
+            When(residente__usuario__is_active=True, then=Value('activo')),
+            default=Value('inactivo'),
+            output_field=CharField(),
+        ),
+    ).values(
+        *CAMPOS_RESERVA,
+        *CAMPOS_AREA.values(),
+        *CAMPOS_RESIDENTE.values(),
+        'duracion', 'activa_estado', 'activa_hoy',
+    )
+
+
+def _formatear(fila, campo):
+    valor = fila[campo]
+    formato = FORMATOS.get(campo)
+    if formato is None or valor is None:
+        return valor
+    return formato.to_representation(valor)
+
+
+def representar(filas):
+    """Convierte las filas de ``proyectar`` al formato de ReservaListSerializer"""
+    resultado = []
+    for fila in filas:
+        resultado.append({
+            'id': fila['id'],
+            'area_comun_info': {
+                clave: _formatear(fila, campo) for clave, campo in CAMPOS_AREA.items()
+            },
+            'residente_info': {
+                clave: _formatear(fila, campo) for clave, campo in CAMPOS_RESIDENTE.items()
+            },
+            'fecha_reserva': _formatear(fila, 'fecha_reserva'),
+            'hora_inicio': _formatear(fila, 'hora_inicio'),
+            'hora_fin': _formatear(fila, 'hora_fin'),
+            'tipo_reserva': fila['tipo_reserva'],
+            'estado': fila['estado'],
+            'costo_total': _formatear(fila, 'costo_total'),
+            'duracion_horas': fila['duracion'] or 0,
+            'puede_cancelar': fila['activa_estado'],
+            'puede_modificar': fila['activa_estado'],
+            'esta_activa': fila['activa_hoy'],
+        })
+    return resultado
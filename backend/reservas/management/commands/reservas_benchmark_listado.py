@@ -0,0 +1,96 @@
+"""
+Benchmark del listado de reservas.
+
+Crea N reservas dentro de una transacción que se revierte al final y mide el
+tiempo de ReservaListSerializer frente a la representación rápida basada en
+``.values()`` (reservas.listado). No deja datos en la base.
+
+Uso:
+    python manage.py reservas_benchmark_listado [--filas 1000] [--repeticiones 5]
+"""
+import time as reloj
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from areas_comunes.models import AreaComun
+from residentes.models import Residente
+from reservas.listado import proyectar, representar
+from reservas.models import Reserva
+from reservas.serializers import ReservaListSerializer
+
+
+class _Revertir(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compara el tiempo de serialización del listado de reservas (serializer vs .values())'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=1000, help='Reservas a generar')
+        parser.add_argument('--repeticiones', type=int, default=5, help='Mediciones por variante')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir(options['filas'], max(options['repeticiones'], 1))
+                raise _Revertir
+        except _Revertir:
+            pass
+
+    def _preparar(self, filas):
+        area = AreaComun.objects.create(nombre='Benchmark', monto_hora=Decimal('25.00'))
+        residentes = Residente.objects.bulk_create([
+            Residente(
+                nombre=f'Residente {i}', apellido='Benchmark', ci=f'bench-{i}',
+                email=f'bench{i}@test.com', tipo='propietario', fecha_ingreso=date.today(),
+            )
+            for i in range(50)
+        ])
+        inicio = date.today() + timedelta(days=1)
+        # Una reserva por (día, hora) para no violar la restricción de solapamiento
+        Reserva.objects.bulk_create([
+            Reserva(
+                area_comun=area,
+                residente=residentes[i % len(residentes)],
+                fecha_reserva=inicio + timedelta(days=i // 12),
+                hora_inicio=time(8 + i % 12, 0),
+                hora_fin=time(8 + i % 12, 45),
+                costo_total=Decimal('18.75'),
+            )
+            for i in range(filas)
+        ])
+        return Reserva.objects.filter(area_comun=area).select_related(
+            'area_comun', 'residente__usuario'
+        ).order_by('id')
+
+    def _tiempo(self, funcion, repeticiones):
+        mejor = None
+        consultas = 0
+        for _ in range(repeticiones):
+            with CaptureQueriesContext(connection) as capturadas:
+                comienzo = reloj.perf_counter()
+                funcion()
+                duracion = reloj.perf_counter() - comienzo
+            consultas = len(capturadas)
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return mejor, consultas
+
+    def _medir(self, filas, repeticiones):
+        queryset = self._preparar(filas)
+
+        antes, consultas_antes = self._tiempo(
+            lambda: ReservaListSerializer(queryset.all(), many=True).data, repeticiones
+        )
+        despues, consultas_despues = self._tiempo(
+            lambda: representar(proyectar(queryset.all())), repeticiones
+        )
+
+        self.stdout.write(f'📊 Listado de {filas} reservas (mejor de {repeticiones})')
+        self.stdout.write(f'   ReservaListSerializer: {antes * 1000:.1f} ms ({consultas_antes} consultas)')
+        self.stdout.write(f'   Proyección .values():  {despues * 1000:.1f} ms ({consultas_despues} consultas)')
+        self.stdout.write(self.style.SUCCESS(f'✅ {antes / despues:.1f}x más rápido'))
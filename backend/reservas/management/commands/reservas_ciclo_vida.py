@@ -0,0 +1,45 @@
+"""
+Comando programado del ciclo de vida de las reservas.
+
+Marca como COMPLETADA las reservas confirmadas que ya terminaron y como
+CANCELADA las pendientes cuya hora de inicio pasó sin aprobación. Es seguro
+ejecutarlo en paralelo (cron en varios contenedores): solo una instancia
+trabaja gracias a un bloqueo consultivo de PostgreSQL.
+
+Uso:
+    python manage.py reservas_ciclo_vida [--lote 500] [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+
+from reservas.ciclo_vida import TAMANO_LOTE, procesar_ciclo_vida
+
+
+class Command(BaseCommand):
+    help = 'Completa reservas confirmadas pasadas y cancela pendientes vencidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=TAMANO_LOTE,
+            help='Cantidad de reservas actualizadas por sentencia'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo muestra cuántas reservas cambiarían de estado'
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            self.stdout.write(self.style.ERROR('--lote debe ser al menos 1'))
+            return
+
+        resumen = procesar_ciclo_vida(tamano_lote=options['lote'], simular=options['dry_run'])
+        if resumen is None:
+            self.stdout.write(self.style.WARNING('Otra ejecución está en curso; no se hizo nada'))
+            return
+
+        verbo = 'Se marcarían' if options['dry_run'] else 'Marcadas'
+        for estado, cantidad in resumen.items():
+            self.stdout.write(self.style.SUCCESS(f'✅ {verbo} como {estado}: {cantidad}'))
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:00
+
+import django.contrib.postgres.constraints
+import reservas.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='reserva',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(('estado__in', ['PENDIENTE', 'CONFIRMADA'])),
+                expressions=[
+                    (reservas.models.AreaReserva(), '='),
+                    (reservas.models.PeriodoReserva(), '&&'),
+                ],
+                name='reserva_sin_solapamiento',
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0002_reserva_sin_solapamiento'),
+        ('areas_comunes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reserva',
+            name='tarifa_hora',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Monto por hora del área al momento de reservar', max_digits=10, null=True, verbose_name='Tarifa por Hora'),
+        ),
+        # Las reservas existentes toman la tarifa actual de su área
+        migrations.RunSQL(
+            sql="""
+                UPDATE reservas_reserva AS r
+                SET tarifa_hora = a.monto_hora
+                FROM areas_comunes_areacomun AS a
+                WHERE a.id = r.area_comun_id AND r.tarifa_hora IS NULL;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
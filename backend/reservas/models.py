@@ -1,9 +1,48 @@
 from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import BigIntegerRangeField, DateTimeRangeField, RangeOperators
 from django.core.validators import MinValueValidator
+from django.db.models.expressions import CombinedExpression
 from django.utils import timezone
 from datetime import datetime, time
 from areas_comunes.models import AreaComun
 from residentes.models import Residente
+from .tarifas import calcular_costo
+
+
+class PeriodoReserva(models.Func):
+    """Rango tsrange [fecha + hora_inicio, fecha + hora_fin) de una reserva"""
+
+    function = 'tsrange'
+    output_field = DateTimeRangeField()
+
+    def __init__(self):
+        super().__init__(
+            CombinedExpression(
+                models.F('fecha_reserva'), '+', models.F('hora_inicio'),
+                output_field=models.DateTimeField()
+            ),
+            CombinedExpression(
+                models.F('fecha_reserva'), '+', models.F('hora_fin'),
+                output_field=models.DateTimeField()
+            ),
+            models.Value('[)'),
+        )
+
+
+class AreaReserva(models.Func):
+    """
+    Área común como rango int8range [id, id]: permite comparar por igualdad
+    dentro de un índice GiST sin requerir la extensión btree_gist.
+    """
+
+    function = 'int8range'
+    output_field = BigIntegerRangeField()
+
+    def __init__(self):
+        super().__init__(
+            models.F('area_comun'), models.F('area_comun'), models.Value('[]')
+        )
 
 
 class Reserva(models.Model):
@@ -24,6 +63,9 @@ class Reserva(models.Model):
         (ESTADO_RECHAZADA, "Rechazada"),
     ]
     
+    # Estados que ocupan el horario del área
+    ESTADOS_ACTIVOS = [ESTADO_PENDIENTE, ESTADO_CONFIRMADA]
+    
     # Tipos de reserva
     TIPO_PARTICULAR = "PARTICULAR"
     TIPO_EVENTO = "EVENTO"
@@ -88,7 +130,16 @@ class Reserva(models.Model):
         verbose_name="Estado"
     )
     
-    # Costo calculado
+    # Tarifa del área congelada al reservar y costo calculado con ella
+    tarifa_hora = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Tarifa por Hora",
+        help_text="Monto por hora del área al momento de reservar"
+    )
+    
     costo_total = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -150,33 +201,82 @@ class Reserva(models.Model):
                 check=models.Q(fecha_reserva__gte=timezone.now().date()),
                 name='reserva_fecha_futura'
             ),
+            # Dos reservas activas de la misma área no pueden solaparse
+            ExclusionConstraint(
+                name='reserva_sin_solapamiento',
+                index_type='GIST',
+                expressions=[
+                    (AreaReserva(), RangeOperators.EQUAL),
+                    (PeriodoReserva(), RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(estado__in=['PENDIENTE', 'CONFIRMADA']),
+            ),
         ]
     
     def __str__(self):
         return f"{self.residente.nombre_completo} - {self.area_comun.nombre} ({self.fecha_reserva})"
     
+    @classmethod
+    def buscar_conflicto(cls, area_comun, fecha_reserva, hora_inicio, hora_fin, excluir_id=None):
+        """
+        Retorna la primera reserva activa del área que se solapa con el horario
+        indicado, o None. Usa el índice (area_comun, fecha_reserva).
+        """
+        conflictos = cls.objects.filter(
+            area_comun=area_comun,
+            fecha_reserva=fecha_reserva,
+            estado__in=cls.ESTADOS_ACTIVOS,
+            hora_inicio__lt=hora_fin,
+            hora_fin__gt=hora_inicio,
+        )
+        if excluir_id:
+            conflictos = conflictos.exclude(id=excluir_id)
+        return conflictos.order_by('hora_inicio').first()
+    
+    # Campos de los que depende el costo
+    CAMPOS_COSTO = {'area_comun', 'area_comun_id', 'hora_inicio', 'hora_fin'}
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._horario_costo = instancia._valores_costo()
+        return instancia
+    
+    def _valores_costo(self):
+        return (self.area_comun_id, self.hora_inicio, self.hora_fin)
+    
+    def _requiere_costo(self, update_fields):
+        if update_fields is not None and not self.CAMPOS_COSTO.intersection(update_fields):
+            return False
+        if not self.area_comun_id or not self.hora_inicio or not self.hora_fin:
+            return False
+        return (
+            self.tarifa_hora is None or
+            self._valores_costo() != getattr(self, '_horario_costo', None)
+        )
+    
     def save(self, *args, **kwargs):
-        """Calcula el costo total antes de guardar"""
-        if self.area_comun and self.hora_inicio and self.hora_fin:
+        """Recalcula el costo solo si es nueva o cambió el área o el horario"""
+        update_fields = kwargs.get('update_fields')
+        if self._requiere_costo(update_fields):
             self.calcular_costo()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'tarifa_hora', 'costo_total'}
         super().save(*args, **kwargs)
+        self._horario_costo = self._valores_costo()
     
     def calcular_costo(self):
-        """Calcula el costo total de la reserva basado en las horas"""
-        if not self.area_comun or not self.hora_inicio or not self.hora_fin:
+        """
+        Calcula el costo total con la tarifa congelada. La tarifa se toma del
+        área al crear la reserva o al cambiarla de área.
+        """
+        if not self.area_comun_id or not self.hora_inicio or not self.hora_fin:
             return
         
-        # Convertir horas a datetime para calcular diferencia
-        inicio_datetime = datetime.combine(self.fecha_reserva, self.hora_inicio)
-        fin_datetime = datetime.combine(self.fecha_reserva, self.hora_fin)
-        
-        # Calcular diferencia en horas
-        diferencia = fin_datetime - inicio_datetime
-        horas = diferencia.total_seconds() / 3600
-        
-        # Calcular costo (convertir float a Decimal)
-        from decimal import Decimal
-        self.costo_total = self.area_comun.monto_hora * Decimal(str(horas))
+        area_original = getattr(self, '_horario_costo', (None,))[0]
+        if self.tarifa_hora is None or self.area_comun_id != area_original:
+            self.tarifa_hora = self.area_comun.monto_hora
+        self.costo_total = calcular_costo(self.tarifa_hora, self.hora_inicio, self.hora_fin)
     
     def duracion_horas(self):
         """Retorna la duración de la reserva en horas"""
@@ -196,11 +296,11 @@ class Reserva(models.Model):
         """Verifica si la reserva puede ser modificada"""
         return self.estado in [self.ESTADO_PENDIENTE, self.ESTADO_CONFIRMADA]
     
-    def esta_activa(self):
+    def esta_activa(self, hoy=None):
         """Verifica si la reserva está activa (confirmada y en fecha futura)"""
         return (
             self.estado == self.ESTADO_CONFIRMADA and 
-            self.fecha_reserva >= timezone.now().date()
+            self.fecha_reserva >= (hoy or timezone.now().date())
         )
     
     def aprobar(self, administrador):
@@ -208,7 +308,9 @@ class Reserva(models.Model):
         self.estado = self.ESTADO_CONFIRMADA
         self.administrador_aprobacion = administrador
         self.fecha_aprobacion = timezone.now()
-        self.save()
+        self.save(update_fields=[
+            'estado', 'administrador_aprobacion', 'fecha_aprobacion', 'fecha_actualizacion'
+        ])
     
     def rechazar(self, administrador, motivo=""):
         """Rechaza la reserva"""
@@ -217,16 +319,19 @@ class Reserva(models.Model):
         self.fecha_aprobacion = timezone.now()
         if motivo:
             self.observaciones_admin = motivo
-        self.save()
+        self.save(update_fields=[
+            'estado', 'administrador_aprobacion', 'fecha_aprobacion',
+            'observaciones_admin', 'fecha_actualizacion'
+        ])
     
     def cancelar(self, motivo=""):
         """Cancela la reserva"""
         self.estado = self.ESTADO_CANCELADA
         if motivo:
             self.observaciones_admin = motivo
-        self.save()
+        self.save(update_fields=['estado', 'observaciones_admin', 'fecha_actualizacion'])
     
     def completar(self):
         """Marca la reserva como completada"""
         self.estado = self.ESTADO_COMPLETADA
-        self.save()
\ No newline at end of file
+        self.save(update_fields=['estado', 'fecha_actualizacion'])
\ No newline at end of file
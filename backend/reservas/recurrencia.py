@@ -0,0 +1,154 @@
+"""
+Creación de reservas múltiples y recurrentes.
+
+Todas las ocurrencias comparten área, horario y datos de la reserva; solo
+cambia la fecha. Los conflictos se validan con una única consulta sobre
+todas las fechas, el costo se calcula una vez y las reservas se insertan con
+``bulk_create`` dentro de una transacción.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.dashboard import invalidar_modelo
+
+from .disponibilidad import invalidar_disponibilidad
+from .estadisticas import invalidar_estadisticas
+from .models import Reserva
+
+MAX_OCURRENCIAS = 100
+
+FRECUENCIA_DIARIA = "DIARIA"
+FRECUENCIA_SEMANAL = "SEMANAL"
+
+RESULTADO_CREADA = "creada"
+RESULTADO_CONFLICTO = "conflicto"
+RESULTADO_FECHA_PASADA = "fecha_pasada"
+RESULTADO_OMITIDA = "omitida"
+
+
+def generar_fechas(fecha_inicio, frecuencia, fecha_fin=None, repeticiones=None,
+                   intervalo=1, dias_semana=None, limite=MAX_OCURRENCIAS):
+    """
+    Expande una regla de recurrencia (similar a RRULE) en una lista de fechas.
+
+    - ``frecuencia``: DIARIA o SEMANAL.
+    - ``intervalo``: cada cuántos días/semanas se repite.
+    - ``dias_semana``: para SEMANAL, días 0-6 (lunes=0); por defecto el día
+      de ``fecha_inicio``.
+    - Termina en ``fecha_fin`` (inclusive) o tras ``repeticiones`` fechas,
+      y nunca genera más de ``limite`` fechas.
+    """
+    maximo = min(repeticiones or limite, limite)
+    fechas = []
+
+    if frecuencia == FRECUENCIA_DIARIA:
+        fecha = fecha_inicio
+        while len(fechas) < maximo and (fecha_fin is None or fecha <= fecha_fin):
+            fechas.append(fecha)
+            fecha += timedelta(days=intervalo)
+        return fechas
+
+    dias = sorted(set(dias_semana)) if dias_semana else [fecha_inicio.weekday()]
+    inicio_semana = fecha_inicio - timedelta(days=fecha_inicio.weekday())
+    while len(fechas) < maximo:
+        for dia in dias:
+            fecha = inicio_semana + timedelta(days=dia)
+            if fecha < fecha_inicio:
+                continue
+            if fecha_fin is not None and fecha > fecha_fin:
+                return fechas
+            fechas.append(fecha)
+            if len(fechas) >= maximo:
+                break
+        inicio_semana += timedelta(weeks=intervalo)
+    return fechas
+
+
+def _conflictos(area_comun, fechas, hora_inicio, hora_fin):
+    """Una sola consulta: {fecha: id de la reserva en conflicto}"""
+    conflictos = Reserva.objects.filter(
+        area_comun=area_comun,
+        fecha_reserva__in=fechas,
+        estado__in=Reserva.ESTADOS_ACTIVOS,
+        hora_inicio__lt=hora_fin,
+        hora_fin__gt=hora_inicio,
+    ).order_by('fecha_reserva', 'hora_inicio').values_list('fecha_reserva', 'id')
+
+    por_fecha = {}
+    for fecha, reserva_id in conflictos:
+        por_fecha.setdefault(fecha, reserva_id)
+    return por_fecha
+
+
+def crear_reservas(datos, fechas, omitir_conflictos=False, reintentar=True):
+    """
+    Crea una reserva por fecha con los ``datos`` comunes (área, residente,
+    horario, tipo, motivo, número de personas).
+
+    Si ``omitir_conflictos`` es False la operación es todo o nada: basta un
+    conflicto para no crear ninguna. Retorna (creadas, resultados), donde
+    resultados tiene un elemento por fecha con su estado.
+    """
+    hoy = timezone.now().date()
+    fechas = sorted(set(fechas))
+
+    plantilla = Reserva(fecha_reserva=fechas[0], **datos)
+    plantilla.calcular_costo()
+
+    with transaction.atomic():
+        conflictos = _conflictos(datos['area_comun'], fechas, datos['hora_inicio'], datos['hora_fin'])
+
+        resultados = []
+        nuevas = []
+        for fecha in fechas:
+            if fecha < hoy:
+                resultados.append({'fecha': fecha, 'resultado': RESULTADO_FECHA_PASADA})
+            elif fecha in conflictos:
+                resultados.append({
+                    'fecha': fecha,
+                    'resultado': RESULTADO_CONFLICTO,
+                    'reserva_conflicto': conflictos[fecha],
+                })
+            else:
+                resultados.append({'fecha': fecha, 'resultado': RESULTADO_CREADA})
+                nuevas.append(Reserva(
+                    fecha_reserva=fecha,
+                    tarifa_hora=plantilla.tarifa_hora,
+                    costo_total=plantilla.costo_total,
+                    **datos
+                ))
+
+        hay_errores = len(nuevas) < len(fechas)
+        if hay_errores and not omitir_conflictos:
+            for resultado in resultados:
+                if resultado['resultado'] == RESULTADO_CREADA:
+                    resultado['resultado'] = RESULTADO_OMITIDA
+            return [], resultados
+
+        try:
+            # Savepoint: si una reserva concurrente ocupa alguna fecha, la
+            # restricción reserva_sin_solapamiento rechaza el lote completo
+            with transaction.atomic():
+                creadas = Reserva.objects.bulk_create(nuevas)
+        except IntegrityError as error:
+            if not reintentar or 'reserva_sin_solapamiento' not in str(error):
+                raise
+            # Volver a clasificar con los datos actuales (una sola vez)
+            return crear_reservas(datos, fechas, omitir_conflictos, reintentar=False)
+
+        por_fecha = {reserva.fecha_reserva: reserva for reserva in creadas}
+        for resultado in resultados:
+            if resultado['resultado'] == RESULTADO_CREADA:
+                resultado['reserva_id'] = por_fecha[resultado['fecha']].id
+
+        # bulk_create no emite señales: invalidar las cachés a mano
+        area_id = datos['area_comun'].id
+        transaction.on_commit(
+            lambda: invalidar_disponibilidad([(area_id, fecha) for fecha in por_fecha])
+        )
+        transaction.on_commit(invalidar_estadisticas)
+        invalidar_modelo(Reserva)
+    return creadas, resultados
@@ -1,7 +1,11 @@
+from contextlib import contextmanager
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import datetime, time
 from .models import Reserva
+from .transiciones import MAX_RESERVAS_LOTE
+from .recurrencia import FRECUENCIA_DIARIA, FRECUENCIA_SEMANAL, MAX_OCURRENCIAS, generar_fechas
 from areas_comunes.models import AreaComun
 from areas_comunes.serializers import AreaComunSerializer
 from residentes.models import Residente
@@ -41,6 +45,7 @@ class ReservaSerializer(serializers.ModelSerializer):
             'motivo',
             'numero_personas',
             'estado',
+            'tarifa_hora',
             'costo_total',
             'fecha_creacion',
             'fecha_actualizacion',
@@ -55,6 +60,7 @@ class ReservaSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             'id',
+            'tarifa_hora',
             'costo_total',
             'fecha_creacion',
             'fecha_actualizacion',
@@ -76,7 +82,10 @@ class ReservaSerializer(serializers.ModelSerializer):
     
     def get_esta_activa(self, obj):
         """Verifica si está activa"""
-        return obj.esta_activa()
+        # La fecha de hoy se calcula una vez por serializer, no por fila
+        if not hasattr(self, '_hoy'):
+            self._hoy = timezone.now().date()
+        return obj.esta_activa(self._hoy)
     
     def validate_fecha_reserva(self, value):
         """Valida que la fecha sea futura"""
@@ -98,35 +107,67 @@ class ReservaSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Validaciones generales"""
-        # Validar que no haya conflictos de horarios
-        if 'area_comun' in data and 'fecha_reserva' in data and 'hora_inicio' in data and 'hora_fin' in data:
-            self._validar_conflicto_horario(data)
+        # Validar que no haya conflictos de horarios (en actualizaciones parciales
+        # se completan los datos con los valores actuales de la reserva)
+        horario = self._horario(data)
+        estado = data.get('estado', getattr(self.instance, 'estado', Reserva.ESTADO_PENDIENTE))
+        if all(horario.values()) and estado in Reserva.ESTADOS_ACTIVOS:
+            self._validar_conflicto_horario(horario)
         
         return data
     
+    def create(self, validated_data):
+        with self._capturar_solapamiento(validated_data):
+            return super().create(validated_data)
+    
+    def update(self, instance, validated_data):
+        with self._capturar_solapamiento(validated_data):
+            return super().update(instance, validated_data)
+    
+    def _horario(self, data):
+        campos = ['area_comun', 'fecha_reserva', 'hora_inicio', 'hora_fin']
+        return {campo: data.get(campo, getattr(self.instance, campo, None)) for campo in campos}
+    
     def _validar_conflicto_horario(self, data):
         """Valida que no haya conflictos de horarios para la misma área"""
-        area = data['area_comun']
-        fecha = data['fecha_reserva']
-        hora_inicio = data['hora_inicio']
-        hora_fin = data['hora_fin']
-        
-        # Buscar reservas existentes que se solapen
-        reservas_existentes = Reserva.objects.filter(
-            area_comun=area,
-            fecha_reserva=fecha,
-            estado__in=[Reserva.ESTADO_PENDIENTE, Reserva.ESTADO_CONFIRMADA]
-        ).exclude(
-            id=self.instance.id if self.instance else None
+        conflicto = Reserva.buscar_conflicto(
+            data['area_comun'],
+            data['fecha_reserva'],
+            data['hora_inicio'],
+            data['hora_fin'],
+            excluir_id=self.instance.id if self.instance else None,
         )
-        
-        for reserva in reservas_existentes:
-            # Verificar si hay solapamiento
-            if (hora_inicio < reserva.hora_fin and hora_fin > reserva.hora_inicio):
-                raise serializers.ValidationError(
-                    f"Ya existe una reserva para este horario. "
-                    f"Conflicto con reserva de {reserva.hora_inicio} a {reserva.hora_fin}."
-                )
+        if not conflicto:
+            return
+        raise serializers.ValidationError({
+            'non_field_errors': [
+                f"Ya existe una reserva para este horario. "
+                f"Conflicto con reserva de {conflicto.hora_inicio} a {conflicto.hora_fin}."
+            ],
+            'reserva_conflicto': {
+                'id': conflicto.id,
+                'fecha_reserva': str(conflicto.fecha_reserva),
+                'hora_inicio': str(conflicto.hora_inicio),
+                'hora_fin': str(conflicto.hora_fin),
+                'estado': conflicto.estado,
+            },
+        })
+    
+    @contextmanager
+    def _capturar_solapamiento(self, validated_data):
+        """
+        La restricción reserva_sin_solapamiento cubre la carrera entre dos
+        peticiones simultáneas que pasaron la validación: el guardado se hace
+        en un savepoint y la violación se devuelve como error de validación.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError as error:
+            if 'reserva_sin_solapamiento' not in str(error):
+                raise
+            self._validar_conflicto_horario(self._horario(validated_data))
+            raise serializers.ValidationError("Ya existe una reserva para este horario.")
 
 
 class ReservaCreateSerializer(ReservaSerializer):
@@ -201,6 +242,89 @@ class ReservaListSerializer(ReservaSerializer):
         ]
 
 
+class RecurrenciaSerializer(serializers.Serializer):
+    """Regla de recurrencia (similar a RRULE)"""
+    
+    frecuencia = serializers.ChoiceField(choices=[FRECUENCIA_DIARIA, FRECUENCIA_SEMANAL])
+    fecha_inicio = serializers.DateField()
+    fecha_fin = serializers.DateField(required=False)
+    repeticiones = serializers.IntegerField(required=False, min_value=1, max_value=MAX_OCURRENCIAS)
+    intervalo = serializers.IntegerField(required=False, default=1, min_value=1)
+    dias_semana = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        required=False,
+        allow_empty=False
+    )
+    
+    def validate(self, data):
+        if not data.get('fecha_fin') and not data.get('repeticiones'):
+            raise serializers.ValidationError(
+                "Debe indicar fecha_fin o repeticiones."
+            )
+        if data.get('fecha_fin') and data['fecha_fin'] < data['fecha_inicio']:
+            raise serializers.ValidationError(
+                "La fecha de fin debe ser posterior a la fecha de inicio."
+            )
+        return data
+
+
+class ReservaMultipleSerializer(serializers.Serializer):
+    """
+    Datos para crear varias reservas con el mismo horario: una lista
+    explícita de fechas o una regla de recurrencia.
+    """
+    
+    area_comun = serializers.PrimaryKeyRelatedField(queryset=AreaComun.objects.all())
+    residente = serializers.PrimaryKeyRelatedField(
+        queryset=Residente.objects.all(),
+        required=False,
+        allow_null=True
+    )
+    hora_inicio = serializers.TimeField()
+    hora_fin = serializers.TimeField()
+    tipo_reserva = serializers.ChoiceField(choices=Reserva.TIPO_CHOICES, default=Reserva.TIPO_PARTICULAR)
+    motivo = serializers.CharField(required=False, allow_blank=True, default="")
+    numero_personas = serializers.IntegerField(min_value=1, default=1)
+    fechas = serializers.ListField(
+        child=serializers.DateField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_OCURRENCIAS
+    )
+    recurrencia = RecurrenciaSerializer(required=False)
+    omitir_conflictos = serializers.BooleanField(default=False)
+    
+    def validate(self, data):
+        if data['hora_fin'] <= data['hora_inicio']:
+            raise serializers.ValidationError(
+                "La hora de fin debe ser mayor que la hora de inicio."
+            )
+        if data['area_comun'].estado != AreaComun.ESTADO_ACTIVO:
+            raise serializers.ValidationError(
+                "El área común seleccionada no está disponible para reservas."
+            )
+        if bool(data.get('fechas')) == bool(data.get('recurrencia')):
+            raise serializers.ValidationError(
+                "Debe indicar fechas o recurrencia (solo una de las dos)."
+            )
+        
+        if data.get('recurrencia'):
+            # Una fecha más que el máximo para detectar la serie que no entra
+            # completa, en lugar de crearla recortada
+            fechas = generar_fechas(**data.pop('recurrencia'), limite=MAX_OCURRENCIAS + 1)
+            if len(fechas) > MAX_OCURRENCIAS:
+                raise serializers.ValidationError({
+                    'recurrencia': (
+                        f"La recurrencia genera más de {MAX_OCURRENCIAS} fechas. "
+                        "Acorte la fecha de fin o indique repeticiones."
+                    )
+                })
+            data['fechas'] = fechas
+        if not data['fechas']:
+            raise serializers.ValidationError("La recurrencia no genera ninguna fecha.")
+        return data
+
+
 class ReservaAprobacionSerializer(serializers.Serializer):
     """Serializer para aprobar/rechazar reservas"""
     
@@ -221,6 +345,16 @@ class ReservaAprobacionSerializer(serializers.Serializer):
         return value
 
 
+class ReservaAprobacionLoteSerializer(ReservaAprobacionSerializer):
+    """Aprobar/rechazar varias reservas en una sola petición"""
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_RESERVAS_LOTE
+    )
+
+
 class ReservaEstadisticasSerializer(serializers.Serializer):
     """Serializer para estadísticas de reservas"""
     
@@ -1,2 +1,27 @@
 # Señales para el módulo de reservas
-# Este archivo se puede usar para agregar señales de Django en el futuro
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .disponibilidad import invalidar_disponibilidad
+from .estadisticas import invalidar_estadisticas
+from .models import Reserva
+
+
+@receiver(post_init, sender=Reserva)
+def recordar_horario_original(sender, instance, **kwargs):
+    """Guarda el área y fecha cargadas para invalidar también la caché anterior"""
+    instance._disponibilidad_original = (instance.area_comun_id, instance.fecha_reserva)
+
+
+@receiver(post_save, sender=Reserva)
+@receiver(post_delete, sender=Reserva)
+def invalidar_caches_reserva(sender, instance, **kwargs):
+    """Invalida disponibilidad y estadísticas al confirmar la transacción"""
+    pares = [
+        (instance.area_comun_id, instance.fecha_reserva),
+        getattr(instance, '_disponibilidad_original', (None, None)),
+    ]
+    transaction.on_commit(lambda: invalidar_disponibilidad(pares))
+    transaction.on_commit(invalidar_estadisticas)
+    instance._disponibilidad_original = (instance.area_comun_id, instance.fecha_reserva)
@@ -0,0 +1,27 @@
+"""
+Cálculo del costo de las reservas.
+
+El costo se calcula con la tarifa por hora del área congelada al momento de
+reservar (``Reserva.tarifa_hora``), de modo que un cambio posterior del
+``monto_hora`` del área no altera reservas existentes. El cálculo es
+aritmética entera sobre los campos de hora, sin consultas.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTAVOS = Decimal('0.01')
+
+
+def _segundos(hora):
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+
+def horas_entre(hora_inicio, hora_fin):
+    """Duración en horas (Decimal exacto) entre dos horas del mismo día"""
+    return Decimal(_segundos(hora_fin) - _segundos(hora_inicio)) / Decimal(3600)
+
+
+def calcular_costo(tarifa_hora, hora_inicio, hora_fin):
+    """Costo redondeado a centavos de ``hora_inicio`` a ``hora_fin`` con la tarifa dada"""
+    costo = Decimal(tarifa_hora) * horas_entre(hora_inicio, hora_fin)
+    return costo.quantize(CENTAVOS, rounding=ROUND_HALF_UP)
@@ -1,3 +1,498 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from areas_comunes.models import AreaComun
+from residentes.models import Residente
+from .models import Reserva
+from .serializers import ReservaCreateSerializer
+
+
+class ConflictoHorarioTests(TestCase):
+    """Pruebas de la detección de solapamientos de reservas"""
+
+    def setUp(self):
+        self.area = AreaComun.objects.create(nombre="Salón de eventos", monto_hora=50)
+        self.residente = Residente.objects.create(
+            nombre="Juan",
+            apellido="Pérez",
+            ci="123456",
+            email="juan@test.com",
+            telefono="123456789",
+            tipo="propietario",
+            fecha_ingreso=date.today()
+        )
+        self.fecha = date.today() + timedelta(days=7)
+        self.existente = self._crear(time(10, 0), time(12, 0))
+
+    def _crear(self, inicio, fin, estado=Reserva.ESTADO_PENDIENTE):
+        return Reserva.objects.create(
+            area_comun=self.area,
+            residente=self.residente,
+            fecha_reserva=self.fecha,
+            hora_inicio=inicio,
+            hora_fin=fin,
+            estado=estado,
+        )
+
+    def _datos(self, inicio, fin):
+        return {
+            'area_comun': self.area.id,
+            'residente': self.residente.id,
+            'fecha_reserva': self.fecha.isoformat(),
+            'hora_inicio': inicio,
+            'hora_fin': fin,
+            'numero_personas': 10,
+        }
+
+    def test_conflicto_devuelve_reserva(self):
+        serializer = ReservaCreateSerializer(data=self._datos('11:00', '13:00'))
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            str(serializer.errors['reserva_conflicto']['id']), str(self.existente.id)
+        )
+
+    def test_horarios_contiguos_permitidos(self):
+        serializer = ReservaCreateSerializer(data=self._datos('12:00', '14:00'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_restriccion_en_base_de_datos(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._crear(time(9, 0), time(10, 30))
+
+    def test_reservas_inactivas_no_bloquean(self):
+        self.existente.cancelar()
+        # Misma área y mismo horario que la cancelada: ni la validación ni la
+        # restricción de exclusión la bloquean
+        serializer = ReservaCreateSerializer(data=self._datos('10:00', '12:00'))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with transaction.atomic():
+            nueva = self._crear(time(10, 0), time(12, 0), estado=Reserva.ESTADO_CONFIRMADA)
+
+        self.assertEqual(
+            Reserva.objects.filter(
+                area_comun=self.area, fecha_reserva=self.fecha, hora_inicio=time(10, 0)
+            ).count(),
+            2,
+        )
+        self.assertEqual(
+            Reserva.buscar_conflicto(self.area, self.fecha, time(11, 0), time(13, 0)), nueva
+        )
+
+
+class DisponibilidadTests(TestCase):
+    """Pruebas del cálculo de slots libres"""
+
+    def test_barrido_fusiona_intervalos(self):
+        from .disponibilidad import bloques_libres
+
+        ocupados = [(600, 720), (660, 780), (900, 960)]
+        self.assertEqual(
+            bloques_libres(ocupados, 360, 1380),
+            [(360, 600), (780, 900), (960, 1380)]
+        )
+
+    def test_slots_alineados(self):
+        from .disponibilidad import dividir_en_slots
+
+        self.assertEqual(
+            dividir_en_slots([(360, 480), (790, 900)], 60, 360),
+            [(360, 420), (420, 480), (840, 900)]
+        )
+
+    def test_cache_invalidada_al_cambiar_estado(self):
+        from django.core.cache import cache
+        from .disponibilidad import CACHE, calcular_libres, clave_cache
+
+        cache.clear()
+        area = AreaComun.objects.create(nombre="Piscina", monto_hora=20)
+        residente = Residente.objects.create(
+            nombre="Ana", apellido="Rojas", ci="999", email="ana@test.com",
+            telefono="1", tipo="propietario", fecha_ingreso=date.today()
+        )
+        fecha = date.today() + timedelta(days=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            reserva = Reserva.objects.create(
+                area_comun=area, residente=residente, fecha_reserva=fecha,
+                hora_inicio=time(10, 0), hora_fin=time(12, 0),
+            )
+        libres = calcular_libres([area.id], fecha, fecha)[(area.id, fecha)]
+        self.assertNotIn((360, 1380), libres)
+        self.assertIsNotNone(CACHE.get(clave_cache(area.id, fecha)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserva.cancelar()
+        self.assertIsNone(CACHE.get(clave_cache(area.id, fecha)))
+        libres = calcular_libres([area.id], fecha, fecha)[(area.id, fecha)]
+        self.assertEqual(libres, [(360, 1380)])
+
+
+class ReservasMultiplesTests(TestCase):
+    """Pruebas de la creación de reservas recurrentes"""
+
+    def setUp(self):
+        self.area = AreaComun.objects.create(nombre="Cancha", monto_hora=30)
+        self.residente = Residente.objects.create(
+            nombre="Luis", apellido="Vaca", ci="777", email="luis@test.com",
+            telefono="1", tipo="propietario", fecha_ingreso=date.today()
+        )
+        self.datos = {
+            'area_comun': self.area,
+            'residente': self.residente,
+            'hora_inicio': time(18, 0),
+            'hora_fin': time(20, 0),
+        }
+
+    def test_generar_fechas_semanal(self):
+        from .recurrencia import generar_fechas
+
+        fechas = generar_fechas(
+            date(2030, 1, 7), 'SEMANAL', repeticiones=4, dias_semana=[0, 2]
+        )
+        self.assertEqual(
+            fechas,
+            [date(2030, 1, 7), date(2030, 1, 9), date(2030, 1, 14), date(2030, 1, 16)]
+        )
+
+    def test_recurrencia_que_supera_el_maximo_se_rechaza(self):
+        from .recurrencia import MAX_OCURRENCIAS
+        from .serializers import ReservaMultipleSerializer
+
+        def validar(**recurrencia):
+            serializer = ReservaMultipleSerializer(data={
+                'area_comun': self.area.id,
+                'hora_inicio': '18:00',
+                'hora_fin': '20:00',
+                'recurrencia': {'frecuencia': 'DIARIA', 'fecha_inicio': '2030-01-01', **recurrencia},
+            })
+            return serializer.is_valid(), serializer
+
+        valida, serializer = validar(fecha_fin='2030-07-01')
+        self.assertFalse(valida)
+        self.assertIn('recurrencia', serializer.errors)
+
+        # Justo en el máximo se acepta completa
+        valida, serializer = validar(fecha_fin='2030-04-10')
+        self.assertTrue(valida, serializer.errors)
+        self.assertEqual(len(serializer.validated_data['fechas']), MAX_OCURRENCIAS)
+
+    def test_crea_en_lote_con_costo(self):
+        from .recurrencia import crear_reservas
+
+        fechas = [date.today() + timedelta(days=7 * i) for i in range(1, 4)]
+        creadas, resultados = crear_reservas(self.datos, fechas)
+        self.assertEqual(len(creadas), 3)
+        self.assertTrue(all(r['resultado'] == 'creada' for r in resultados))
+        self.assertEqual(
+            set(Reserva.objects.values_list('costo_total', flat=True)), {60}
+        )
+
+    def test_conflicto_todo_o_nada(self):
+        from .recurrencia import crear_reservas
+
+        fechas = [date.today() + timedelta(days=i) for i in (1, 2)]
+        existente = Reserva.objects.create(
+            fecha_reserva=fechas[1], hora_inicio=time(19, 0), hora_fin=time(21, 0),
+            area_comun=self.area, residente=self.residente,
+        )
+        creadas, resultados = crear_reservas(self.datos, fechas)
+        self.assertEqual(creadas, [])
+        self.assertEqual([r['resultado'] for r in resultados], ['omitida', 'conflicto'])
+        self.assertEqual(resultados[1]['reserva_conflicto'], existente.id)
+
+        creadas, _ = crear_reservas(self.datos, fechas, omitir_conflictos=True)
+        self.assertEqual([r.fecha_reserva for r in creadas], [fechas[0]])
+
+
+class EstadisticasTests(TestCase):
+    """Pruebas de las estadísticas agregadas"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.area = AreaComun.objects.create(nombre="Quincho", monto_hora=10)
+        self.otra_area = AreaComun.objects.create(nombre="Gimnasio", monto_hora=5)
+        self.residente = Residente.objects.create(
+            nombre="Eva", apellido="Soto", ci="555", email="eva@test.com",
+            telefono="1", tipo="propietario", fecha_ingreso=date.today()
+        )
+        self.fecha = date.today() + timedelta(days=2)
+        for area, inicio in ((self.area, 8), (self.area, 10), (self.otra_area, 8)):
+            Reserva.objects.create(
+                area_comun=area, residente=self.residente, fecha_reserva=self.fecha,
+                hora_inicio=time(inicio, 0), hora_fin=time(inicio + 1, 0),
+            )
+
+    def test_totales_en_dos_consultas(self):
+        from .estadisticas import calcular_estadisticas
+
+        with self.assertNumQueries(2):
+            datos = calcular_estadisticas()
+        self.assertEqual(datos['total_reservas'], 3)
+        self.assertEqual(datos['reservas_pendientes'], 3)
+        self.assertEqual(datos['ingresos_totales'], 25)
+        self.assertEqual(datos['areas_mas_populares'][0], {'area_comun__nombre': 'Quincho', 'count': 2})
+
+    def test_filtros_y_cache(self):
+        from .estadisticas import calcular_estadisticas
+
+        datos = calcular_estadisticas(area_comun_id=self.otra_area.id)
+        self.assertEqual(datos['total_reservas'], 1)
+        with self.assertNumQueries(0):
+            calcular_estadisticas(area_comun_id=self.otra_area.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Reserva.objects.filter(area_comun=self.otra_area).first().cancelar()
+        datos = calcular_estadisticas(area_comun_id=self.otra_area.id)
+        self.assertEqual(datos['reservas_canceladas'], 1)
+        self.assertEqual(
+            calcular_estadisticas(fecha_hasta=date.today())['total_reservas'], 0
+        )
+
+
+class EspacioCacheTests(TestCase):
+    """Pruebas de los espacios de caché (core.cache)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_espacios_independientes_y_metricas(self):
+        from core.cache import espacio, metricas
+
+        uno, otro = espacio("pruebas:uno"), espacio("pruebas:otro")
+        antes = metricas()["pruebas:uno"]
+        uno.set("clave", 1)
+        self.assertIsNone(otro.get("clave"))
+        self.assertEqual(uno.get("clave"), 1)
+        self.assertEqual(uno.get_many(["clave", "falta"]), {"clave": 1})
+
+        despues = metricas()["pruebas:uno"]
+        self.assertEqual(despues["aciertos"] - antes["aciertos"], 2)
+        self.assertEqual(despues["fallos"] - antes["fallos"], 1)
+        self.assertEqual(despues["escrituras"] - antes["escrituras"], 1)
+
+    def test_invalidacion_versionada(self):
+        from django.core.cache import cache
+        from core.cache import espacio
+
+        versionado = espacio("pruebas:versionado", versionado=True)
+        versionado.set("a", 1)
+        versionado.invalidar()
+        self.assertIsNone(versionado.get("a"))
+
+        # Sin clave de versión (expulsada) tampoco reaparecen datos anteriores
+        versionado.set("b", 2)
+        cache.delete(versionado._clave_version)
+        self.assertIsNone(versionado.get("b"))
+
+        with self.assertRaises(ValueError):
+            espacio("pruebas:simple").invalidar()
+
+    def test_error_del_backend_es_un_fallo(self):
+        from unittest import mock
+        from core.cache import espacio, metricas
+
+        caido = espacio("pruebas:caido")
+        with mock.patch.object(type(caido._cache), "get", side_effect=ConnectionError):
+            with self.assertLogs("core.cache", level="WARNING"):
+                self.assertEqual(caido.get("clave", "defecto"), "defecto")
+        self.assertEqual(metricas()["pruebas:caido"]["errores"], 1)
+
+
+class CicloVidaTests(TestCase):
+    """Pruebas de las transiciones automáticas"""
+
+    def test_completa_y_cancela_vencidas(self):
+        from datetime import datetime
+        from bitacora.models import Bitacora
+        from .ciclo_vida import procesar_ciclo_vida
+
+        area = AreaComun.objects.create(nombre="Terraza", monto_hora=10)
+        residente = Residente.objects.create(
+            nombre="Rosa", apellido="Paz", ci="321", email="rosa@test.com",
+            telefono="1", tipo="propietario", fecha_ingreso=date.today()
+        )
+        fecha = date.today() + timedelta(days=3)
+
+        def crear(inicio, estado):
+            return Reserva.objects.create(
+                area_comun=area, residente=residente, fecha_reserva=fecha,
+                hora_inicio=time(inicio, 0), hora_fin=time(inicio + 1, 0), estado=estado,
+            )
+
+        confirmada = crear(8, Reserva.ESTADO_CONFIRMADA)
+        pendiente = crear(10, Reserva.ESTADO_PENDIENTE)
+        futura = crear(15, Reserva.ESTADO_CONFIRMADA)
+
+        ahora = datetime.combine(fecha, time(12, 0))
+        self.assertEqual(
+            procesar_ciclo_vida(simular=True, ahora=ahora),
+            {Reserva.ESTADO_COMPLETADA: 1, Reserva.ESTADO_CANCELADA: 1}
+        )
+        resumen = procesar_ciclo_vida(tamano_lote=1, ahora=ahora)
+        self.assertEqual(resumen, {Reserva.ESTADO_COMPLETADA: 1, Reserva.ESTADO_CANCELADA: 1})
+
+        estados = dict(Reserva.objects.values_list('id', 'estado'))
+        self.assertEqual(estados[confirmada.id], Reserva.ESTADO_COMPLETADA)
+        self.assertEqual(estados[pendiente.id], Reserva.ESTADO_CANCELADA)
+        self.assertEqual(estados[futura.id], Reserva.ESTADO_CONFIRMADA)
+        self.assertEqual(Bitacora.objects.filter(modulo='RESERVAS').count(), 2)
+
+
+class ListadoRapidoTests(TestCase):
+    """La representación desde .values() debe coincidir con ReservaListSerializer"""
+
+    def test_misma_salida_que_serializer(self):
+        from users.models import CustomUser
+        from .listado import proyectar, representar
+        from .serializers import ReservaListSerializer
+
+        area = AreaComun.objects.create(nombre="Quincho", monto_hora=Decimal("12.50"))
+        from unidades.models import UnidadHabitacional
+
+        usuario = CustomUser.objects.create(username="listado")
+        UnidadHabitacional.objects.create(codigo="B-202", direccion="Torre B 202")
+        con_usuario = Residente.objects.create(
+            nombre="Ana", apellido="", ci="501", email="ana@test.com",
+            tipo="propietario", fecha_ingreso=date.today(), usuario=usuario
+        )
+        sin_usuario = Residente.objects.create(
+            nombre="Luis", apellido="Rojas", ci="502", email="luis@test.com",
+            tipo="inquilino", fecha_ingreso=date.today(), unidad_habitacional="B-202"
+        )
+        fecha = date.today() + timedelta(days=2)
+        for residente, inicio, estado in [
+            (con_usuario, 8, Reserva.ESTADO_CONFIRMADA),
+            (sin_usuario, 10, Reserva.ESTADO_CANCELADA),
+        ]:
+            Reserva.objects.create(
+                area_comun=area, residente=residente, fecha_reserva=fecha,
+                hora_inicio=time(inicio, 0), hora_fin=time(inicio + 1, 30),
+                estado=estado,
+            )
+
+        queryset = Reserva.objects.select_related('area_comun', 'residente__usuario').order_by('id')
+        esperado = ReservaListSerializer(queryset, many=True).data
+        with self.assertNumQueries(1):
+            obtenido = representar(proyectar(queryset))
+        self.assertEqual([dict(fila) for fila in esperado], obtenido)
+        self.assertIsNone(obtenido[1]['residente_info']['puede_acceder'])
+
+
+class TarifaReservaTests(TestCase):
+    """Pruebas de la tarifa congelada y de los cambios de estado sin recalcular costo"""
+
+    def setUp(self):
+        self.area = AreaComun.objects.create(nombre="Gimnasio", monto_hora=Decimal("40.00"))
+        self.residente = Residente.objects.create(
+            nombre="Eva", apellido="Soto", ci="601", email="eva@test.com",
+            tipo="propietario", fecha_ingreso=date.today()
+        )
+        self.reserva = Reserva.objects.create(
+            area_comun=self.area, residente=self.residente,
+            fecha_reserva=date.today() + timedelta(days=4),
+            hora_inicio=time(9, 0), hora_fin=time(10, 30),
+        )
+
+    def test_tarifa_congelada_al_reservar(self):
+        self.assertEqual(self.reserva.tarifa_hora, Decimal("40.00"))
+        self.assertEqual(self.reserva.costo_total, Decimal("60.00"))
+
+        AreaComun.objects.filter(id=self.area.id).update(monto_hora=Decimal("100.00"))
+        reserva = Reserva.objects.get(id=self.reserva.id)
+        reserva.hora_fin = time(11, 0)
+        reserva.save()
+        self.assertEqual(reserva.tarifa_hora, Decimal("40.00"))
+        self.assertEqual(reserva.costo_total, Decimal("80.00"))
+
+    def test_cambio_de_estado_no_recalcula_costo(self):
+        from users.models import CustomUser
+        admin = CustomUser.objects.create(username="admin-tarifa", is_staff=True)
+        reserva = Reserva.objects.get(id=self.reserva.id)
+
+        # Un solo UPDATE: sin leer el área ni recalcular el costo
+        with self.assertNumQueries(1):
+            reserva.aprobar(admin)
+        self.assertEqual(
+            Reserva.objects.get(id=reserva.id).estado, Reserva.ESTADO_CONFIRMADA
+        )
+
+    def test_cambiar_estado_en_lote(self):
+        from .transiciones import cambiar_estado
+
+        otra = Reserva.objects.create(
+            area_comun=self.area, residente=self.residente,
+            fecha_reserva=self.reserva.fecha_reserva,
+            hora_inicio=time(11, 0), hora_fin=time(12, 0),
+        )
+        filas = cambiar_estado(Reserva.objects.all(), Reserva.ESTADO_CANCELADA)
+
+        self.assertEqual({reserva_id for reserva_id, _, _ in filas}, {self.reserva.id, otra.id})
+        self.assertEqual(
+            set(Reserva.objects.values_list('estado', flat=True)), {Reserva.ESTADO_CANCELADA}
+        )
+        self.assertEqual(Reserva.objects.get(id=otra.id).costo_total, Decimal("40.00"))
+
+
+class DecisionLoteTests(APITestCase):
+    """Pruebas del endpoint de aprobación/rechazo en lote"""
+
+    def setUp(self):
+        from users.models import CustomUser
+        self.admin = CustomUser.objects.create(username="admin-lote", is_staff=True)
+        area = AreaComun.objects.create(nombre="Piscina", monto_hora=Decimal("20.00"))
+        residente = Residente.objects.create(
+            nombre="Leo", apellido="Vaca", ci="701", email="leo@test.com",
+            tipo="propietario", fecha_ingreso=date.today()
+        )
+        fecha = date.today() + timedelta(days=5)
+        self.reservas = Reserva.objects.bulk_create([
+            Reserva(
+                area_comun=area, residente=residente, fecha_reserva=fecha,
+                hora_inicio=time(8 + i, 0), hora_fin=time(9 + i, 0),
+                estado=Reserva.ESTADO_CANCELADA if i == 2 else Reserva.ESTADO_PENDIENTE,
+            )
+            for i in range(3)
+        ])
+        self.client.force_authenticate(user=self.admin)
+
+    def test_aprueba_en_lote_con_resumen(self):
+        from bitacora.models import Bitacora
+
+        ids = [reserva.id for reserva in self.reservas]
+        respuesta = self.client.post(
+            '/api/reservas/decision_lote/',
+            {'ids': ids + [999999], 'accion': 'aprobar'},
+            format='json'
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['procesadas'], 2)
+        self.assertEqual(
+            [r['resultado'] for r in respuesta.data['resultados']],
+            ['aprobada', 'aprobada', 'estado_invalido', 'no_encontrada']
+        )
+        self.assertEqual(respuesta.data['resultados'][2]['estado'], Reserva.ESTADO_CANCELADA)
+        self.assertEqual(
+            Reserva.objects.filter(
+                estado=Reserva.ESTADO_CONFIRMADA, administrador_aprobacion=self.admin
+            ).count(),
+            2
+        )
+        self.assertEqual(Bitacora.objects.filter(accion="Aprobar Reserva").count(), 2)
 
-# Create your tests here.
+    def test_solo_administradores(self):
+        from users.models import CustomUser
+        self.client.force_authenticate(user=CustomUser.objects.create(username="vecino"))
+        respuesta = self.client.post(
+            '/api/reservas/decision_lote/',
+            {'ids': [self.reservas[0].id], 'accion': 'rechazar'},
+            format='json'
+        )
+        self.assertEqual(respuesta.status_code, 403)
@@ -0,0 +1,93 @@
+"""
+Cambios de estado de reservas en lote.
+
+Un solo ``UPDATE ... WHERE id IN (...)`` por lote: no se instancian modelos,
+no se recalcula el costo y no se emiten señales, por lo que las cachés de
+disponibilidad, estadísticas y dashboard se invalidan aquí al confirmar la
+transacción.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import invalidar_modelo
+
+from .disponibilidad import invalidar_disponibilidad
+from .estadisticas import invalidar_estadisticas
+from .models import Reserva
+
+MAX_RESERVAS_LOTE = 500
+
+# accion: (nuevo estado, resultado por id, acción de bitácora)
+DECISIONES = {
+    'aprobar': (Reserva.ESTADO_CONFIRMADA, 'aprobada', "Aprobar Reserva"),
+    'rechazar': (Reserva.ESTADO_RECHAZADA, 'rechazada', "Rechazar Reserva"),
+}
+
+
+def cambiar_estado(queryset, nuevo_estado, **campos):
+    """
+    Pasa las reservas del queryset a ``nuevo_estado`` (más los ``campos``
+    adicionales indicados). Retorna las filas (id, area_comun_id,
+    fecha_reserva) modificadas.
+    """
+    with transaction.atomic():
+        filas = list(
+            queryset.order_by('id')
+            .select_for_update(of=('self',))
+            .values_list('id', 'area_comun_id', 'fecha_reserva')
+        )
+        if not filas:
+            return filas
+
+        Reserva.objects.filter(id__in=[reserva_id for reserva_id, _, _ in filas]).update(
+            estado=nuevo_estado,
+            fecha_actualizacion=timezone.now(),
+            **campos,
+        )
+        pares = [(area_id, fecha) for _, area_id, fecha in filas]
+        transaction.on_commit(lambda: invalidar_disponibilidad(pares))
+        transaction.on_commit(invalidar_estadisticas)
+        invalidar_modelo(Reserva)
+    return filas
+
+
+def decidir_lote(queryset, ids, accion, administrador, observaciones=""):
+    """
+    Aprueba o rechaza (según ``accion``) las reservas pendientes de ``ids``
+    visibles en ``queryset``. Retorna un resultado por id, en el orden
+    recibido: el resultado de la decisión, ``estado_invalido`` (con el estado
+    actual) o ``no_encontrada``.
+    """
+    nuevo_estado, resultado, _ = DECISIONES[accion]
+    ids = list(dict.fromkeys(ids))
+    campos = {
+        'administrador_aprobacion': administrador,
+        'fecha_aprobacion': timezone.now(),
+    }
+    if observaciones:
+        campos['observaciones_admin'] = observaciones
+
+    with transaction.atomic():
+        filas = cambiar_estado(
+            queryset.filter(id__in=ids, estado=Reserva.ESTADO_PENDIENTE), nuevo_estado, **campos
+        )
+        actualizadas = {reserva_id for reserva_id, _, _ in filas}
+        # Solo si algo no se pudo actualizar: el estado actual de los demás
+        estados = {}
+        if len(actualizadas) < len(ids):
+            estados = dict(
+                queryset.filter(id__in=set(ids) - actualizadas).values_list('id', 'estado')
+            )
+
+    resultados = []
+    for reserva_id in ids:
+        if reserva_id in actualizadas:
+            resultados.append({'id': reserva_id, 'resultado': resultado})
+        elif reserva_id in estados:
+            resultados.append({
+                'id': reserva_id, 'resultado': 'estado_invalido', 'estado': estados[reserva_id]
+            })
+        else:
+            resultados.append({'id': reserva_id, 'resultado': 'no_encontrada'})
+    return resultados
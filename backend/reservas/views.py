@@ -18,6 +18,7 @@ from .serializers import (
 from areas_comunes.models import AreaComun
 from residentes.models import Residente
 from .actions import add_reserva_actions
+from .listado import proyectar, representar
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
@@ -39,7 +40,7 @@ class ReservaViewSet(viewsets.ModelViewSet):
     """ViewSet para el CRUD de reservas"""
     
     queryset = Reserva.objects.select_related(
-        'area_comun', 'residente', 'administrador_aprobacion'
+        'area_comun', 'residente__usuario', 'residente__unidad', 'administrador_aprobacion'
     ).all()
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -83,6 +84,18 @@ class ReservaViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """
+        Listado con la representación rápida (misma salida que
+        ReservaListSerializer, construida desde una proyección .values())
+        """
+        queryset = proyectar(self.filter_queryset(self.get_queryset()))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representar(page))
+        return Response(representar(queryset))
+    
     def perform_create(self, serializer):
         """Asigna el residente al crear la reserva"""
         if hasattr(self.request.user, 'residente_profile'):
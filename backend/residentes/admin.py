@@ -6,7 +6,7 @@ from .models import Residente
 class ResidenteAdmin(admin.ModelAdmin):
     list_display = [
         'nombre_completo',
-        'unidad_habitacional',
+        'unidad',
         'tipo',
         'estado',
         'fecha_ingreso',
@@ -27,7 +27,7 @@ class ResidenteAdmin(admin.ModelAdmin):
         'email',
         'telefono',
         'ci',
-        'unidad_habitacional'
+        'unidad__codigo'
     ]
     
     readonly_fields = [
@@ -47,7 +47,7 @@ class ResidenteAdmin(admin.ModelAdmin):
         }),
         ('Información de Residencia', {
             'fields': (
-                'unidad_habitacional', 
+                'unidad', 
                 'tipo', 
                 'fecha_ingreso', 
                 'estado'
@@ -76,7 +76,7 @@ class ResidenteAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Optimiza las consultas"""
-        return super().get_queryset(request).select_related('usuario')
+        return super().get_queryset(request).select_related('usuario', 'unidad')
     
     actions = ['activar_residentes', 'desactivar_residentes', 'marcar_como_propietarios']
     
@@ -0,0 +1,13 @@
+import django_filters
+
+from .models import Residente
+
+
+class ResidenteFilter(django_filters.FilterSet):
+    """Filtros de residentes; la unidad se filtra por su código (ej: ?unidad_habitacional=A-101)"""
+
+    unidad_habitacional = django_filters.CharFilter(field_name='unidad__codigo')
+
+    class Meta:
+        model = Residente
+        fields = ['estado', 'tipo', 'usuario', 'unidad', 'unidad_habitacional']
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def codigos_a_unidad(apps, schema_editor):
+    """Enlaza cada residente con la unidad de su código (los códigos sin unidad quedan en NULL)"""
+    Residente = apps.get_model('residentes', 'Residente')
+    UnidadHabitacional = apps.get_model('unidades', 'UnidadHabitacional')
+    Residente.objects.exclude(unidad_habitacional__isnull=True).exclude(unidad_habitacional='').update(
+        unidad=Subquery(
+            UnidadHabitacional.objects.filter(codigo=OuterRef('unidad_habitacional')).values('id')[:1]
+        )
+    )
+
+
+def unidad_a_codigos(apps, schema_editor):
+    Residente = apps.get_model('residentes', 'Residente')
+    UnidadHabitacional = apps.get_model('unidades', 'UnidadHabitacional')
+    Residente.objects.filter(unidad__isnull=False).update(
+        unidad_habitacional=Subquery(
+            UnidadHabitacional.objects.filter(id=OuterRef('unidad_id')).values('codigo')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('residentes', '0006_merge_20250929_0502'),
+        ('unidades', '0002_add_codigo_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='residente',
+            name='unidad',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='residentes', to='unidades.unidadhabitacional', verbose_name='Unidad Habitacional'),
+        ),
+        migrations.RunPython(codigos_a_unidad, unidad_a_codigos),
+        migrations.RemoveIndex(
+            model_name='residente',
+            name='residentes__unidad__c50d62_idx',
+        ),
+        migrations.RemoveField(
+            model_name='residente',
+            name='unidad_habitacional',
+        ),
+    ]
@@ -51,13 +51,14 @@ class Residente(models.Model):
         default=""
     )
     
-    # Campo para unidad habitacional (ahora usa directamente el código)
-    unidad_habitacional = models.CharField(
-        max_length=10,
-        verbose_name="Código de Unidad Habitacional",
+    # Unidad habitacional (la API sigue usando el código, ver unidad_habitacional)
+    unidad = models.ForeignKey(
+        'unidades.UnidadHabitacional',
+        on_delete=models.SET_NULL,
+        related_name='residentes',
+        verbose_name="Unidad Habitacional",
         null=True,
-        blank=True,
-        help_text="Código de la unidad (ej: A-101, B-202)"
+        blank=True
     )
     
     tipo = models.CharField(
@@ -103,7 +104,6 @@ class Residente(models.Model):
         verbose_name_plural = "Residentes"
         ordering = ['-fecha_creacion']
         indexes = [
-            models.Index(fields=['unidad_habitacional']),
             models.Index(fields=['fecha_ingreso']),
             models.Index(fields=['tipo']),
         ]
@@ -111,6 +111,25 @@ class Residente(models.Model):
     def __str__(self):
         return f"{self.get_full_name()} - {self.unidad_habitacional or 'Sin unidad'}"
     
+    @property
+    def unidad_habitacional(self):
+        """
+        Código de la unidad (ej: A-101). Se mantiene por compatibilidad con
+        la API basada en códigos; usar select_related('unidad') al listar.
+        """
+        return self.unidad.codigo if self.unidad_id else None
+    
+    @unidad_habitacional.setter
+    def unidad_habitacional(self, codigo):
+        """Asigna la unidad por su código (UnidadHabitacional.DoesNotExist si no existe)"""
+        if not codigo:
+            self.unidad = None
+            return
+        
+        # Importamos aquí para evitar importaciones circulares
+        from unidades.models import UnidadHabitacional
+        self.unidad = UnidadHabitacional.objects.get(codigo=codigo)
+    
     def get_full_name(self):
         """Retorna el nombre completo del residente"""
         return f"{self.nombre} {self.apellido}".strip()
@@ -145,11 +164,6 @@ class Residente(models.Model):
         
     def get_unidad(self):
         """
-        Retorna el objeto UnidadHabitacional relacionado, o None si no hay código de unidad.
+        Retorna el objeto UnidadHabitacional relacionado, o None si no tiene unidad.
         """
-        if not self.unidad_habitacional:
-            return None
-            
-        # Importamos aquí para evitar importaciones circulares
-        from unidades.models import UnidadHabitacional
-        return UnidadHabitacional.find_by_code(self.unidad_habitacional)
\ No newline at end of file
+        return self.unidad
\ No newline at end of file
@@ -5,7 +5,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
 from django.utils import timezone
 from bitacora.utils import registrar_bitacora
+from core.conteos import contar
+from core.importacion import Importador, importar_archivo
 from users.permissions import CanManageResidentes, IsOwnerOrAdmin
+from .filters import ResidenteFilter
 from .models import Residente
 from .serializers import (
     ResidenteSerializer,
@@ -13,18 +16,27 @@ from .serializers import (
     ResidenteUpdateSerializer
 )
 
+# La asignación a unidades se hace aparte (POST /api/unidades/asignar_residentes/)
+# para respetar el máximo de residentes por unidad
+IMPORTADOR = Importador(
+    Residente,
+    clave="ci",
+    campos=["ci", "nombre", "apellido", "email", "telefono", "tipo", "fecha_ingreso", "estado"],
+    obligatorias=["nombre", "apellido", "email", "telefono", "tipo", "fecha_ingreso"],
+)
+
 
 class ResidenteViewSet(viewsets.ModelViewSet):
     """ViewSet para el CRUD de residentes"""
 
-    queryset = Residente.objects.all()
+    queryset = Residente.objects.select_related("unidad")
     serializer_class = ResidenteSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     # Campos válidos para filtrado/búsqueda/ordenamiento
-    filterset_fields = ["estado", "tipo", "usuario", "unidad_habitacional"]
-    search_fields = ["nombre", "apellido", "email", "ci", "unidad_habitacional"]
-    ordering_fields = ["nombre", "fecha_creacion", "fecha_ingreso", "unidad_habitacional"]
+    filterset_class = ResidenteFilter
+    search_fields = ["nombre", "apellido", "email", "ci", "unidad__codigo"]
+    ordering_fields = ["nombre", "fecha_creacion", "fecha_ingreso", "unidad__codigo"]
     ordering = ["-fecha_creacion"]
 
     def get_serializer_class(self):
@@ -115,24 +127,39 @@ class ResidenteViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        queryset = self.get_queryset()
+        # Sin completar: por_tipo solo incluye los tipos con residentes
+        conteos = contar(
+            self.get_queryset(),
+            dimensiones=['estado', 'tipo'],
+            condiciones={
+                'nuevos_este_mes': models.Q(fecha_creacion__gte=timezone.now().replace(day=1)),
+            },
+            completar=False,
+        )
+        por_estado = conteos['estado']
 
         stats = {
-            'total': queryset.count(),
-            'activos': queryset.filter(estado='activo').count(),
-            'inactivos': queryset.filter(estado='inactivo').count(),
-            'suspendidos': queryset.filter(estado='suspendido').count(),
-            'en_proceso': queryset.filter(estado='en_proceso').count(),
-            'por_tipo': dict(queryset.values('tipo').annotate(
-                count=models.Count('id')
-            ).values_list('tipo', 'count')),
-            'nuevos_este_mes': queryset.filter(
-                fecha_creacion__gte=timezone.now().replace(day=1)
-            ).count(),
+            'total': conteos['total'],
+            'activos': por_estado.get('activo', 0),
+            'inactivos': por_estado.get('inactivo', 0),
+            'suspendidos': por_estado.get('suspendido', 0),
+            'en_proceso': por_estado.get('en_proceso', 0),
+            'por_tipo': conteos['tipo'],
+            'nuevos_este_mes': conteos['nuevos_este_mes'],
         }
 
         return Response(stats)
 
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        """Alta o actualización masiva de residentes por CI desde CSV o XLSX"""
+        if not request.user.tiene_permiso("gestionar_residentes"):
+            return Response(
+                {"error": "No tienes permisos para importar residentes"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return importar_archivo(request, IMPORTADOR, "residentes", "RESIDENTES")
+
     @action(detail=False, methods=["get"])
     def disponibles_para_usuario(self, request):
         """Lista residentes disponibles para vincular con usuarios"""
@@ -152,7 +179,7 @@ class ResidenteViewSet(viewsets.ModelViewSet):
             'email',
             'ci',
             'telefono',
-            'unidad_habitacional'
+            unidad_habitacional=models.F('unidad__codigo')
         )
         
         return Response(list(residentes_disponibles))
@@ -168,7 +195,7 @@ class ResidenteViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        queryset = Residente.objects.filter(unidad_habitacional=unidad)
+        queryset = Residente.objects.select_related('usuario', 'unidad').filter(unidad__codigo=unidad)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -150,10 +150,9 @@ class ResidenteSeeder(BaseSeeder):
                 # Buscar la unidad correspondiente por su código
                 unidad = unidades_disponibles.get(codigo_unidad)
                 
-                # Si encontramos la unidad, asignamos su código
-                if codigo_unidad in unidades_disponibles:
-                    # Asignar el código de unidad directamente
-                    residente_data["unidad_habitacional"] = codigo_unidad
+                # Si encontramos la unidad, la asignamos
+                if unidad:
+                    residente_data["unidad"] = unidad
                 else:
                     sin_unidad += 1
                     print(f"⚠️ No se encontró la unidad con código: {codigo_unidad}")
@@ -165,9 +164,9 @@ class ResidenteSeeder(BaseSeeder):
                 )
                 
                 # Si ya existía pero no tenía unidad asignada, actualizamos
-                if not created and codigo_unidad in unidades_disponibles and not residente.unidad_habitacional:
-                    residente.unidad_habitacional = codigo_unidad
-                    residente.save(update_fields=['unidad_habitacional'])
+                if not created and unidad and not residente.unidad_id:
+                    residente.unidad = unidad
+                    residente.save(update_fields=['unidad'])
                     actualizados += 1
                     print(f"↻ Residente actualizado: {residente.nombre} {residente.apellido} - Unidad {codigo_unidad}")
                 elif created:
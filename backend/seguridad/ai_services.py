@@ -15,6 +15,8 @@ from django.core.files.base import ContentFile
 import json
 from .plate_recognizer import plate_recognizer
 
+from core.metricas import medir_externo
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +46,7 @@ class AWSRekognitionService:
             self.client = None
             self.available = False
 
+    @medir_externo("rekognition")
     def crear_coleccion(self) -> Dict[str, Any]:
         """Crea una colección de rostros en AWS Rekognition"""
         if not self.available:
@@ -69,6 +72,7 @@ class AWSRekognitionService:
             logger.error(f"Error creando colección: {e}")
             return {"exito": False, "error": str(e)}
 
+    @medir_externo("rekognition")
     def indexar_rostro(self, imagen_bytes: bytes, persona_id: str) -> Dict[str, Any]:
         """Indexa un rostro en la colección de AWS Rekognition"""
         if not self.available:
@@ -104,6 +108,7 @@ class AWSRekognitionService:
             logger.error(f"Error indexando rostro: {e}")
             return {"exito": False, "error": str(e)}
 
+    @medir_externo("rekognition")
     def buscar_rostro(
         self, imagen_bytes: bytes, umbral_confianza: float = 80.0
     ) -> Dict[str, Any]:
@@ -137,6 +142,7 @@ class AWSRekognitionService:
             logger.error(f"Error buscando rostro: {e}")
             return {"exito": False, "error": str(e)}
 
+    @medir_externo("rekognition")
     def eliminar_rostro(self, face_id: str) -> Dict[str, Any]:
         """Elimina un rostro de la colección"""
         if not self.available:
@@ -167,6 +173,7 @@ class GoogleVisionService:
             self.client = None
             self.available = False
 
+    @medir_externo("google_vision")
     def extraer_texto_placa(self, imagen_bytes: bytes) -> Dict[str, Any]:
         """Extrae texto de una imagen de placa usando Google Vision OCR"""
         if not self.available:
@@ -271,6 +278,7 @@ class GoogleVisionService:
 
         return None
 
+    @medir_externo("google_vision")
     def detectar_vehiculo(self, imagen_bytes: bytes) -> Dict[str, Any]:
         """Detecta tipo de vehículo en la imagen"""
         if not self.available:
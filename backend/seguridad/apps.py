@@ -5,3 +5,7 @@ class SeguridadConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "seguridad"
     verbose_name = "Módulo de Seguridad"
+
+    def ready(self):
+        """Se ejecuta cuando la aplicación está lista"""
+        import seguridad.signals  # Publicación de alertas en tiempo real
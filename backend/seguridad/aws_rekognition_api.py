@@ -10,6 +10,8 @@ import logging
 from django.conf import settings
 import os
 
+from core.metricas import medir_externo
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +38,7 @@ class AWSRekognitionService:
             self.client = None
             self.available = False
 
+    @medir_externo("rekognition")
     def create_collection(self) -> Dict[str, Any]:
         """Crear colección de caras"""
         try:
@@ -53,6 +56,7 @@ class AWSRekognitionService:
         except Exception as e:
             return {"exito": False, "error": f"Error creando colección: {str(e)}"}
 
+    @medir_externo("rekognition")
     def index_face(
         self, image_bytes: bytes, face_id: str, external_image_id: str
     ) -> Dict[str, Any]:
@@ -85,6 +89,7 @@ class AWSRekognitionService:
         except Exception as e:
             return {"exito": False, "error": f"Error indexando cara: {str(e)}"}
 
+    @medir_externo("rekognition")
     def search_faces(
         self, image_bytes: bytes, threshold: float = 80.0
     ) -> Dict[str, Any]:
@@ -118,6 +123,7 @@ class AWSRekognitionService:
         except Exception as e:
             return {"exito": False, "error": f"Error buscando caras: {str(e)}"}
 
+    @medir_externo("rekognition")
     def detect_faces(self, image_bytes: bytes) -> Dict[str, Any]:
         """Detectar caras en una imagen"""
         try:
@@ -151,6 +157,7 @@ class AWSRekognitionService:
         except Exception as e:
             return {"exito": False, "error": f"Error detectando caras: {str(e)}"}
 
+    @medir_externo("rekognition")
     def delete_face(self, face_id: str) -> Dict[str, Any]:
         """Eliminar una cara de la colección"""
         try:
@@ -167,6 +174,7 @@ class AWSRekognitionService:
         except Exception as e:
             return {"exito": False, "error": f"Error eliminando cara: {str(e)}"}
 
+    @medir_externo("rekognition")
     def list_faces(self) -> Dict[str, Any]:
         """Listar todas las caras en la colección"""
         try:
@@ -10,6 +10,8 @@ import json
 from typing import Dict, Any, Optional
 import logging
 
+from core.metricas import medir_externo
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,7 @@ class AzureVisionService:
         self.vision_url = self.endpoint + "vision/v3.2/read/analyze"
         self.available = True
 
+    @medir_externo("azure_vision")
     def recognize_plate_azure(self, image_bytes: bytes) -> Dict[str, Any]:
         """Reconocimiento de placas usando Azure Vision"""
         try:
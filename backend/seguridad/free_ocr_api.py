@@ -9,6 +9,8 @@ import json
 from typing import Dict, Any, Optional
 import logging
 
+from core.metricas import medir_externo
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class FreeOCRService:
         self.api_url = "https://api.ocr.space/parse/image"
         self.available = True
 
+    @medir_externo("ocr_space")
     def recognize_plate_free(self, image_bytes: bytes) -> Dict[str, Any]:
         """Reconocimiento de placas usando API gratuita"""
         try:
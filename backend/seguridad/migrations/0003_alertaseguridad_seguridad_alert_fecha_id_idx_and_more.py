@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-19 12:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seguridad', '0002_alter_alertaseguridad_fecha_hora_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertaseguridad',
+            index=models.Index(fields=['fecha_hora', 'id'], name='seguridad_alert_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registroacceso',
+            index=models.Index(fields=['fecha_hora', 'id'], name='seguridad_acces_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registrovehiculo',
+            index=models.Index(fields=['fecha_hora', 'id'], name='seguridad_vehic_fecha_id_idx'),
+        ),
+    ]
@@ -118,6 +118,9 @@ class RegistroAcceso(models.Model):
         verbose_name = "Registro de Acceso"
         verbose_name_plural = "Registros de Acceso"
         ordering = ["-fecha_hora"]
+        indexes = [
+            models.Index(fields=["fecha_hora", "id"], name="seguridad_acces_fecha_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.persona.nombre if self.persona else 'Desconocido'} - {self.tipo_acceso} - {self.resultado}"
@@ -168,6 +171,9 @@ class RegistroVehiculo(models.Model):
         verbose_name = "Registro de Vehículo"
         verbose_name_plural = "Registros de Vehículos"
         ordering = ["-fecha_hora"]
+        indexes = [
+            models.Index(fields=["fecha_hora", "id"], name="seguridad_vehic_fecha_id_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -233,6 +239,9 @@ class AlertaSeguridad(models.Model):
         verbose_name = "Alerta de Seguridad"
         verbose_name_plural = "Alertas de Seguridad"
         ordering = ["-fecha_hora"]
+        indexes = [
+            models.Index(fields=["fecha_hora", "id"], name="seguridad_alert_fecha_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.titulo} - {self.severidad}"
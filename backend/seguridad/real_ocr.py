@@ -8,6 +8,8 @@ from google.cloud import vision
 from typing import Dict, Any, Optional
 import logging
 
+from core.metricas import medir_externo
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,7 @@ class RealPlateRecognizer:
             logger.error(f"Error configurando Google Vision: {e}")
             self.available = False
 
+    @medir_externo("google_vision")
     def recognize_plate_real(self, image_bytes: bytes) -> Dict[str, Any]:
         """Reconocimiento REAL de placas"""
         if not self.available:
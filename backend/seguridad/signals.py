@@ -0,0 +1,25 @@
+# Señales para el módulo de seguridad
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.eventos import publicar
+
+from .models import AlertaSeguridad
+
+
+@receiver(post_save, sender=AlertaSeguridad)
+def publicar_alerta(sender, instance, created, **kwargs):
+    """Envía las alertas nuevas al personal administrativo por el canal en tiempo real"""
+    if not created:
+        return
+    publicar(
+        'alerta_seguridad',
+        {
+            'id': instance.id,
+            'tipo': instance.tipo,
+            'severidad': instance.severidad,
+            'titulo': instance.titulo,
+            'fecha_hora': instance.fecha_hora,
+        },
+        administrativos=True,
+    )
@@ -37,6 +37,24 @@ from .serializers import (
 from .ai_services import seguridad_ai
 from users.decorators import requiere_permisos
 from bitacora.utils import registrar_bitacora
+from core.exportacion import exportar_queryset
+from core.importacion import Importador, importar_archivo
+from core.pagination import FechaCursorPagination
+
+
+IMPORTADOR_PERSONAS = Importador(
+    PersonaAutorizada,
+    clave="ci",
+    campos=["ci", "nombre", "telefono", "email", "tipo_acceso", "activo"],
+    obligatorias=["nombre"],
+)
+
+IMPORTADOR_VEHICULOS = Importador(
+    VehiculoAutorizado,
+    clave="placa",
+    campos=["placa", "propietario", "tipo_vehiculo", "marca", "modelo", "color", "activo"],
+    obligatorias=["propietario"],
+)
 
 
 class PersonaAutorizadaViewSet(viewsets.ModelViewSet):
@@ -104,6 +122,19 @@ class PersonaAutorizadaViewSet(viewsets.ModelViewSet):
             )
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        """Alta o actualización masiva de personas por CI desde CSV o XLSX"""
+        if not request.user.tiene_permisos(
+            ["seguridad.crear_personas", "seguridad.editar_personas"]
+        ):
+            return Response(
+                {"detail": "Sin permisos"}, status=status.HTTP_403_FORBIDDEN
+            )
+        return importar_archivo(
+            request, IMPORTADOR_PERSONAS, "personas autorizadas", "SEGURIDAD"
+        )
+
 
 class VehiculoAutorizadoViewSet(viewsets.ModelViewSet):
     """CRUD para vehículos autorizados"""
@@ -170,11 +201,48 @@ class VehiculoAutorizadoViewSet(viewsets.ModelViewSet):
             )
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=["post"])
+    def importar(self, request):
+        """Alta o actualización masiva de vehículos por placa desde CSV o XLSX"""
+        if not request.user.tiene_permisos(
+            ["seguridad.crear_vehiculos", "seguridad.editar_vehiculos"]
+        ):
+            return Response(
+                {"detail": "Sin permisos"}, status=status.HTTP_403_FORBIDDEN
+            )
+        return importar_archivo(
+            request, IMPORTADOR_VEHICULOS, "vehículos autorizados", "SEGURIDAD"
+        )
+
+
+COLUMNAS_EXPORTACION_ACCESO = [
+    ("id", "id"),
+    ("fecha_hora", "fecha_hora"),
+    ("persona", "persona__nombre"),
+    ("ci", "persona__ci"),
+    ("tipo_acceso", "tipo_acceso"),
+    ("resultado", "resultado"),
+    ("confianza", "confianza"),
+    ("observaciones", "observaciones"),
+]
+
+COLUMNAS_EXPORTACION_VEHICULO = [
+    ("id", "id"),
+    ("fecha_hora", "fecha_hora"),
+    ("placa", "placa"),
+    ("propietario", "vehiculo__propietario"),
+    ("tipo_vehiculo", "tipo_vehiculo"),
+    ("resultado", "resultado"),
+    ("confianza", "confianza"),
+    ("texto_detectado", "texto_detectado"),
+    ("observaciones", "observaciones"),
+]
+
 
 class RegistroAccesoViewSet(viewsets.ReadOnlyModelViewSet):
     """Vista de solo lectura para registros de acceso"""
 
-    queryset = RegistroAcceso.objects.all()
+    queryset = RegistroAcceso.objects.select_related("persona")
     serializer_class = RegistroAccesoSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [
@@ -185,7 +253,8 @@ class RegistroAccesoViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ["tipo_acceso", "resultado", "persona"]
     search_fields = ["persona__nombre", "persona__ci"]
     ordering_fields = ["fecha_hora", "confianza"]
-    ordering = ["-fecha_hora"]
+    ordering = ["-fecha_hora", "-id"]
+    pagination_class = FechaCursorPagination
 
     def list(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
@@ -198,11 +267,23 @@ class RegistroAccesoViewSet(viewsets.ReadOnlyModelViewSet):
             )
         return super().list(request, *args, **kwargs)
 
+    @action(detail=False, methods=["get"])
+    def exportar(self, request):
+        """Exporta los registros de acceso filtrados (CSV o NDJSON)"""
+        if not request.user.tiene_permisos(["seguridad.ver_registros_acceso"]):
+            return Response(
+                {"detail": "Sin permisos"}, status=status.HTTP_403_FORBIDDEN
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(
+            request, queryset, COLUMNAS_EXPORTACION_ACCESO, "registros_acceso"
+        )
+
 
 class RegistroVehiculoViewSet(viewsets.ReadOnlyModelViewSet):
     """Vista de solo lectura para registros de vehículos"""
 
-    queryset = RegistroVehiculo.objects.all()
+    queryset = RegistroVehiculo.objects.select_related("vehiculo")
     serializer_class = RegistroVehiculoSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [
@@ -213,7 +294,8 @@ class RegistroVehiculoViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ["resultado", "tipo_vehiculo", "vehiculo"]
     search_fields = ["placa", "vehiculo__propietario"]
     ordering_fields = ["fecha_hora", "confianza"]
-    ordering = ["-fecha_hora"]
+    ordering = ["-fecha_hora", "-id"]
+    pagination_class = FechaCursorPagination
 
     def list(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
@@ -226,11 +308,23 @@ class RegistroVehiculoViewSet(viewsets.ReadOnlyModelViewSet):
             )
         return super().list(request, *args, **kwargs)
 
+    @action(detail=False, methods=["get"])
+    def exportar(self, request):
+        """Exporta los registros de vehículos filtrados (CSV o NDJSON)"""
+        if not request.user.tiene_permisos(["seguridad.ver_registros_vehiculos"]):
+            return Response(
+                {"detail": "Sin permisos"}, status=status.HTTP_403_FORBIDDEN
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        return exportar_queryset(
+            request, queryset, COLUMNAS_EXPORTACION_VEHICULO, "registros_vehiculos"
+        )
+
 
 class AlertaSeguridadViewSet(viewsets.ModelViewSet):
     """CRUD para alertas de seguridad"""
 
-    queryset = AlertaSeguridad.objects.all()
+    queryset = AlertaSeguridad.objects.select_related("resuelta_por")
     serializer_class = AlertaSeguridadSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [
@@ -241,7 +335,8 @@ class AlertaSeguridadViewSet(viewsets.ModelViewSet):
     filterset_fields = ["tipo", "severidad", "resuelta"]
     search_fields = ["titulo", "descripcion"]
     ordering_fields = ["fecha_hora", "severidad"]
-    ordering = ["-fecha_hora"]
+    ordering = ["-fecha_hora", "-id"]
+    pagination_class = FechaCursorPagination
 
     def list(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
@@ -9,8 +9,12 @@ class UnidadHabitacionalAdmin(admin.ModelAdmin):
     search_fields = ('direccion',)
     readonly_fields = ('fecha_creacion', 'fecha_actualizacion')
     
+    def get_queryset(self, request):
+        """Optimiza las consultas"""
+        return super().get_queryset(request).prefetch_related('residentes')
+    
     def residentes_display(self, obj):
-        residentes = obj.residentes
+        residentes = obj.residentes.all()
         if residentes:
             return ", ".join([str(r.nombre_completo) for r in residentes])
         return "Sin residentes"
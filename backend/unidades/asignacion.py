@@ -0,0 +1,112 @@
+"""
+Asignación de residentes a unidades habitacionales.
+
+Cada asignación reemplaza la lista completa de residentes de las unidades
+indicadas con dos UPDATE, sin importar cuántas sean: uno libera a los que
+salen y otro (con CASE por residente) asigna a los que entran.
+
+Las filas de las unidades y de los residentes involucrados se bloquean con
+``SELECT ... FOR UPDATE`` (en orden de id, para no provocar deadlocks) y las
+reglas se verifican dentro del bloqueo: dos administradores que asignan a la
+vez se serializan y el segundo ve el resultado del primero, así que no se
+puede superar el máximo de residentes ni quitar un residente a otra unidad.
+"""
+
+from django.db import transaction
+from django.db.models import Case, Q, Value, When
+
+from core.dashboard import invalidar_modelo
+from residentes.models import Residente
+
+from .models import UnidadHabitacional
+
+MAX_RESIDENTES = 2
+MAX_UNIDADES_LOTE = 200
+
+
+class AsignacionInvalida(Exception):
+    """Errores de una asignación por unidad: {unidad_id: [mensajes]}"""
+
+    def __init__(self, errores):
+        super().__init__(errores)
+        self.errores = errores
+
+
+def _validar_listas(asignaciones):
+    """Reglas que no requieren la base de datos. Retorna {residente_id: unidad_id}"""
+    errores = {}
+    destino = {}
+    for unidad_id, residente_ids in asignaciones.items():
+        if len(residente_ids) > MAX_RESIDENTES:
+            errores.setdefault(unidad_id, []).append(
+                f"Una unidad habitacional no puede tener más de {MAX_RESIDENTES} residentes."
+            )
+        for residente_id in residente_ids:
+            if residente_id in destino:
+                errores.setdefault(unidad_id, []).append(
+                    f"El residente {residente_id} no puede asignarse a más de una unidad."
+                )
+            destino[residente_id] = unidad_id
+    if errores:
+        raise AsignacionInvalida(errores)
+    return destino
+
+
+def asignar(asignaciones):
+    """
+    Reemplaza los residentes de cada unidad según ``asignaciones``
+    ({unidad_id: [residente_id, ...]}). Si alguna unidad no es válida lanza
+    AsignacionInvalida y no se modifica nada. Retorna
+    {'liberados': n, 'asignados': n}.
+    """
+    asignaciones = {
+        unidad_id: list(dict.fromkeys(residente_ids or []))
+        for unidad_id, residente_ids in asignaciones.items()
+    }
+    destino = _validar_listas(asignaciones)
+
+    with transaction.atomic():
+        existentes = set(
+            UnidadHabitacional.objects.select_for_update()
+            .filter(id__in=asignaciones).order_by('id').values_list('id', flat=True)
+        )
+        actuales = dict(
+            Residente.objects.select_for_update()
+            .filter(Q(id__in=destino) | Q(unidad_id__in=asignaciones))
+            .order_by('id').values_list('id', 'unidad_id')
+        )
+
+        errores = {}
+        for unidad_id in asignaciones:
+            if unidad_id not in existentes:
+                errores.setdefault(unidad_id, []).append("La unidad habitacional no existe.")
+        for residente_id, unidad_id in destino.items():
+            if residente_id not in actuales:
+                errores.setdefault(unidad_id, []).append(f"El residente {residente_id} no existe.")
+            elif actuales[residente_id] is not None and actuales[residente_id] not in asignaciones:
+                errores.setdefault(unidad_id, []).append(
+                    f"El residente {residente_id} ya está asignado a otra unidad."
+                )
+        if errores:
+            raise AsignacionInvalida(errores)
+
+        liberados = Residente.objects.filter(
+            unidad_id__in=asignaciones
+        ).exclude(id__in=destino).update(unidad=None)
+
+        cambios = {
+            residente_id: unidad_id
+            for residente_id, unidad_id in destino.items()
+            if actuales[residente_id] != unidad_id
+        }
+        asignados = 0
+        if cambios:
+            asignados = Residente.objects.filter(id__in=cambios).update(
+                unidad_id=Case(
+                    *[When(id=residente_id, then=Value(unidad_id)) for residente_id, unidad_id in cambios.items()]
+                )
+            )
+        if liberados or asignados:
+            # update() no emite post_save: los residentes sin unidad cambiaron
+            invalidar_modelo(Residente)
+    return {'liberados': liberados, 'asignados': asignados}
@@ -83,41 +83,24 @@ class UnidadHabitacional(models.Model):
     def __str__(self):
         return f"{self.direccion} - {self.get_estado_display()}"
     
-    @property
-    def residentes(self):
-        """Retorna los residentes asociados a esta unidad"""
-        from residentes.models import Residente
-        return Residente.objects.filter(unidad_habitacional=self.codigo)
+    # Los residentes de la unidad están en self.residentes (FK Residente.unidad)
     
     @property
     def tiene_cupo_disponible(self):
         """Verifica si la unidad tiene cupo para más residentes (máx. 2)"""
-        from residentes.models import Residente
-        return Residente.objects.filter(unidad_habitacional=self.codigo).count() < 2
+        # Con prefetch_related('residentes') no consulta la base de datos
+        return self.residentes.count() < 2
     
     def asignar_residentes(self, residente_ids):
         """
         Asigna los residentes a esta unidad y libera cualquier residente
-        que ya no esté en la lista
+        que ya no esté en la lista (dos UPDATE con las filas bloqueadas,
+        ver unidades.asignacion). Lanza AsignacionInvalida si se supera el
+        máximo o algún residente pertenece a otra unidad.
         """
-        from residentes.models import Residente
-        
-        # Obtener residentes actuales con este código de unidad
-        residentes_actuales = list(Residente.objects.filter(unidad_habitacional=self.codigo))
-        
-        # Liberar los residentes que ya no están en la lista
-        for residente in residentes_actuales:
-            if residente.id not in residente_ids:
-                residente.unidad_habitacional = None
-                residente.save(update_fields=['unidad_habitacional'])
-        
-        # Asignar los nuevos residentes
-        if residente_ids:
-            nuevos_residentes = Residente.objects.filter(id__in=residente_ids)
-            for residente in nuevos_residentes:
-                residente.unidad_habitacional = self.codigo
-                residente.save(update_fields=['unidad_habitacional'])
-        
+        from .asignacion import asignar
+
+        asignar({self.id: residente_ids or []})
         return True
     
     @classmethod
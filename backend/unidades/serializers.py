@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.db import transaction
 from residentes.models import Residente
+from .asignacion import MAX_RESIDENTES, MAX_UNIDADES_LOTE, AsignacionInvalida
 from .models import UnidadHabitacional
 
 
@@ -66,45 +67,28 @@ class UnidadHabitacionalSerializer(serializers.ModelSerializer):
         """
         Normalizar residente_ids:
         - Si es None o no se proporciona, se establece como lista vacía
-        - Validar que no tenga más de 2 elementos
+        - Validar que no tenga más de 2 elementos ni repetidos
+        La existencia y la unidad actual de cada residente se verifican al
+        asignar, con las filas bloqueadas (ver unidades.asignacion).
         """
         # Normalizar a lista vacía si es None
         if value is None:
             return []
         
-        # Validar máximo 2 residentes
-        if len(value) > 2:
-            raise serializers.ValidationError("Una unidad habitacional no puede tener más de 2 residentes.")
-        
-        # Verificar que los residentes existan
-        residentes_count = Residente.objects.filter(id__in=value).count()
-        if residentes_count != len(value):
-            raise serializers.ValidationError("Uno o más residentes no existen.")
-        
-        # Verificar que no estén asignados a otra unidad (excepto si es una actualización)
-        if self.instance:
-            # En caso de actualización, excluir la unidad actual
-            residentes_en_otra_unidad = Residente.objects.filter(
-                id__in=value, 
-                unidad_habitacional__isnull=False
-            ).exclude(
-                unidad_habitacional=self.instance.codigo
-            )
-        else:
-            # En caso de creación
-            residentes_en_otra_unidad = Residente.objects.filter(
-                id__in=value, 
-                unidad_habitacional__isnull=False
-            )
-        
-        if residentes_en_otra_unidad.exists():
-            residentes_ocupados = ", ".join([str(r) for r in residentes_en_otra_unidad])
+        value = list(dict.fromkeys(value))
+        if len(value) > MAX_RESIDENTES:
             raise serializers.ValidationError(
-                f"Los siguientes residentes ya están asignados a otra unidad: {residentes_ocupados}"
+                f"Una unidad habitacional no puede tener más de {MAX_RESIDENTES} residentes."
             )
-        
         return value
     
+    def _asignar(self, unidad, residente_ids):
+        try:
+            unidad.asignar_residentes(residente_ids)
+        except AsignacionInvalida as error:
+            # Dentro de la transacción de create/update: se revierte todo
+            raise serializers.ValidationError({'residente_ids': error.errores[unidad.id]})
+    
     @transaction.atomic
     def create(self, validated_data):
         """
@@ -117,7 +101,7 @@ class UnidadHabitacionalSerializer(serializers.ModelSerializer):
         unidad = super().create(validated_data)
         
         # Asignar residentes
-        unidad.asignar_residentes(residente_ids)
+        self._asignar(unidad, residente_ids)
         
         return unidad
     
@@ -134,7 +118,7 @@ class UnidadHabitacionalSerializer(serializers.ModelSerializer):
         
         # Reasignar residentes solo si se especificó el campo
         if residente_ids is not None:
-            unidad.asignar_residentes(residente_ids)
+            self._asignar(unidad, residente_ids)
         
         return unidad
 
@@ -160,4 +144,24 @@ class UnidadHabitacionalEstadoSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UnidadHabitacional
-        fields = ['estado']
\ No newline at end of file
+        fields = ['estado']
+
+class AsignacionUnidadSerializer(serializers.Serializer):
+    """Residentes de una unidad dentro de una asignación en lote"""
+    unidad = serializers.IntegerField()
+    residente_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=True, max_length=MAX_RESIDENTES
+    )
+
+
+class AsignacionLoteSerializer(serializers.Serializer):
+    """Reasignación de residentes de varias unidades en una sola operación"""
+    asignaciones = AsignacionUnidadSerializer(
+        many=True, allow_empty=False, max_length=MAX_UNIDADES_LOTE
+    )
+
+    def validate_asignaciones(self, value):
+        unidades = [asignacion['unidad'] for asignacion in value]
+        if len(unidades) != len(set(unidades)):
+            raise serializers.ValidationError("Cada unidad puede aparecer una sola vez.")
+        return value
@@ -210,4 +210,169 @@ class UnidadHabitacionalTests(TestCase):
         
         # Intentar borrar
         response = self.client.delete(url)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+class UnidadResidentesFKTests(TestCase):
+    """Relación Residente -> UnidadHabitacional y listado sin N+1"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_fk", email="admin_fk@test.com", password="password123", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _crear_unidades(self, inicio, cantidad):
+        for numero in range(inicio, inicio + cantidad):
+            unidad = UnidadHabitacional.objects.create(
+                codigo=f"A-{numero:03d}", direccion=f"Torre A {numero}"
+            )
+            Residente.objects.create(
+                nombre=f"Residente {numero}", apellido="Test", ci=f"ci-{numero}",
+                email=f"r{numero}@test.com", tipo="propietario",
+                fecha_ingreso=date.today(), unidad=unidad
+            )
+
+    def _consultas_listado(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(reverse('unidades-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(consultas)
+
+    def test_listado_con_consultas_constantes(self):
+        self._crear_unidades(1, 2)
+        _, pocas = self._consultas_listado()
+        self._crear_unidades(3, 8)
+        response, muchas = self._consultas_listado()
+
+        self.assertEqual(pocas, muchas)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(response.data['results'][0]['residentes']), 1)
+
+    def test_codigo_como_compatibilidad(self):
+        unidad = UnidadHabitacional.objects.create(codigo="B-101", direccion="Torre B 101")
+        residente = Residente.objects.create(
+            nombre="Ana", apellido="Paz", ci="fk-1", email="ana_fk@test.com",
+            tipo="inquilino", fecha_ingreso=date.today(), unidad_habitacional="B-101"
+        )
+        self.assertEqual(residente.unidad, unidad)
+        self.assertEqual(residente.unidad_habitacional, "B-101")
+        self.assertTrue(unidad.tiene_cupo_disponible)
+
+        with self.assertRaises(UnidadHabitacional.DoesNotExist):
+            residente.unidad_habitacional = "Z-999"
+
+        # Al eliminar la unidad el residente queda sin unidad
+        unidad.delete()
+        residente.refresh_from_db()
+        self.assertIsNone(residente.unidad_habitacional)
+
+
+class AsignacionResidentesTests(TestCase):
+    """Asignación de residentes por conjuntos (unidades.asignacion)"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin_asig", email="admin_asig@test.com", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.unidades = [
+            UnidadHabitacional.objects.create(codigo=f"C-{numero}", direccion=f"Torre C {numero}")
+            for numero in (101, 102, 103)
+        ]
+        self.residentes = [
+            Residente.objects.create(
+                nombre=f"Residente {numero}", apellido="Asig", ci=f"asig-{numero}",
+                email=f"asig{numero}@test.com", tipo="propietario", fecha_ingreso=date.today()
+            )
+            for numero in range(5)
+        ]
+
+    def _ids(self, *indices):
+        return [self.residentes[indice].id for indice in indices]
+
+    def _unidad_de(self, indice):
+        self.residentes[indice].refresh_from_db()
+        return self.residentes[indice].unidad
+
+    def test_asignar_con_consultas_constantes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        unidad = self.unidades[0]
+        unidad.asignar_residentes(self._ids(0, 1))
+        with CaptureQueriesContext(connection) as consultas:
+            unidad.asignar_residentes(self._ids(1, 2))
+        # Dos bloqueos (unidades, residentes) + liberar + asignar, sin contar savepoints
+        actualizaciones = [c for c in consultas if c['sql'].startswith('UPDATE')]
+        self.assertEqual(len(actualizaciones), 2)
+        self.assertIsNone(self._unidad_de(0))
+        self.assertEqual(self._unidad_de(1), unidad)
+        self.assertEqual(self._unidad_de(2), unidad)
+
+    def test_no_quita_residentes_de_otra_unidad(self):
+        self.unidades[0].asignar_residentes(self._ids(0))
+        url = reverse('unidades-detail', args=[self.unidades[1].id])
+        response = self.client.patch(url, {'residente_ids': self._ids(0, 1)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('residente_ids', response.data)
+        self.assertEqual(self._unidad_de(0), self.unidades[0])
+        self.assertIsNone(self._unidad_de(1))
+
+    def test_asignacion_en_lote(self):
+        self.unidades[0].asignar_residentes(self._ids(0, 1))
+        url = reverse('unidades-asignar-residentes')
+        # Intercambio entre unidades incluidas en el mismo lote
+        response = self.client.post(url, {'asignaciones': [
+            {'unidad': self.unidades[0].id, 'residente_ids': self._ids(2)},
+            {'unidad': self.unidades[1].id, 'residente_ids': self._ids(0, 1)},
+            {'unidad': self.unidades[2].id, 'residente_ids': []},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unidades'], 3)
+        self.assertEqual(self._unidad_de(0), self.unidades[1])
+        self.assertEqual(self._unidad_de(2), self.unidades[0])
+        from bitacora.models import Bitacora
+        self.assertEqual(Bitacora.objects.filter(accion="Asignar Residentes").count(), 3)
+
+    def test_lote_invalido_no_cambia_nada(self):
+        self.unidades[2].asignar_residentes(self._ids(4))
+        url = reverse('unidades-asignar-residentes')
+        response = self.client.post(url, {'asignaciones': [
+            {'unidad': self.unidades[0].id, 'residente_ids': self._ids(0)},
+            {'unidad': self.unidades[1].id, 'residente_ids': self._ids(4)},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(self.unidades[1].id), response.data['asignaciones'])
+        self.assertIsNone(self._unidad_de(0))
+        self.assertEqual(self._unidad_de(4), self.unidades[2])
+
+        response = self.client.post(url, {'asignaciones': [
+            {'unidad': self.unidades[0].id, 'residente_ids': self._ids(0, 1, 2)},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_importar_unidades(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        archivo = SimpleUploadedFile(
+            "unidades.csv",
+            b"codigo,direccion,estado\nC-101,Torre C 101 (nueva),OCUPADA\nD-201,Torre D 201,\nX1,Sin formato,\n",
+        )
+        response = self.client.post(
+            reverse('unidades-importar'), {'archivo': archivo}, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['creadas'], response.data['actualizadas']), (1, 1))
+        self.assertEqual(response.data['errores'][0]['fila'], 4)
+        self.unidades[0].refresh_from_db()
+        self.assertEqual(self.unidades[0].direccion, "Torre C 101 (nueva)")
+        self.assertEqual(UnidadHabitacional.objects.get(codigo="D-201").estado, "DESOCUPADA")
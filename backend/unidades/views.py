@@ -3,14 +3,25 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django_filters.rest_framework import DjangoFilterBackend
-from bitacora.utils import registrar_bitacora
+from bitacora.utils import registrar_bitacora, registrar_bitacora_lote
+from core.importacion import Importador, importar_archivo
 from users.permissions import IsAdminPortalUser
+from .asignacion import AsignacionInvalida, asignar
 from .models import UnidadHabitacional
 from .serializers import (
     UnidadHabitacionalSerializer,
     UnidadHabitacionalCreateSerializer,
     UnidadHabitacionalUpdateSerializer,
-    UnidadHabitacionalEstadoSerializer
+    UnidadHabitacionalEstadoSerializer,
+    AsignacionLoteSerializer,
+)
+
+
+IMPORTADOR = Importador(
+    UnidadHabitacional,
+    clave="codigo",
+    campos=["codigo", "direccion", "estado", "cantidad_vehiculos"],
+    obligatorias=["direccion"],
 )
 
 
@@ -35,7 +46,8 @@ class CanManageUnidades(permissions.BasePermission):
 class UnidadHabitacionalViewSet(viewsets.ModelViewSet):
     """ViewSet para el CRUD de unidades habitacionales - Refactorizado"""
 
-    queryset = UnidadHabitacional.objects.all()
+    # Los residentes anidados se cargan en una sola consulta para toda la página
+    queryset = UnidadHabitacional.objects.prefetch_related('residentes')
     serializer_class = UnidadHabitacionalSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageUnidades]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -54,6 +66,8 @@ class UnidadHabitacionalViewSet(viewsets.ModelViewSet):
             return UnidadHabitacionalUpdateSerializer
         elif self.action == "cambiar_estado":
             return UnidadHabitacionalEstadoSerializer
+        elif self.action == "asignar_residentes":
+            return AsignacionLoteSerializer
         return UnidadHabitacionalSerializer
     
     def perform_create(self, serializer):
@@ -127,4 +141,47 @@ class UnidadHabitacionalViewSet(viewsets.ModelViewSet):
             
             return Response(serializer.data)
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def importar(self, request):
+        """Alta o actualización masiva de unidades por código desde CSV o XLSX"""
+        return importar_archivo(request, IMPORTADOR, "unidades habitacionales", "UNIDADES")
+
+    @action(detail=False, methods=['post'])
+    def asignar_residentes(self, request):
+        """
+        Reasigna los residentes de varias unidades en una sola operación:
+        {"asignaciones": [{"unidad": 1, "residente_ids": [3, 4]}, ...]}
+
+        Cada lista reemplaza los residentes actuales de su unidad. Todo se
+        aplica o nada: si alguna unidad no es válida se responde 400 con los
+        errores por unidad.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        asignaciones = {
+            asignacion['unidad']: asignacion['residente_ids']
+            for asignacion in serializer.validated_data['asignaciones']
+        }
+
+        try:
+            resultado = asignar(asignaciones)
+        except AsignacionInvalida as error:
+            return Response(
+                {'asignaciones': {str(unidad): mensajes for unidad, mensajes in error.errores.items()}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        codigos = UnidadHabitacional.objects.filter(id__in=asignaciones).values_list('codigo', flat=True)
+        registrar_bitacora_lote(
+            (
+                ("Asignar Residentes", f"Se reasignaron los residentes de la unidad habitacional {codigo}")
+                for codigo in codigos
+            ),
+            modulo="UNIDADES",
+            usuario=request.user,
+            request=request,
+        )
+
+        return Response({'unidades': len(asignaciones), **resultado})
@@ -0,0 +1,25 @@
+"""
+Adaptador de allauth: los correos de cuenta (confirmación de email,
+restablecimiento de contraseña) se encolan en la bandeja de salida en lugar
+de enviarse por SMTP durante la petición.
+"""
+
+from allauth.account.adapter import DefaultAccountAdapter
+from allauth.core import context as allauth_context
+from django.contrib.sites.shortcuts import get_current_site
+
+from notificaciones.correos import encolar_mensaje
+
+
+class CuentaAdapter(DefaultAccountAdapter):
+    def send_mail(self, template_prefix, email, context):
+        """Renderiza el correo como allauth y lo deja en la bandeja de salida"""
+        contexto = {
+            "request": allauth_context.request,
+            "email": email,
+            "current_site": get_current_site(allauth_context.request),
+        }
+        contexto.update(context)
+        mensaje = self.render_mail(template_prefix, email, contexto)
+        # p. ej. "account/email/email_confirmation" -> "cuenta:email_confirmation"
+        encolar_mensaje(mensaje, tipo=f"cuenta:{template_prefix.rsplit('/', 1)[-1]}")
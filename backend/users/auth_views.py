@@ -22,6 +22,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import authenticate
 from django.utils import timezone
 from bitacora.utils import registrar_bitacora
+from core.dashboard import calcular_dashboard
 from .models import Rol
 from .serializers import UserSerializer
 from .decorators import requiere_permisos
@@ -289,6 +290,18 @@ def dashboard_data(request):
     return Response(data)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def dashboard_estadisticas(request):
+    """Contadores de todos los módulos visibles para el usuario administrativo"""
+    if not request.user.es_administrativo:
+        return Response(
+            {'error': 'Solo el personal administrativo puede ver estas estadísticas'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    return Response(calcular_dashboard(request.user))
+
+
 def _get_admin_menu_items(user):
     """Obtiene los elementos del menú para administradores"""
     menu_items = []
@@ -381,47 +394,8 @@ def _get_cliente_menu_items():
 
 
 def _get_admin_stats(user):
-    """Obtiene estadísticas para el dashboard administrativo"""
-    stats = {}
-    
-    # Estadísticas de usuarios
-    if user.tiene_permiso('gestionar_usuarios'):
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        stats['usuarios'] = {
-            'total': User.objects.count(),
-            'activos': User.objects.filter(is_active=True).count(),
-            'administrativos': User.objects.filter(rol__es_administrativo=True).count(),
-            'clientes': User.objects.filter(rol__es_administrativo=False).count()
-        }
-    
-    # Estadísticas de conductores
-    if user.tiene_permiso('ver_conductores'):
-        try:
-            from conductores.models import Conductor
-            stats['conductores'] = {
-                'total': Conductor.objects.count(),
-                'activos': Conductor.objects.filter(usuario__is_active=True).count(),
-                'disponibles': Conductor.objects.filter(estado='disponible', usuario__is_active=True).count(),
-                'ocupados': Conductor.objects.filter(estado='ocupado', usuario__is_active=True).count()
-            }
-        except ImportError:
-            pass
-    
-    # Estadísticas de personal
-    if user.tiene_permiso('ver_personal'):
-        try:
-            from personal.models import Personal
-            stats['personal'] = {
-                'total': Personal.objects.count(),
-                'activos': Personal.objects.filter(estado=True).count(),
-                'inactivos': Personal.objects.filter(estado=False).count()
-            }
-        except ImportError:
-            pass
-    
-    return stats
+    """Obtiene estadísticas para el dashboard administrativo (ver core.dashboard)"""
+    return calcular_dashboard(user)
 
 
 def _get_cliente_stats(user):
@@ -5,27 +5,29 @@ Módulo para manejo de verificación móvil con códigos
 import random
 import string
 from datetime import datetime, timedelta
-from django.core.mail import send_mail
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from django.core.cache import cache
-from django.template.loader import render_to_string
+
+from core.cache import espacio
+from notificaciones.correos import encolar
 
 User = get_user_model()
 
+# Compartida entre procesos: el código y el rate limit valen en cualquier worker
+cache = espacio("users:verificacion_movil")
+
 
 def send_verification_code_direct(user_email, username):
     """Envía código de verificación directamente sin usar allauth"""
     from datetime import datetime, timedelta
 
     # Claves de cache
-    cache_key = f"mobile_verification_{user_email}"
-    rate_limit_key = f"mobile_verification_rate_{user_email}"
+    cache_key = f"codigo:{user_email}"
+    rate_limit_key = f"rate:{user_email}"
 
     # Verificar rate limiting (mínimo 60 segundos entre envíos)
     existing_rate = cache.get(rate_limit_key)
@@ -62,27 +64,12 @@ def send_verification_code_direct(user_email, username):
     # Guardar timestamp del envío para rate limiting
     cache.set(rate_limit_key, timezone.now().isoformat(), timeout=300)  # 5 minutos
 
-    # Renderizar template de email
-    context = {
-        "username": username,
-        "verification_code": code,
-        "site_name": "MoviFleet",
-    }
-
-    html_message = render_to_string("account/email/mobile_verification.html", context)
-    text_message = render_to_string("account/email/mobile_verification.txt", context)
-
-    # Enviar email usando el backend de email existente
-    from django.core.mail import EmailMultiAlternatives
-
-    email = EmailMultiAlternatives(
-        subject="Código de verificación - MoviFleet",
-        body=text_message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[user_email],
+    # Se encola: el trabajador de correos lo envía fuera de la petición
+    encolar(
+        "verificacion_movil",
+        [user_email],
+        {"username": username, "verification_code": code, "site_name": "MoviFleet"},
     )
-    email.attach_alternative(html_message, "text/html")
-    email.send(fail_silently=False)
 
     return code
 
@@ -102,7 +89,7 @@ class MobileVerificationService:
         code = MobileVerificationService.generate_verification_code()
 
         # Guardar en cache con expiración de 15 minutos
-        cache_key = f"mobile_verification_{user_email}"
+        cache_key = f"codigo:{user_email}"
         cache.set(
             cache_key,
             {
@@ -113,28 +100,11 @@ class MobileVerificationService:
             timeout=900,
         )  # 15 minutos
 
-        # Renderizar template de email
-        context = {
-            "username": username,
-            "verification_code": code,
-            "site_name": "MoviFleet",
-        }
-
-        html_message = render_to_string(
-            "account/email/mobile_verification.html", context
-        )
-        text_message = render_to_string(
-            "account/email/mobile_verification.txt", context
-        )
-
-        # Enviar email
-        send_mail(
-            subject="Código de verificación - MoviFleet",
-            message=text_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user_email],
-            html_message=html_message,
-            fail_silently=False,
+        # Encolar email (lo envía el trabajador de correos)
+        encolar(
+            "verificacion_movil",
+            [user_email],
+            {"username": username, "verification_code": code, "site_name": "MoviFleet"},
         )
 
         return code
@@ -142,7 +112,7 @@ class MobileVerificationService:
     @staticmethod
     def verify_code(user_email, code):
         """Verifica el código enviado"""
-        cache_key = f"mobile_verification_{user_email}"
+        cache_key = f"codigo:{user_email}"
         cached_data = cache.get(cache_key)
 
         if not cached_data:
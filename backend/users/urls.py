@@ -15,6 +15,7 @@ from .auth_views import (
     logout_view,
     user_info,
     dashboard_data,
+    dashboard_estadisticas,
 )
 from .mobile_verification import (
     mobile_register,
@@ -55,6 +56,10 @@ urlpatterns = [
     path("user-info/", user_info, name="user_info"),
     # Datos del dashboard del usuario (GET)
     path("dashboard-data/", dashboard_data, name="dashboard_data"),
+    # Contadores de todos los módulos en una sola respuesta (GET)
+    path(
+        "dashboard-estadisticas/", dashboard_estadisticas, name="dashboard_estadisticas"
+    ),
     # ===== GESTIÓN DE ROLES Y USUARIOS =====
     # Incluir rutas del router (ViewSets)
     path("", include(router.urls)),
@@ -31,6 +31,7 @@ from dj_rest_auth.registration.views import RegisterView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
 from bitacora.utils import registrar_bitacora
+from core.conteos import contar
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import requests
@@ -321,20 +322,26 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        queryset = self.get_queryset()
+        conteos = contar(
+            self.get_queryset(),
+            dimensiones=['rol__nombre'],
+            condiciones={
+                'activos': models.Q(is_active=True),
+                'administrativos': models.Q(rol__es_administrativo=True),
+                'clientes': models.Q(rol__es_administrativo=False),
+                'con_acceso_admin': models.Q(is_staff=True),
+                'nuevos_este_mes': models.Q(fecha_creacion__gte=timezone.now().replace(day=1)),
+            },
+        )
 
         stats = {
-            'total': queryset.count(),
-            'activos': queryset.filter(is_active=True).count(),
-            'administrativos': queryset.filter(rol__es_administrativo=True).count(),
-            'clientes': queryset.filter(rol__es_administrativo=False).count(),
-            'con_acceso_admin': queryset.filter(is_staff=True).count(),
-            'por_rol': dict(queryset.values('rol__nombre').annotate(
-                count=models.Count('id')
-            ).values_list('rol__nombre', 'count')),
-            'nuevos_este_mes': queryset.filter(
-                fecha_creacion__gte=timezone.now().replace(day=1)
-            ).count(),
+            'total': conteos['total'],
+            'activos': conteos['activos'],
+            'administrativos': conteos['administrativos'],
+            'clientes': conteos['clientes'],
+            'con_acceso_admin': conteos['con_acceso_admin'],
+            'por_rol': conteos['rol__nombre'],
+            'nuevos_este_mes': conteos['nuevos_este_mes'],
         }
 
         return Response(stats)
@@ -413,8 +420,8 @@ class UserViewSet(viewsets.ModelViewSet):
                 'email',
                 'ci',
                 'telefono',
-                'unidad_habitacional',
-                'tipo'
+                'tipo',
+                unidad_habitacional=models.F('unidad__codigo')
             )
 
             return Response(list(residentes_disponibles))
@@ -1,6 +1,7 @@
 import { useState, useCallback, useEffect } from 'react';
 import { notificacionesService } from '@/services';
 import { notificacionesService as userNotificationsService } from '@/services/userNotificationsService';
+import { api, getApiBaseUrl } from '@/lib/api';
 import type { Notificacion } from '@/types';
 
 interface UserNotificationsState {
@@ -108,13 +109,55 @@ export function useUserNotifications() {
   // Cargar notificaciones al montar el componente
   useEffect(() => {
     fetchUserNotifications();
-    
-    // Configurar un intervalo para actualizar las notificaciones periódicamente
+
+    // Canal en tiempo real (SSE): recargamos al llegar una notificación.
+    // Se abre con un ticket de un solo uso (el token JWT no viaja en la URL,
+    // que queda en los logs de acceso). Al caerse la conexión el navegador
+    // reintentaría con el ticket ya usado: pedimos otro y reconectamos
+    // enviando el último id recibido.
+    const token = localStorage.getItem('access_token');
+    const conCanal = Boolean(token) && typeof EventSource !== 'undefined';
+    let eventSource: EventSource | null = null;
+    let ultimoId = '';
+    let cerrado = false;
+    let reconexion: ReturnType<typeof setTimeout> | undefined;
+
+    const conectar = async () => {
+      try {
+        const { data } = await api.post('/api/eventos/ticket/');
+        if (cerrado) return;
+        const params = new URLSearchParams({ ticket: data.ticket });
+        if (ultimoId) params.set('last_event_id', ultimoId);
+        eventSource = new EventSource(`${getApiBaseUrl()}/api/eventos/?${params}`);
+
+        const recargar = (evento: MessageEvent) => {
+          if (evento.lastEventId) ultimoId = evento.lastEventId;
+          fetchUserNotifications();
+        };
+        eventSource.addEventListener('notificacion', recargar as EventListener);
+        eventSource.addEventListener('resincronizar', recargar as EventListener);
+        eventSource.onerror = () => {
+          eventSource?.close();
+          if (!cerrado) reconexion = setTimeout(conectar, 3000);
+        };
+      } catch (error) {
+        // Sin canal queda el sondeo periódico
+        console.error('No se pudo abrir el canal de eventos:', error);
+      }
+    };
+    if (conCanal) conectar();
+
+    // Respaldo por si el canal no está disponible (proxy, servidor WSGI)
     const intervalId = setInterval(() => {
       fetchUserNotifications();
-    }, 60000); // Actualizar cada minuto
-    
-    return () => clearInterval(intervalId);
+    }, conCanal ? 300000 : 60000);
+
+    return () => {
+      cerrado = true;
+      clearInterval(intervalId);
+      clearTimeout(reconexion);
+      eventSource?.close();
+    };
   }, [fetchUserNotifications]);
 
   const toggleNotificationsMenu = () => {
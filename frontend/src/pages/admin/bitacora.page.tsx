@@ -22,42 +22,45 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { Button } from "@/components/ui/button";
-import { getBitacora } from "@/services/bitacoraService";
+import { getBitacora, getBitacoraPage } from "@/services/bitacoraService";
+import type { PaginatedBitacora } from "@/services/bitacoraService";
 import type { BitacoraLog } from "@/types/bitacora";
 
-const ITEMS_PER_PAGE = 10;
-
 const BitacoraPage: React.FC = () => {
   const [logs, setLogs] = useState<BitacoraLog[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
   const [page, setPage] = useState<number>(1);
-  const [total, setTotal] = useState<number>(0);
+  const [next, setNext] = useState<string | null>(null);
+  const [previous, setPrevious] = useState<string | null>(null);
   const [search, setSearch] = useState<string>("");
   const [rol, setRol] = useState<string>("all");
 
-  const fetchLogs = async (pageNumber = 1, searchQuery = "", rolFilter = "all") => {
+  const loadPage = async (
+    request: Promise<PaginatedBitacora>,
+    pageNumber: number
+  ) => {
     setLoading(true);
     try {
-      // Convertir "all" a cadena vacía para el backend
-      const actualRolFilter = rolFilter === "all" ? "" : rolFilter;
-      const data = await getBitacora(pageNumber, searchQuery, actualRolFilter);
+      const data = await request;
       setLogs(data.results);
-      setTotal(data.count);
+      setNext(data.next);
+      setPrevious(data.previous);
       setPage(pageNumber);
     } catch (error) {
       console.error("Error al cargar la bitácora:", error);
       setLogs([]);
-      setTotal(0);
+      setNext(null);
+      setPrevious(null);
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    fetchLogs(page, search, rol);
-  }, [page, search, rol]);
-
-  const totalPages = Math.ceil(total / ITEMS_PER_PAGE);
+    // Convertir "all" a cadena vacía para el backend
+    const actualRolFilter = rol === "all" ? "" : rol;
+    loadPage(getBitacora(search, actualRolFilter), 1);
+  }, [search, rol]);
 
   return (
     <AdminLayout>
@@ -150,26 +153,21 @@ const BitacoraPage: React.FC = () => {
               {/* Paginación */}
               <div className="flex justify-center mt-4 gap-2 flex-wrap">
                 <Button
-                  onClick={() => fetchLogs(page - 1, search, rol)}
-                  disabled={page === 1}
+                  onClick={() =>
+                    previous && loadPage(getBitacoraPage(previous), page - 1)
+                  }
+                  disabled={!previous}
                   variant="outline"
                   size="sm"
                 >
                   Anterior
                 </Button>
-                {Array.from({ length: totalPages }, (_, i) => (
-                  <Button
-                    key={i + 1}
-                    onClick={() => fetchLogs(i + 1, search, rol)}
-                    variant={i + 1 === page ? "default" : "outline"}
-                    size="sm"
-                  >
-                    {i + 1}
-                  </Button>
-                ))}
+                <Button variant="default" size="sm" disabled>
+                  {page}
+                </Button>
                 <Button
-                  onClick={() => fetchLogs(page + 1, search, rol)}
-                  disabled={page === totalPages}
+                  onClick={() => next && loadPage(getBitacoraPage(next), page + 1)}
+                  disabled={!next}
                   variant="outline"
                   size="sm"
                 >
@@ -310,6 +310,13 @@ export const adminAuthService = {
     return apiRequest("/api/admin/dashboard-data/");
   },
 
+  // Contadores de todos los módulos visibles (una sola petición, en caché)
+  async getDashboardStats(): Promise<
+    ApiResponse<Record<string, Record<string, number>>>
+  > {
+    return apiRequest("/api/admin/dashboard-estadisticas/");
+  },
+
   // Obtener lista de usuarios (solo admin)
   async getUsers(): Promise<
     ApiResponse<{
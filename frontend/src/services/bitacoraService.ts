@@ -1,21 +1,30 @@
 import { api } from "@/lib/api";
 import type { BitacoraLog } from "@/types/bitacora";
 
+// La bitácora se pagina por cursor: se navega con los enlaces next/previous.
+// count solo viene cuando hay búsqueda (paginación por número de página).
 export interface PaginatedBitacora {
-  count: number;
+  count?: number;
   next: string | null;
   previous: string | null;
   results: BitacoraLog[];
 }
 
-// page = número de página, search = texto a buscar
+// search = texto a buscar, rol = filtro por rol
 export const getBitacora = async (
-  page = 1,
   search = "",
   rol = ""
 ): Promise<PaginatedBitacora> => {
   const response = await api.get("/api/bitacora/", {
-    params: { page, search, rol }, // ahora mandamos rol al backend
+    params: { search, rol },
   });
   return response.data;
 };
+
+// url = enlace next/previous devuelto por el backend
+export const getBitacoraPage = async (
+  url: string
+): Promise<PaginatedBitacora> => {
+  const response = await api.get(url);
+  return response.data;
+};
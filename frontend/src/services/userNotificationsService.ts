@@ -30,35 +30,16 @@ export const notificacionesService = {
   },
   
   /**
-   * Marca una notificación como leída (adaptado a rutas existentes)
-   * Usa el endpoint específico para marcar como leída
+   * Marca una notificación como leída solo para el usuario actual
+   * (la lectura se registra en su bandeja, no en la notificación)
    */
   async markAsRead(notificationId: number) {
     try {
-      // Usamos el endpoint específico para marcar como leída en lugar del PATCH genérico
       const response = await api.post(`/api/notificaciones/${notificationId}/marcar_como_leida/`);
       return response.data;
     } catch (error: any) {
       console.error('Error al marcar notificación como leída:', error);
-      
-      // Si el endpoint específico falla, intentamos con el método anterior como fallback
-      try {
-        // Primero obtenemos la notificación actual para mantener sus datos
-        const getResponse = await api.get(`/api/notificaciones/${notificationId}/`);
-        const notificacion = getResponse.data;
-        
-        // Actualizamos solo el estado a "leida" (en minúsculas según el backend)
-        const updateData = {
-          ...notificacion,
-          estado: 'leida'
-        };
-        
-        const patchResponse = await api.patch(`/api/notificaciones/${notificationId}/`, updateData);
-        return patchResponse.data;
-      } catch (fallbackError) {
-        console.error('Error en método fallback:', fallbackError);
-        throw error; // Re-lanzamos el error original
-      }
+      throw error;
     }
   }
 };
\ No newline at end of file
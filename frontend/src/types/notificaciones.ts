@@ -42,6 +42,9 @@ export type Notificacion = {
   fecha_creacion: string;
   fecha_actualizacion: string;
   total_destinatarios: number;
+  // Lectura del usuario actual (solo en su bandeja)
+  leida_en?: string | null;
+  confirmada_en?: string | null;
   destinatarios?: {
     id: number;
     nombre: string;
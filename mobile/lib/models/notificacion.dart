@@ -19,6 +19,8 @@ class Notificacion {
   final List<Map<String, dynamic>> rolesDestinatariosInfo;
   final Map<String, dynamic>? creadoPorInfo;
   final int totalDestinatarios;
+  // Lectura del usuario actual (bandeja por usuario); null si no la leyó
+  final String? leidaEn;
 
   Notificacion({
     required this.id,
@@ -41,8 +43,11 @@ class Notificacion {
     required this.rolesDestinatariosInfo,
     this.creadoPorInfo,
     required this.totalDestinatarios,
+    this.leidaEn,
   });
 
+  bool get leida => leidaEn != null;
+
   factory Notificacion.fromJson(Map<String, dynamic> json) {
     return Notificacion(
       id: _parseInt(json['id']),
@@ -65,6 +70,7 @@ class Notificacion {
       rolesDestinatariosInfo: _parseMapList(json['roles_destinatarios_info']),
       creadoPorInfo: json['creado_por_info'] != null ? Map<String, dynamic>.from(json['creado_por_info']) : null,
       totalDestinatarios: _parseInt(json['total_destinatarios']),
+      leidaEn: json['leida_en'] is String ? json['leida_en'] : null,
     );
   }
 
@@ -123,6 +129,7 @@ class Notificacion {
       'roles_destinatarios_info': rolesDestinatariosInfo,
       'creado_por_info': creadoPorInfo,
       'total_destinatarios': totalDestinatarios,
+      'leida_en': leidaEn,
     };
   }
 }
@@ -19,7 +19,7 @@ class _DetalleNotificacionScreenState extends State<DetalleNotificacionScreen> {
   bool _isLoading = false;
 
   Future<void> _marcarComoLeida() async {
-    if (widget.notificacion.estado == 'leida') return;
+    if (widget.notificacion.leida) return;
 
     setState(() {
       _isLoading = true;
@@ -62,7 +62,7 @@ class _DetalleNotificacionScreenState extends State<DetalleNotificacionScreen> {
         backgroundColor: _getTipoColor(widget.notificacion.tipo),
         foregroundColor: Colors.white,
         actions: [
-          if (widget.notificacion.estado != 'leida')
+          if (!widget.notificacion.leida)
             IconButton(
               icon: _isLoading
                   ? const SizedBox(
@@ -123,7 +123,7 @@ class _DetalleNotificacionScreenState extends State<DetalleNotificacionScreen> {
                             ],
                           ),
                         ),
-                        if (widget.notificacion.estado == 'leida')
+                        if (widget.notificacion.leida)
                           const Icon(
                             Icons.check_circle,
                             color: Colors.green,
@@ -275,7 +275,7 @@ class _DetalleNotificacionScreenState extends State<DetalleNotificacionScreen> {
           ],
         ),
       ),
-      bottomNavigationBar: widget.notificacion.estado != 'leida'
+      bottomNavigationBar: !widget.notificacion.leida
           ? Container(
               padding: const EdgeInsets.all(16),
               child: SizedBox(
@@ -421,8 +421,6 @@ class _DetalleNotificacionScreenState extends State<DetalleNotificacionScreen> {
         return Colors.green;
       case 'cancelada':
         return Colors.red;
-      case 'leida':
-        return Colors.green;
       default:
         return Colors.grey;
     }
@@ -1,3 +1,5 @@
+import 'dart:async';
+
 import 'package:flutter/material.dart';
 import '../services/notificacion_service.dart';
 import '../models/notificacion.dart';
@@ -21,12 +23,20 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
   bool _isLoading = true;
   String? _error;
   NotificacionEstadisticas? _estadisticas;
+  int _noLeidas = 0;
+  StreamSubscription<String>? _eventos;
 
   @override
   void initState() {
     super.initState();
     _tabController = TabController(length: 3, vsync: this);
     _inicializarYcargarNotificaciones();
+    // Recargar al llegar una notificación por el canal en tiempo real
+    _eventos = _notificacionService.eventos().listen((tipo) {
+      if (tipo == 'notificacion' || tipo == 'resincronizar') {
+        _cargarNotificaciones();
+      }
+    });
   }
   
   Future<void> _inicializarYcargarNotificaciones() async {
@@ -35,6 +45,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
 
   @override
   void dispose() {
+    _eventos?.cancel();
     _tabController.dispose();
     super.dispose();
   }
@@ -48,6 +59,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
 
       final notificaciones = await _notificacionService.getNotificaciones();
       final noLeidas = await _notificacionService.getNotificaciones(noLeidas: true);
+      final totalNoLeidas = await _notificacionService.getNoLeidas();
       
       // Intentar cargar estadísticas, pero no fallar si no hay permisos
       NotificacionEstadisticas? estadisticas;
@@ -61,7 +73,8 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
       setState(() {
         _notificaciones = notificaciones;
         _notificacionesNoLeidas = noLeidas;
-        _notificacionesLeidas = notificaciones.where((n) => n.estado == 'leida').toList();
+        _notificacionesLeidas = notificaciones.where((n) => n.leida).toList();
+        _noLeidas = totalNoLeidas;
         _estadisticas = estadisticas;
         _isLoading = false;
       });
@@ -135,7 +148,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
                 mainAxisSize: MainAxisSize.min,
                 children: [
                   const Text('No leídas'),
-                  if (_estadisticas != null && _estadisticas!.noLeidas > 0)
+                  if (_noLeidas > 0)
                     Container(
                       margin: const EdgeInsets.only(left: 8),
                       padding: const EdgeInsets.symmetric(horizontal: 6, vertical: 2),
@@ -143,9 +156,9 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
                         color: Colors.red,
                         borderRadius: BorderRadius.circular(10),
                       ),
-                      child: const Text(
-                        'N',
-                        style: TextStyle(
+                      child: Text(
+                        '$_noLeidas',
+                        style: const TextStyle(
                           color: Colors.white,
                           fontSize: 12,
                           fontWeight: FontWeight.bold,
@@ -277,7 +290,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
   Widget _buildNotificacionCard(Notificacion notificacion) {
     return Card(
       margin: const EdgeInsets.symmetric(horizontal: 16, vertical: 4),
-      elevation: notificacion.estado == 'leida' ? 1 : 3,
+      elevation: notificacion.leida ? 1 : 3,
       child: ListTile(
         leading: CircleAvatar(
           backgroundColor: _getTipoColor(notificacion.tipo),
@@ -290,8 +303,8 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
         title: Text(
           notificacion.nombre,
           style: TextStyle(
-            fontWeight: notificacion.estado == 'leida' ? FontWeight.normal : FontWeight.bold,
-            color: notificacion.estado == 'leida' ? Colors.grey[600] : Colors.black87,
+            fontWeight: notificacion.leida ? FontWeight.normal : FontWeight.bold,
+            color: notificacion.leida ? Colors.grey[600] : Colors.black87,
           ),
         ),
         subtitle: Column(
@@ -303,7 +316,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
               maxLines: 2,
               overflow: TextOverflow.ellipsis,
               style: TextStyle(
-                color: notificacion.estado == 'leida' ? Colors.grey[500] : Colors.grey[700],
+                color: notificacion.leida ? Colors.grey[500] : Colors.grey[700],
               ),
             ),
             const SizedBox(height: 8),
@@ -324,7 +337,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
             ),
           ],
         ),
-        trailing: notificacion.estado == 'leida'
+        trailing: notificacion.leida
             ? const Icon(Icons.check_circle, color: Colors.green)
             : IconButton(
                 icon: const Icon(Icons.mark_email_read),
@@ -333,7 +346,7 @@ class _NotificacionesScreenState extends State<NotificacionesScreen>
               ),
         onTap: () async {
           // Marcar como leída si no lo está
-          if (notificacion.estado != 'leida') {
+          if (!notificacion.leida) {
             await _marcarComoLeida(notificacion);
           }
           
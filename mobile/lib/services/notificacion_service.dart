@@ -91,6 +91,84 @@ class NotificacionService {
     }
   }
 
+  // Cantidad de notificaciones no leídas del usuario
+  Future<int> getNoLeidas() async {
+    try {
+      final headers = await _getHeaders();
+      final response = await http.get(
+        Uri.parse('$baseUrl/notificaciones/no_leidas/'),
+        headers: headers,
+      );
+
+      if (response.statusCode == 200) {
+        final data = json.decode(response.body);
+        final noLeidas = data['no_leidas'];
+        return noLeidas is int ? noLeidas : 0;
+      } else {
+        throw Exception('Error al cargar no leídas: ${response.statusCode}');
+      }
+    } catch (e) {
+      throw Exception('Error de conexión: $e');
+    }
+  }
+
+  // Ticket de un solo uso para abrir el canal de eventos (el JWT no viaja en la URL)
+  Future<String> _pedirTicketEventos() async {
+    final headers = await _getHeaders();
+    final response = await http.post(
+      Uri.parse('$baseUrl/eventos/ticket/'),
+      headers: headers,
+    );
+    if (response.statusCode != 200) {
+      throw Exception('Error al pedir ticket de eventos: ${response.statusCode}');
+    }
+    return json.decode(response.body)['ticket'] as String;
+  }
+
+  // Canal en tiempo real (SSE): emite el tipo de cada evento recibido
+  // ('notificacion', 'resincronizar', ...). Si la conexión se corta pide un
+  // ticket nuevo y reconecta enviando el último id recibido. Cancelar la
+  // suscripción cierra la conexión.
+  Stream<String> eventos() async* {
+    String? ultimoId;
+    while (true) {
+      final client = http.Client();
+      try {
+        final ticket = await _pedirTicketEventos();
+        final uri = Uri.parse('$baseUrl/eventos/').replace(queryParameters: {
+          'ticket': ticket,
+          if (ultimoId != null) 'last_event_id': ultimoId,
+        });
+        final request = http.Request('GET', uri)
+          ..headers['Accept'] = 'text/event-stream';
+        final response = await client.send(request);
+        if (response.statusCode != 200) {
+          throw Exception('Canal de eventos no disponible: ${response.statusCode}');
+        }
+
+        String? tipo;
+        final lineas = response.stream
+            .transform(utf8.decoder)
+            .transform(const LineSplitter());
+        await for (final linea in lineas) {
+          if (linea.startsWith('id:')) {
+            ultimoId = linea.substring(3).trim();
+          } else if (linea.startsWith('event:')) {
+            tipo = linea.substring(6).trim();
+          } else if (linea.isEmpty && tipo != null) {
+            yield tipo;
+            tipo = null;
+          }
+        }
+      } catch (e) {
+        print('Canal de eventos interrumpido: $e');
+      } finally {
+        client.close();
+      }
+      await Future.delayed(const Duration(seconds: 3));
+    }
+  }
+
   // Obtener estadísticas de notificaciones
   Future<NotificacionEstadisticas> getEstadisticas() async {
     try {